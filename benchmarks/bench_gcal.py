@@ -0,0 +1,71 @@
+"""Google Calendar sync cost against the offline fake API.
+
+    python -m benchmarks.bench_gcal --events 400 --changes 10 --failure-rate 0.05
+
+Reports API calls, batches and wall time for a first sync, an unchanged
+re-sync and a re-sync with a few moved games, next to the one-request-per-
+event cost of pushing everything every run.
+"""
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import tempfile
+import time
+
+import pytz
+
+from benchmarks.fake_gcal import FakeCalendarApi
+from src.utils.events import Event
+from src.utils.gcal import CalendarSync, GoogleCalendarClient
+
+
+TZ = pytz.timezone("America/New_York")
+
+
+def build_events(count: int) -> list:
+    start = TZ.localize(datetime(2026, 4, 1, 18, 0))
+    return [
+        Event(
+            summary=f"Team {i % 12} vs. Team {(i + 5) % 12}",
+            start=start + timedelta(hours=3 * i),
+            end=start + timedelta(hours=3 * i, minutes=75),
+            timezone="America/New_York",
+            location=f"Rink {i % 3 + 1}",
+            external_id=f"bench:game:{i}",
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=400)
+    parser.add_argument("--changes", type=int, default=10)
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Chance each call is rate limited")
+    args = parser.parse_args()
+
+    api = FakeCalendarApi(part_failure_rate=args.failure_rate).start()
+    client = GoogleCalendarClient("bench", api_root=api.url, backoff=0.01)
+    events = build_events(args.events)
+    moved = [replace(ev, location="Rink 4") if i < args.changes else ev for i, ev in enumerate(events)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync = CalendarSync(client, "bench@group.calendar.google.com", cache_path=Path(tmp) / "gcal.json")
+        print(f"{args.events} events; naive push = {args.events} requests per run")
+        for label, batch in (("first sync", events), ("unchanged", events), (f"{args.changes} moved", moved)):
+            calls, started = api.calls, time.perf_counter()
+            result = sync.sync(batch)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{label:<12}: {api.calls - calls:5d} calls in {result.batches:3d} batches, "
+                f"{elapsed * 1e3:7.1f} ms  (+{result.inserted} ~{result.patched} -{result.deleted} "
+                f"={result.unchanged} failed {len(result.failed)})"
+            )
+    api.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Inline vs process-pool parsing on a multi-team, large-schedule workload.
+
+    python -m benchmarks.bench_parse --teams 24 --games 400 --workers 4
+
+Run it on the machine that will do the builds before raising parse_workers
+above 0: pooling pays for pickling every page, so on a single CPU it is
+slower than inline (x0.86 with 2 workers) and only helps with spare cores.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from benchmarks.fixtures import bond_page, erie_team_page, harborcenter_page
+from src.scrapers.bond_sports import BondSportsScraper
+from src.scrapers.erie_metro import ErieMetroScraper
+from src.scrapers.rinks_harborcenter import HarborcenterScraper
+from src.utils.parsing import ParseStage
+
+
+TIMEZONE = "America/New_York"
+
+
+def build_jobs(teams: int, games: int) -> list:
+    jobs = []
+    for i in range(teams):
+        name = f"Team {i}"
+        kind = i % 3
+        if kind == 0:
+            url = f"https://www.eriemetrosports.com/schedule/team_instance/{i}?subseason=952202"
+            jobs.append((ErieMetroScraper(team_name=name), url, erie_team_page(games, seed=i)))
+        elif kind == 1:
+            url = f"https://www.rinksatharborcenter.com/stats#/1367/team/{i}/schedule"
+            scraper = HarborcenterScraper(team_name=name)
+            jobs.append((scraper, url, harborcenter_page(games, team=name, seed=i)))
+            jobs.append((scraper, url.replace("/schedule", "/scores"), harborcenter_page(games, team=name, seed=i, scores=True)))
+        else:
+            url = f"https://bondsports.co/league/{i}"
+            jobs.append((BondSportsScraper(team_name=name), url, bond_page(games, team=name, seed=i)))
+    return jobs
+
+
+def run(jobs: list, workers: int) -> tuple[float, int]:
+    started = time.perf_counter()
+    with ParseStage(workers=workers) as stage:
+        futures = [stage.submit(scraper, url, payload, TIMEZONE) for scraper, url, payload in jobs]
+        count = sum(len(f.result()) for f in futures)
+    return time.perf_counter() - started, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, default=24)
+    parser.add_argument("--games", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    jobs = build_jobs(args.teams, args.games)
+    payload_mb = sum(len(payload) for _, _, payload in jobs) / 1e6
+    print(f"{len(jobs)} pages, {payload_mb:.1f} MB of HTML, {os.cpu_count()} CPUs")
+
+    inline_s, inline_events = run(jobs, workers=0)
+    print(f"inline       : {inline_s:6.2f}s  {inline_events} events")
+    pool_s, pool_events = run(jobs, workers=args.workers)
+    print(f"pool ({args.workers:>2} wk) : {pool_s:6.2f}s  {pool_events} events  speedup x{inline_s / pool_s:.2f}")
+    if inline_s <= pool_s:
+        print("pooled parsing is slower here; keep parse_workers at 0 on this machine")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Full build_team_feeds run against local stand-in sites.
+
+    python -m benchmarks.e2e --teams 300 --games 60 --mix erie=1,harborcenter=1,bond=1 \\
+        --latency-ms 40 --failure-rate 0.02 --workers 4
+
+Generates a config.yaml with the requested number of teams spread over the
+three stand-in sites, runs the real pipeline in a scratch directory (docs/,
+.cache/ and config.yaml all live there) and reports wall time, throughput
+and peak RSS. The run exits non-zero if it stored no events, or if fewer
+teams came back with events than were seeded (less one per injected
+failure), so a broken pipeline can't pass as a fast one. Harborcenter and Bond teams need Playwright's Chromium;
+``--mix erie=1`` runs on requests alone.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator
+import argparse
+import os
+import resource
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from loguru import logger
+import yaml
+
+from benchmarks.standin import StandInSites
+
+
+SITES = ("erie", "harborcenter", "bond")
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SITES:
+            raise argparse.ArgumentTypeError(f"Unknown site {name!r}; expected one of {', '.join(SITES)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def build_config(sites: StandInSites, teams: int, mix: Dict[str, int], workers: int, runtime: str = "sync") -> dict:
+    wheel = [site for site, weight in mix.items() for _ in range(weight)]
+    url_for = {
+        "erie": sites.erie_team_url,
+        "harborcenter": sites.harborcenter_team_url,
+        "bond": sites.bond_team_url,
+    }
+    return {
+        "timezone": "America/New_York",
+        "parse_workers": workers,
+        "runtime": {"mode": runtime},
+        "upcoming": {"days_ahead": 30, "days_behind": 7},
+        "seasons": [
+            {
+                "id": "bench",
+                "name": "Bench",
+                "start": "2025-09-01",
+                "teams": [
+                    {
+                        # Seeds start at 1; the stand-in names each team "Team <seed>".
+                        "id": f"team-{seed}",
+                        "name": f"Team {seed}",
+                        "urls": [url_for[wheel[seed % len(wheel)]](seed)],
+                    }
+                    for seed in range(1, teams + 1)
+                ],
+            }
+        ],
+        "aggregates": [{"id": "all", "name": "All Bench Teams"}],
+    }
+
+
+@contextmanager
+def scratch_dir(keep: Path | None) -> Iterator[Path]:
+    if keep:
+        shutil.rmtree(keep, ignore_errors=True)
+        keep.mkdir(parents=True)
+        yield keep
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        yield Path(tmp)
+
+
+def peak_rss_mb() -> tuple[float, float]:
+    # ru_maxrss is in KiB on Linux. Children covers parse-pool workers and
+    # browsers that have exited by the time we ask.
+    self_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return self_kb / 1024, children_kb / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, default=30)
+    parser.add_argument("--games", type=int, default=60, help="Games per team schedule")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("erie=1,harborcenter=1,bond=1"))
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=0, help="parse_workers for the generated config")
+    parser.add_argument("--runtime", choices=("sync", "asyncio"), default="sync", help="runtime.mode for the generated config")
+    parser.add_argument("--keep", type=Path, help="Run in this directory and leave the output there")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's INFO logs")
+    parser.add_argument("--trace", type=Path, help="Write a Chrome trace-event timeline of the run here")
+    parser.add_argument("--profile", type=Path, help="cProfile each stage into this directory and print hotspots")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="ERROR")
+
+    sites = StandInSites(
+        games=args.games,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        teams=args.teams,
+    ).start()
+    cwd = Path.cwd()
+    try:
+        with scratch_dir(args.keep) as work:
+            (work / "config.yaml").write_text(
+                yaml.safe_dump(build_config(sites, args.teams, args.mix, args.workers, args.runtime), sort_keys=False),
+                encoding="utf-8",
+            )
+            os.chdir(work)
+            from src.main import build_team_feeds
+            from src.utils.profiling import PROFILER
+            from src.utils.tracing import TRACER
+
+            if args.trace:
+                TRACER.enable()
+            if args.profile:
+                PROFILER.enable()
+            started = time.perf_counter()
+            build_team_feeds()
+            elapsed = time.perf_counter() - started
+            if args.trace:
+                TRACER.export(cwd / args.trace)
+            if args.profile:
+                PROFILER.disable()
+                PROFILER.dump(cwd / args.profile)
+
+            with sqlite3.connect(work / ".cache" / "events.sqlite3") as conn:
+                events = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+                scraped = conn.execute("SELECT COUNT(DISTINCT team_id) FROM events").fetchone()[0]
+            feeds = len(list((work / "docs" / "ics").glob("*.ics")))
+            # Step out before the scratch directory is removed.
+            os.chdir(cwd)
+    finally:
+        os.chdir(cwd)
+        sites.stop()
+
+    self_mb, children_mb = peak_rss_mb()
+    mix = ", ".join(f"{site}={weight}" for site, weight in args.mix.items())
+    print(f"{args.teams} teams ({mix}), {args.games} games each, latency {args.latency_ms:g} ms, failure rate {args.failure_rate:g}")
+    print(f"wall time   : {elapsed:8.2f} s")
+    print(f"throughput  : {args.teams / elapsed:8.2f} teams/s  {events / elapsed:10.1f} events/s")
+    print(f"output      : {events} stored events, {scraped}/{args.teams} teams scraped, {feeds} feeds")
+    print(f"site traffic: {sites.requests} requests, {sites.failures} injected failures, {sites.bytes_sent / 1e6:.1f} MB")
+    print(f"peak RSS    : {self_mb:8.1f} MB (children {children_mb:.1f} MB)")
+    if args.trace:
+        print(f"trace       : {cwd / args.trace}")
+
+    # Each injected failure can cost at most one team its events.
+    expected = max(1, args.teams - sites.failures)
+    if events < expected or scraped < expected:
+        print(f"FAILED: expected events for at least {expected} team(s)", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
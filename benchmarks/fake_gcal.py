@@ -0,0 +1,150 @@
+"""In-process stand-in for the Calendar API batch endpoint.
+
+Keeps events in memory per calendar and understands the insert/patch/delete
+calls GoogleCalendarClient sends. Failures can be injected to exercise the
+retry path: ``fail_batches`` whole-batch 503s, then each part independently
+rate limited (429) with probability ``part_failure_rate``. ``TOKEN_PATH``
+stands in for Google's OAuth token endpoint; once a token has been issued
+there, only tokens in ``access_tokens`` are accepted (clear it to expire
+them).
+"""
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote
+import json
+import random
+import re
+import threading
+import uuid
+
+from src.utils.gcal import BATCH_PATH, decode_batch, encode_batch
+
+
+EVENTS_RE = re.compile(r"^(POST|PATCH|DELETE) /calendar/v3/calendars/([^/]+)/events(?:/([^/ ]+))? HTTP/1\.1$")
+TOKEN_PATH = "/token"
+REASONS = {200: "OK", 204: "No Content", 404: "Not Found", 409: "Conflict", 410: "Gone", 429: "Too Many Requests"}
+
+
+class FakeCalendarApi(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        fail_batches: int = 0,
+        part_failure_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.calendars: Dict[str, Dict[str, dict]] = {}
+        self.fail_batches = fail_batches
+        self.part_failure_rate = part_failure_rate
+        self.rng = random.Random(seed)
+        self.batches = 0
+        self.calls = 0
+        self.access_tokens: Optional[set] = None
+        self.token_requests = 0
+        self.lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeCalendarApi":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def apply(self, start_line: str, body: Optional[dict]) -> Tuple[int, Optional[dict]]:
+        match = EVENTS_RE.match(start_line)
+        if not match:
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+        method, calendar_id, event_id = match.group(1), unquote(match.group(2)), match.group(3)
+        events = self.calendars.setdefault(calendar_id, {})
+        if method == "POST":
+            event_id = (body or {}).get("id") or uuid.uuid4().hex
+            if event_id in events:
+                return 409, {"error": {"code": 409, "message": "The requested identifier already exists."}}
+            events[event_id] = dict(body or {}, id=event_id)
+            return 200, events[event_id]
+        event_id = unquote(event_id or "")
+        if event_id not in events:
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+        if method == "PATCH":
+            events[event_id].update(body or {})
+            return 200, events[event_id]
+        # Like Google, a deleted event keeps its ID with status "cancelled".
+        if events[event_id].get("status") == "cancelled":
+            return 410, {"error": {"code": 410, "message": "Resource has been deleted"}}
+        events[event_id]["status"] = "cancelled"
+        return 204, None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: FakeCalendarApi
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == TOKEN_PATH:
+            self._issue_token(parse_qs(body.decode("utf-8")))
+            return
+        authorization = self.headers.get("Authorization", "")
+        tokens = self.server.access_tokens
+        if self.path != BATCH_PATH or not authorization.startswith("Bearer "):
+            self._reply(401 if self.path == BATCH_PATH else 404, b"", "text/plain")
+            return
+        if tokens is not None and authorization[len("Bearer "):] not in tokens:
+            self._reply(401, b"Invalid Credentials", "text/plain")
+            return
+
+        with self.server.lock:
+            self.server.batches += 1
+            if self.server.fail_batches > 0:
+                self.server.fail_batches -= 1
+                self._reply(503, b"Backend Error", "text/plain")
+                return
+
+            out = []
+            for content_id, start_line, payload in decode_batch(body, self.headers["Content-Type"]):
+                self.server.calls += 1
+                if self.server.rng.random() < self.server.part_failure_rate:
+                    status, result = 429, {"error": {"code": 429, "errors": [{"reason": "rateLimitExceeded"}]}}
+                else:
+                    status, result = self.server.apply(start_line, payload)
+                out.append((f"response-{content_id}", f"HTTP/1.1 {status} {REASONS.get(status, '')}", result))
+
+        boundary = f"batch_{uuid.uuid4().hex}"
+        self._reply(200, encode_batch(out, boundary), f"multipart/mixed; boundary={boundary}")
+
+    def _issue_token(self, form: Dict[str, list]) -> None:
+        if form.get("grant_type") != ["refresh_token"] or not form.get("refresh_token"):
+            self._reply(400, b'{"error": "invalid_grant"}', "application/json")
+            return
+        with self.server.lock:
+            self.server.token_requests += 1
+            token = f"access-{uuid.uuid4().hex}"
+            if self.server.access_tokens is None:
+                self.server.access_tokens = set()
+            self.server.access_tokens.add(token)
+        body = json.dumps({"access_token": token, "expires_in": 3599, "token_type": "Bearer"})
+        self._reply(200, body.encode("utf-8"), "application/json")
+
+    def _reply(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
@@ -0,0 +1,131 @@
+"""Synthetic schedule pages shaped like the three sites' markup.
+
+Used by the benchmarks to build large, deterministic workloads without
+touching the network.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import random
+from typing import List, Optional
+
+
+OPPONENTS = [
+    "Hammers", "RCR Yachts", "Lumber Lions", "Rivermen", "Buffalo Cigars",
+    "Reverse Retro", "Ham Sub Club", "Realty Group", "Golden Retrievers",
+]
+SEASON_START = datetime(2025, 9, 3, 19, 15)
+
+
+def game_times(games: int, seed: int) -> List[datetime]:
+    rng = random.Random(seed)
+    return [
+        SEASON_START + timedelta(days=3 * i, minutes=rng.choice([0, 35, 70, 95]))
+        for i in range(games)
+    ]
+
+
+def erie_team_page(
+    games: int,
+    seed: int = 0,
+    game_url: str = "https://www.eriemetrosports.com/game/show/{id}?subseason=952202",
+    final_games: int = 0,
+) -> str:
+    """Team schedule table; the first `final_games` rows show FINAL instead of a time."""
+    rng = random.Random(seed)
+    rows = []
+    for i, start in enumerate(game_times(games, seed)):
+        game_id = 44000000 + seed * 10000 + i
+        link = game_url.format(id=game_id)
+        opponent = rng.choice(OPPONENTS)
+        if i < final_games:
+            result = (
+                f'<div class="scheduleListResult">{rng.choice("WLT")}</div>'
+                f'<div class="scheduleListScore"><a href="{link}">{rng.randint(0, 9)}-{rng.randint(0, 9)}</a></div>'
+            )
+            status = f'<a href="{link}"><img alt="FINAL" src="/app_images/game_center/final.gif"/></a>'
+        else:
+            result = "-"
+            status = f'<a href="{link}"><span>{start.strftime("%-I:%M %p")} EDT</span></a>'
+        rows.append(
+            f'<tr class="scheduled" id="game_list_row_{game_id}">'
+            f'<td>{start.strftime("%a %b %-d")}</td>'
+            f"<td>{result}</td>"
+            f'<td><div class="scheduleListTeam">@ <a class="teamName" href="#">{opponent}</a>'
+            f' <span class="grayed">(3-2)</span></div></td>'
+            f'<td><div class="scheduleListTeam">Riverside Rink</div></td>'
+            f'<td class="nowrap">{status}</td>'
+            "</tr>"
+        )
+    return (
+        "<html><body><h1>Regular Season 2025-26</h1><table>"
+        "<tr><th>Date</th><th>Result</th><th>Opponent</th><th>Location</th><th>Status</th></tr>"
+        + "".join(rows)
+        + "</table></body></html>"
+    )
+
+
+def erie_game_page(title: str) -> str:
+    return f'<html><head><meta property="og:title" content="{title}"/></head></html>'
+
+
+def harborcenter_rows(games: int, team: str = "Golden Retrievers", seed: int = 0, scores: bool = False) -> List[str]:
+    rng = random.Random(seed)
+    rows = []
+    for i, start in enumerate(game_times(games, seed)):
+        game_id = 1200000 + seed * 10000 + i
+        away = rng.choice(OPPONENTS)
+        score = f"<span>{rng.randint(0, 9)} - {rng.randint(0, 9)}</span>" if scores else ""
+        rows.append(
+            '<tr role="article"><td class="center"></td><td class="teams"><span>'
+            f'<div class="sr-only" id="g-{game_id}-label">{away} vs {team} on {start:%Y-%m-%d} at {start:%H:%M}</div>'
+            f'<a href="/stats#/1367/game/{game_id}"><span class="d t">{away}</span></a></span></td>'
+            f'<td class="teams"><span class="vs">vs</span></td><td class="teams"><span class="d t">{team}</span></td>'
+            f'<td class="center">Silver</td><td class="center">{score}</td>'
+            f'<td class="center">{start:%a %b %d}</td><td class="center">{start:%I:%M%p}</td>'
+            f'<td class="center actions"><a href="/stats#/1367/game/{game_id}">{"Final" if scores else "Preview"}</a></td>'
+            "<td>Rink 2</td></tr>"
+        )
+    return rows
+
+
+def harborcenter_page(games: int, team: str = "Golden Retrievers", seed: int = 0, scores: bool = False) -> str:
+    return "<html><body><table>" + "".join(harborcenter_rows(games, team, seed, scores)) + "</table></body></html>"
+
+
+def bond_games(games: int, team: str = "Golden Retrievers", seed: int = 0) -> List[dict]:
+    """Game objects shaped like the Bond API response the league page fetches."""
+    rng = random.Random(seed)
+    records = []
+    for i, start in enumerate(game_times(games, seed)):
+        opponent = rng.choice(OPPONENTS)
+        space = f"Rink {rng.choice('AB')}"
+        records.append(
+            {
+                "id": 900000 + seed * 10000 + i,
+                "startDate": f"{(start + timedelta(hours=4)):%Y-%m-%dT%H:%M:00Z}",
+                "dateLabel": f"{start:%a %b %d}",
+                "homeTeam": {"name": team},
+                "awayTeam": {"name": opponent},
+                "space": {"name": space},
+                "status": "Scheduled",
+            }
+        )
+    return records
+
+
+def bond_page(games: int, team: str = "Golden Retrievers", seed: int = 0, venue: Optional[str] = "Northtown Center") -> str:
+    cards = []
+    for game in bond_games(games, team, seed):
+        game_id = game["id"]
+        cards.append(
+            f'<article data-testid="game-card-{game_id}">'
+            f'<div data-testid="game-card-{game_id}-teams">{game["homeTeam"]["name"]} vs {game["awayTeam"]["name"]}</div>'
+            f'<div data-testid="game-card-{game_id}-date"><time datetime="{game["startDate"]}">'
+            f'{game["dateLabel"]}</time></div>'
+            f'<div data-testid="game-card-{game_id}-space">{game["space"]["name"]}</div>'
+            f'<div data-testid="game-card-{game_id}-status">{game["status"]}</div>'
+            "</article>"
+        )
+    subtitle = f'<div data-testid="competition-subtitle">{venue}</div>' if venue else ""
+    return f"<html><body>{subtitle}{''.join(cards)}</body></html>"
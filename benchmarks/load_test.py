@@ -0,0 +1,130 @@
+"""Requests/sec and latency of the local feed server under keep-alive clients.
+
+    python -m benchmarks.load_test --clients 8 --requests 2000
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --path /ics/some-feed.ics
+
+Without --url a FeedServer is started in-process on an ephemeral port over a
+temporary docs/ directory holding one synthetic feed. Clients cycle through a
+plain GET, a gzip GET and a conditional GET carrying the last ETag.
+"""
+from __future__ import annotations
+
+from http.client import HTTPConnection
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlsplit
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from loguru import logger
+
+from src.server import FeedServer
+
+
+FEED_PATH = "/ics/load-test.ics"
+_results_lock = threading.Lock()
+
+
+def synthetic_feed(events: int) -> bytes:
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//load-test//EN"]
+    for i in range(events):
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:load-test-{i}@hockey-events",
+            "DTSTAMP:20260101T000000Z",
+            f"DTSTART;TZID=America/New_York:202607{i % 28 + 1:02d}T{18 + i % 4:02d}0000",
+            f"SUMMARY:Team {i % 7} vs Team {(i + 3) % 7}",
+            "LOCATION:Rink 1",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+def client(host: str, port: int, path: str, count: int, latencies: List[float], statuses: dict) -> None:
+    conn = HTTPConnection(host, port, timeout=10)
+    etag: Optional[str] = None
+    local: List[float] = []
+    seen: dict = {}
+    try:
+        for i in range(count):
+            headers = {}
+            mode = i % 3
+            if mode == 1:
+                headers["Accept-Encoding"] = "gzip"
+            elif mode == 2 and etag:
+                headers["If-None-Match"] = etag
+            started = time.perf_counter()
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            local.append(time.perf_counter() - started)
+            seen[response.status] = seen.get(response.status, 0) + 1
+            if mode == 0:
+                etag = response.getheader("ETag")
+    finally:
+        conn.close()
+    with _results_lock:
+        latencies.extend(local)
+        for status, n in seen.items():
+            statuses[status] = statuses.get(status, 0) + n
+
+
+def run(host: str, port: int, path: str, clients: int, requests: int) -> None:
+    latencies: List[float] = []
+    statuses: dict = {}
+    per_client = max(1, requests // clients)
+    threads = [
+        threading.Thread(target=client, args=(host, port, path, per_client, latencies, statuses))
+        for _ in range(clients)
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    cuts = statistics.quantiles(latencies, n=100)
+    print(f"{len(latencies)} requests, {clients} clients, {elapsed:.2f}s -> {len(latencies) / elapsed:,.0f} req/s")
+    print(f"latency ms  p50 {cuts[49] * 1e3:.2f}  p95 {cuts[94] * 1e3:.2f}  p99 {cuts[98] * 1e3:.2f}")
+    print("statuses    " + "  ".join(f"{status}: {n}" for status, n in sorted(statuses.items())))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Existing server to hit, e.g. http://127.0.0.1:8000")
+    parser.add_argument("--path", default=FEED_PATH)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=400, help="Events in the synthetic feed")
+    args = parser.parse_args()
+
+    # Per-request access logging would dominate the measurement.
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    if args.url:
+        parts = urlsplit(args.url)
+        run(parts.hostname or "127.0.0.1", parts.port or 80, args.path, args.clients, args.requests)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        docs = Path(tmp)
+        (docs / "ics").mkdir()
+        (docs / FEED_PATH.lstrip("/")).write_bytes(synthetic_feed(args.events))
+        server = FeedServer(("127.0.0.1", 0), docs, refresh_seconds=12 * 3600)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            run("127.0.0.1", server.server_address[1], FEED_PATH, args.clients, args.requests)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Local stand-ins for eriemetrosports.com, rinksatharborcenter.com and bondsports.co.
+
+Each site lives under a path prefix named after its host, so generated URLs
+still pass the scrapers' can_handle() checks:
+
+    /eriemetrosports.com/schedule/team_instance/<seed>   team schedule table
+    /eriemetrosports.com/game/show/<id>                  game page with og:title
+    /eriemetrosports.com/schedule/subseason/<id>         every team's games with start times
+    /rinksatharborcenter.com/stats#/1367/team/<seed>/schedule|scores
+                                                         SPA with a LOAD MORE button
+    /bondsports.co/league/<seed>                         page that fetches game JSON
+                                                         and renders game cards
+
+Page content comes from benchmarks.fixtures; the team seed picks the
+schedule. Every request can be delayed (latency plus jitter) and can fail
+with a 503 at a given rate.
+
+    python -m benchmarks.standin --port 8765 --games 120 --latency-ms 80
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import json
+import random
+import re
+import threading
+import time
+
+from benchmarks.fixtures import OPPONENTS, bond_games, erie_team_page, game_times, harborcenter_rows
+
+
+HARBORCENTER_PAGE_SIZE = 20
+
+ERIE_TEAM_RE = re.compile(r"^/eriemetrosports\.com/schedule/team_instance/(\d+)$")
+ERIE_GAME_RE = re.compile(r"^/eriemetrosports\.com/game/show/(\d+)$")
+ERIE_SUBSEASON_RE = re.compile(r"^/eriemetrosports\.com/schedule/subseason/(\d+)$")
+HARBORCENTER_API_RE = re.compile(r"^/rinksatharborcenter\.com/api/team/(\d+)/(schedule|scores)$")
+BOND_PAGE_RE = re.compile(r"^/bondsports\.co/league/(\d+)$")
+BOND_API_RE = re.compile(r"^/bondsports\.co/api/league/(\d+)/games$")
+
+# Boots from the URL hash like the real SPA: rows arrive a page at a time
+# and "LOAD MORE" fetches the next page.
+HARBORCENTER_SPA = """<!DOCTYPE html>
+<html><head><title>Stats</title></head><body>
+<table><tbody id="rows"></tbody></table>
+<button id="more" style="display:none">LOAD MORE</button>
+<script>
+const m = location.hash.match(/team\\/(\\d+)\\/(schedule|scores)/);
+let page = 0;
+async function load() {
+  const resp = await fetch(`/rinksatharborcenter.com/api/team/${m[1]}/${m[2]}?page=${page}`);
+  const data = await resp.json();
+  document.getElementById("rows").insertAdjacentHTML("beforeend", data.rows.join(""));
+  document.getElementById("more").style.display = data.more ? "" : "none";
+  page += 1;
+}
+document.getElementById("more").addEventListener("click", load);
+if (m) load();
+</script>
+</body></html>"""
+
+# Renders the game cards client-side from the API response, so both the
+# network-capture path and the DOM extraction path have something to read.
+BOND_SPA = """<!DOCTYPE html>
+<html><head><title>League</title></head><body>
+<div id="app"></div>
+<script>
+fetch("/bondsports.co/api/league/{seed}/games")
+  .then((resp) => resp.json())
+  .then((data) => {{
+    const card = (g) => `<article data-testid="game-card-${{g.id}}">` +
+      `<div data-testid="game-card-${{g.id}}-teams">${{g.homeTeam.name}} vs ${{g.awayTeam.name}}</div>` +
+      `<div data-testid="game-card-${{g.id}}-date"><time datetime="${{g.startDate}}">${{g.dateLabel}}</time></div>` +
+      `<div data-testid="game-card-${{g.id}}-space">${{g.space.name}}</div>` +
+      `<div data-testid="game-card-${{g.id}}-status">${{g.status}}</div></article>`;
+    document.getElementById("app").innerHTML =
+      `<div data-testid="competition-subtitle">${{data.venue.name}}</div>` + data.games.map(card).join("");
+  }});
+</script>
+</body></html>"""
+
+
+def _split_game_id(game_id: int, base: int) -> Tuple[int, int]:
+    # Fixture ids are base + seed * 10000 + row index.
+    return divmod(game_id - base, 10000)
+
+
+class StandInSites(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        games: int = 60,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+        teams: int = 0,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.games = games
+        # Team seeds 1..teams appear on the Erie subseason schedule; 0 serves
+        # it as a 404 so scrapers fall back to per-game pages.
+        self.teams = teams
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.bytes_sent = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def erie_team_url(self, seed: int) -> str:
+        return f"{self.base_url}/eriemetrosports.com/schedule/team_instance/{seed}?subseason=952202"
+
+    def harborcenter_team_url(self, seed: int) -> str:
+        return f"{self.base_url}/rinksatharborcenter.com/stats#/1367/team/{seed}/schedule"
+
+    def bond_team_url(self, seed: int) -> str:
+        return f"{self.base_url}/bondsports.co/league/{seed}"
+
+    def start(self) -> "StandInSites":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def delay_and_maybe_fail(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            delay = self.latency_ms + self.rng.uniform(0, self.jitter_ms)
+            failed = self.rng.random() < self.failure_rate
+            if failed:
+                self.failures += 1
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return failed
+
+    def route(self, path: str, query: dict) -> Optional[Tuple[str, bytes]]:
+        if match := ERIE_TEAM_RE.match(path):
+            seed = int(match.group(1))
+            page = erie_team_page(
+                self.games,
+                seed=seed,
+                game_url=f"{self.base_url}/eriemetrosports.com/game/show/{{id}}?subseason=952202",
+                final_games=self.games // 4,
+            )
+            return "text/html; charset=utf-8", page.encode("utf-8")
+
+        if match := ERIE_GAME_RE.match(path):
+            seed, index = _split_game_id(int(match.group(1)), 44000000)
+            start: datetime = game_times(index + 1, seed)[index]
+            title = f"Team {seed} vs. {OPPONENTS[index % len(OPPONENTS)]} - {start:%B %-d, %Y %-I:%M %p}"
+            html = f'<html><head><meta property="og:title" content="{title}"/></head></html>'
+            return "text/html; charset=utf-8", html.encode("utf-8")
+
+        if ERIE_SUBSEASON_RE.match(path) and self.teams:
+            rows = []
+            for seed in range(1, self.teams + 1):
+                for index, start in enumerate(game_times(self.games, seed)):
+                    game_id = 44000000 + seed * 10000 + index
+                    rows.append(
+                        f'<tr id="game_list_row_{game_id}"><td>{start:%a %b %-d}</td>'
+                        f'<td><a href="{self.base_url}/eriemetrosports.com/game/show/{game_id}">Team {seed}</a></td>'
+                        f"<td>{start:%-I:%M %p} EDT</td></tr>"
+                    )
+            html = "<html><body><table>" + "".join(rows) + "</table></body></html>"
+            return "text/html; charset=utf-8", html.encode("utf-8")
+
+        if path == "/rinksatharborcenter.com/stats":
+            return "text/html; charset=utf-8", HARBORCENTER_SPA.encode("utf-8")
+
+        if match := HARBORCENTER_API_RE.match(path):
+            seed, tab = int(match.group(1)), match.group(2)
+            rows = harborcenter_rows(self.games, team=f"Team {seed}", seed=seed, scores=tab == "scores")
+            page = int((query.get("page") or ["0"])[0])
+            chunk = rows[page * HARBORCENTER_PAGE_SIZE : (page + 1) * HARBORCENTER_PAGE_SIZE]
+            body = {"rows": chunk, "more": (page + 1) * HARBORCENTER_PAGE_SIZE < len(rows)}
+            return "application/json", json.dumps(body).encode("utf-8")
+
+        if match := BOND_PAGE_RE.match(path):
+            return "text/html; charset=utf-8", BOND_SPA.format(seed=match.group(1)).encode("utf-8")
+
+        if match := BOND_API_RE.match(path):
+            seed = int(match.group(1))
+            body = {"venue": {"name": "Northtown Center"}, "games": bond_games(self.games, team=f"Team {seed}", seed=seed)}
+            return "application/json", json.dumps(body).encode("utf-8")
+
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: StandInSites
+
+    def do_GET(self) -> None:
+        parts = urlsplit(self.path)
+        if self.server.delay_and_maybe_fail():
+            self._reply(503, "text/plain", b"Service Unavailable")
+            return
+        routed = self.server.route(parts.path, parse_qs(parts.query))
+        if routed is None:
+            self._reply(404, "text/plain", b"Not Found")
+            return
+        self._reply(200, *routed)
+
+    def _reply(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.bytes_sent += len(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--games", type=int, default=60)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StandInSites(
+        (args.host, args.port),
+        games=args.games,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+    )
+    print(f"Serving stand-in sites on {server.base_url}")
+    print(f"  {server.erie_team_url(1)}")
+    print(f"  {server.harborcenter_team_url(2)}")
+    print(f"  {server.bond_team_url(3)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
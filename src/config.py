@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import date
 
 import yaml
@@ -13,6 +13,14 @@ class Team(BaseModel):
     name: str
     urls: List[str]
     active: bool = True
+    # Daemon mode only: refresh this team on its own interval instead of
+    # AppConfig.refresh_interval_minutes.
+    refresh_interval_minutes: Optional[int] = None
+    # Also push this team's games into a Google Calendar (needs
+    # GOOGLE_CLIENT_ID/GOOGLE_CLIENT_SECRET/GOOGLE_REFRESH_TOKEN, or a
+    # short-lived GOOGLE_CALENDAR_TOKEN); subscribers see changes without ICS
+    # polling lag.
+    google_calendar_id: Optional[str] = None
 
 
 class Season(BaseModel):
@@ -24,9 +32,100 @@ class Season(BaseModel):
     teams: List[Team] = Field(default_factory=list)
 
 
+class AggregateFeed(BaseModel):
+    id: str
+    name: str
+    # Season ids to include; empty means every active season.
+    seasons: List[str] = Field(default_factory=list)
+    # Team ids to include; empty means every team in those seasons.
+    teams: List[str] = Field(default_factory=list)
+    # Keep only events whose location contains this text (e.g. "Rink 2").
+    location: Optional[str] = None
+
+
+class ConflictCheck(BaseModel):
+    # Games on different teams closer than this (or overlapping) are reported.
+    min_gap_minutes: int = 30
+    # Also publish the conflicts as docs/ics/conflicts.ics.
+    feed: bool = False
+
+
+class UpcomingWindow(BaseModel):
+    # Companion <team>-upcoming.ics feeds hold only games in this window.
+    days_ahead: int = 30
+    days_behind: int = 7
+
+
+class DaemonSettings(BaseModel):
+    # Each team's interval is stretched or shrunk by up to this fraction per
+    # run, so refreshes drift apart instead of all hitting the sites at once.
+    jitter: float = 0.1
+    # How often config.yaml is stat()ed for changes.
+    config_poll_seconds: int = 30
+
+
+class HarborcenterSettings(BaseModel):
+    # Render each league's schedule and scores once per run and serve every
+    # team from that index instead of rendering two tabs per team. Teams the
+    # index doesn't cover still render their own pages.
+    league_index: bool = False
+
+
+class ErieSettings(BaseModel):
+    # Resolve FINAL rows' start times from one subseason schedule fetch per
+    # run; games it doesn't list still fall back to their own game page.
+    subseason_index: bool = True
+
+
+class MemorySettings(BaseModel):
+    # Per-stage Python allocation peaks via tracemalloc (slows parsing noticeably).
+    tracemalloc: bool = False
+    # How often this process's and its children's (browsers, parse workers) RSS is read.
+    sample_seconds: float = 1.0
+    # Over these, parse workers are halved and the shared browser is recycled
+    # between teams instead of waiting for the OOM killer. Unset means no limit.
+    rss_budget_mb: Optional[int] = None
+    browser_budget_mb: Optional[int] = None
+
+
+class RuntimeSettings(BaseModel):
+    # "asyncio" drives every scraper from one event loop: teams' URLs and
+    # Harborcenter tabs are fetched and rendered concurrently, while blocking
+    # HTTP and parsing run on a thread pool. "sync" keeps the one-at-a-time
+    # sync Playwright scrapers.
+    mode: Literal["sync", "asyncio"] = "sync"
+    # Scrapes (one per team URL) in flight at once under asyncio.
+    max_concurrency: int = 8
+    # Threads for blocking requests calls and parsing under asyncio.
+    executor_workers: int = 16
+
+
 class AppConfig(BaseModel):
     timezone: str = "America/New_York"
+    # How often the scheduled build runs (see .github/workflows/scrape.yml).
+    refresh_interval_minutes: int = 720
+    # Worker processes for HTML parsing; 0/1 parses inline in the main process.
+    # Off by default: pickling pages to workers costs more than it saves on a
+    # single CPU (benchmarks/bench_parse.py: x0.86 with 2 workers). Turn it on
+    # only on a runner with spare cores and many large HTML schedules, sized
+    # at most to the core count, after bench_parse shows a speedup there.
+    parse_workers: int = 0
+    # Reuse last run's events for pages whose schedule region is unchanged
+    # (fingerprints and events are kept in .cache/parsed-pages.json).
+    parse_cache: bool = True
     seasons: List[Season] = Field(default_factory=list)
+    aggregates: List[AggregateFeed] = Field(default_factory=list)
+    conflicts: ConflictCheck = Field(default_factory=ConflictCheck)
+    # Rolling-window feeds per active team; omit to skip them.
+    upcoming: Optional[UpcomingWindow] = None
+    daemon: DaemonSettings = Field(default_factory=DaemonSettings)
+    memory: MemorySettings = Field(default_factory=MemorySettings)
+    harborcenter: HarborcenterSettings = Field(default_factory=HarborcenterSettings)
+    erie: ErieSettings = Field(default_factory=ErieSettings)
+    runtime: RuntimeSettings = Field(default_factory=RuntimeSettings)
+    # Prometheus textfile written after every run; point it into node_exporter's
+    # --collector.textfile.directory. Defaults to .cache/metrics.prom.
+    metrics_textfile: Optional[Path] = None
 
 
 def load_config(config_path: Path = Path("config.yaml")) -> AppConfig:
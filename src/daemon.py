@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+import os
+import random
+import signal
+import threading
+import time
+
+from loguru import logger
+import pytz
+import requests
+
+from src.config import AppConfig, Season, Team, load_config
+from src.main import ScrapeResources, publish_site, refresh_team, write_metrics
+from src.utils.browser import BrowserProvider
+from src.utils.gcal import GoogleCalendarClient
+from src.utils.memory import MEMORY
+from src.utils.page_cache import ParsedPageCache
+from src.utils.parsing import ParseStage
+from src.utils.report import RunReport
+from src.utils.state import state_path, write_json
+from src.utils.store import EventStore
+
+
+STATUS_PATH = state_path("daemon-status.json")
+# A team whose last this-many refreshes all came back empty marks the daemon
+# unhealthy in the status file.
+UNHEALTHY_AFTER_FAILURES = 3
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, pytz.UTC).isoformat()
+
+
+@dataclass
+class TeamSchedule:
+    team_id: str
+    interval_seconds: float
+    next_due: float
+    last_started: Optional[float] = None
+    last_duration: Optional[float] = None
+    last_events: Optional[int] = None
+    last_error: Optional[str] = None
+    runs: int = 0
+    consecutive_failures: int = 0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["next_due"] = _iso(self.next_due)
+        data["last_started"] = _iso(self.last_started)
+        return data
+
+
+class ScrapeDaemon:
+    """Resident alternative to the cron-started build (``python -m src.main --daemon``).
+
+    Keeps the parse pool, the event store, one Chromium and one HTTP session
+    open between refreshes. Each active team is refreshed on its own
+    jittered interval; after any refresh the combined feeds, manifest and
+    index are republished from the store. config.yaml is re-read only when
+    its mtime changes, and a JSON status file is rewritten after every tick
+    for health checks.
+    """
+
+    def __init__(
+        self,
+        config_path: Path = Path("config.yaml"),
+        status_path: Path = STATUS_PATH,
+        store: Optional[EventStore] = None,
+        resources: Optional[ScrapeResources] = None,
+        clock: Callable[[], float] = time.time,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.config_path = config_path
+        self.status_path = status_path
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.store = store or EventStore()
+        self.resources = resources or ScrapeResources(browser=BrowserProvider(), http=requests.Session())
+        self.gcal = GoogleCalendarClient.from_env()
+        self.config: Optional[AppConfig] = None
+        self.config_mtime_ns: Optional[int] = None
+        self.config_error: Optional[str] = None
+        self.parse_stage: Optional[ParseStage] = None
+        self.page_cache = ParsedPageCache()
+        self.teams: Dict[str, Tuple[Season, Team]] = {}
+        self.schedule: Dict[str, TeamSchedule] = {}
+        self.started_at = clock()
+        self.last_published: Optional[float] = None
+        self.publish_error: Optional[str] = None
+        self._stop = threading.Event()
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, lambda *_: self.stop())
+        signal.signal(signal.SIGINT, lambda *_: self.stop())
+        logger.info(f"Scrape daemon started (pid {os.getpid()})")
+        try:
+            while not self._stop.is_set():
+                self._stop.wait(self.tick())
+        finally:
+            self.close()
+            logger.info("Scrape daemon stopped")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def close(self) -> None:
+        MEMORY.stop()
+        if self.parse_stage is not None:
+            self.parse_stage.close()
+        self.resources.close()
+        self.store.close()
+
+    def tick(self) -> float:
+        """Reload config if needed, run due refreshes; returns seconds to sleep."""
+        self.reload_config()
+        if self.config is None:
+            self.write_status()
+            return 30.0
+
+        now = self.clock()
+        due = sorted((s for s in self.schedule.values() if s.next_due <= now), key=lambda s: s.next_due)
+        if due:
+            report = RunReport()
+            self.resources.start_run(self.config)
+            for entry in due:
+                _, team = self.teams[entry.team_id]
+                self.resources.prefetch(team.urls, self.config.timezone, team.name, self.parse_stage)
+            for entry in due:
+                if self._stop.is_set():
+                    break
+                self._refresh(entry, report)
+                MEMORY.enforce(self.parse_stage, self.resources.browser)
+            report.sections["memory"] = MEMORY.summary()
+            self._publish(report)
+
+        self.write_status()
+        now = self.clock()
+        next_due = min((s.next_due for s in self.schedule.values()), default=now + 3600)
+        return max(0.0, min(next_due - now, float(self.config.daemon.config_poll_seconds)))
+
+    def _publish(self, report: RunReport) -> None:
+        assert self.config is not None and self.parse_stage is not None
+        try:
+            if self.parse_stage.cache is not None:
+                self.page_cache.save()
+            publish_site(self.config, self.store, report)
+            report.write()
+            write_metrics(self.config, report)
+        except Exception as exc:
+            # A full disk or a bad aggregate must not take the daemon down;
+            # the store keeps the refreshed events and the next tick retries.
+            logger.error(f"Publishing failed: {exc}")
+            self.publish_error = str(exc)
+            return
+        self.publish_error = None
+        self.last_published = self.clock()
+
+    def reload_config(self) -> bool:
+        try:
+            mtime_ns = self.config_path.stat().st_mtime_ns
+        except OSError as exc:
+            self.config_error = str(exc)
+            return False
+        if mtime_ns == self.config_mtime_ns:
+            return False
+        self.config_mtime_ns = mtime_ns
+
+        try:
+            config = load_config(self.config_path)
+        except Exception as exc:
+            # Keep running on the last good config until the file is fixed.
+            self.config_error = str(exc)
+            logger.error(f"Ignoring invalid {self.config_path}: {exc}")
+            return False
+
+        self.config_error = None
+        if (
+            self.parse_stage is None
+            or self.config is None
+            or config.parse_workers != self.config.parse_workers
+            or config.parse_cache != self.config.parse_cache
+        ):
+            if self.parse_stage is not None:
+                self.parse_stage.close()
+            self.parse_stage = ParseStage(
+                workers=config.parse_workers, cache=self.page_cache if config.parse_cache else None
+            )
+        if self.config is None or config.memory != self.config.memory:
+            MEMORY.stop()
+            MEMORY.start(config.memory)
+        self.config = config
+        self._reschedule()
+        logger.info(f"Loaded {self.config_path}: {len(self.schedule)} active teams")
+        return True
+
+    def _reschedule(self) -> None:
+        assert self.config is not None
+        now = self.clock()
+        self.teams = {
+            team.id: (season, team)
+            for season in self.config.seasons
+            if season.active
+            for team in season.teams
+            if team.active
+        }
+        for team_id in list(self.schedule):
+            if team_id not in self.teams:
+                del self.schedule[team_id]
+
+        for team_id, (_, team) in self.teams.items():
+            interval = 60.0 * (team.refresh_interval_minutes or self.config.refresh_interval_minutes)
+            entry = self.schedule.get(team_id)
+            if entry is None:
+                # Spread the first round over the jitter window rather than
+                # scraping every team the moment the daemon starts.
+                self.schedule[team_id] = TeamSchedule(
+                    team_id=team_id,
+                    interval_seconds=interval,
+                    next_due=now + self.rng.uniform(0, interval * self.config.daemon.jitter),
+                )
+            elif entry.interval_seconds != interval:
+                entry.interval_seconds = interval
+                if entry.last_started is not None:
+                    entry.next_due = min(entry.next_due, entry.last_started + interval)
+
+    def _refresh(self, entry: TeamSchedule, report: RunReport) -> None:
+        assert self.config is not None and self.parse_stage is not None
+        season, team = self.teams[entry.team_id]
+        started = self.clock()
+        entry.last_started = started
+        entry.runs += 1
+        try:
+            entry.last_events = refresh_team(
+                self.config,
+                season,
+                team,
+                self.store,
+                self.parse_stage,
+                report,
+                datetime.fromtimestamp(started, pytz.UTC),
+                resources=self.resources,
+                gcal=self.gcal,
+            )
+            entry.last_error = None
+        except Exception as exc:
+            logger.error(f"Refreshing {team.name} failed: {exc}")
+            entry.last_events = 0
+            entry.last_error = str(exc)
+        entry.consecutive_failures = 0 if entry.last_events else entry.consecutive_failures + 1
+
+        finished = self.clock()
+        entry.last_duration = round(finished - started, 3)
+        jitter = self.config.daemon.jitter
+        entry.next_due = finished + entry.interval_seconds * self.rng.uniform(1 - jitter, 1 + jitter)
+
+    def healthy(self) -> bool:
+        return self.config is not None and self.config_error is None and self.publish_error is None and all(
+            entry.consecutive_failures < UNHEALTHY_AFTER_FAILURES for entry in self.schedule.values()
+        )
+
+    def write_status(self) -> None:
+        browser = self.resources.browser
+        write_json(
+            self.status_path,
+            {
+                "pid": os.getpid(),
+                "healthy": self.healthy(),
+                "started_at": _iso(self.started_at),
+                "heartbeat": _iso(self.clock()),
+                "last_published": _iso(self.last_published),
+                "publish_error": self.publish_error,
+                "config": {
+                    "path": str(self.config_path),
+                    "mtime_ns": self.config_mtime_ns,
+                    "error": self.config_error,
+                },
+                "browser_launches": browser.launches if browser is not None else 0,
+                "memory": MEMORY.summary(),
+                "teams": {team_id: entry.to_dict() for team_id, entry in sorted(self.schedule.items())},
+            },
+        )
@@ -1,18 +1,181 @@
 from __future__ import annotations
 
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import List
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
 from loguru import logger
 
-from datetime import datetime
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import heapq
+import json
+import os
 import re
+import time
 
-from src.config import load_config
-from src.scrapers.bond_sports import BondSportsScraper
-from src.scrapers.erie_metro import ErieMetroScraper
-from src.scrapers.rinks_harborcenter import HarborcenterScraper
+from dateutil import parser as dateparser
+import requests
+
+from src.config import AggregateFeed, AppConfig, Season, Team, load_config
+from src.scrapers.base import AsyncScraper, RawPage, Scraper
+from src.scrapers.bond_sports import AsyncBondSportsScraper, BondSportsScraper
+from src.scrapers.erie_metro import AsyncErieMetroScraper, ErieMetroScraper, SubseasonSchedule
+from src.scrapers.rinks_harborcenter import AsyncHarborcenterScraper, HarborcenterLeague, HarborcenterScraper
+from src.utils.aggregate import merge_sorted_events
+from src.utils.browser import AsyncBrowserProvider, BrowserProvider
+from src.utils.build_state import BUILD_STATE_PATH, BuildState, output_fingerprint, team_fingerprint
+from src.utils.conflicts import find_conflicts, tag_team
 from src.utils.events import Event
-from src.utils.ics import build_ics
+from src.utils.feeds import feed_entries, update_manifest
+from src.utils.gcal import CalendarSync, GoogleCalendarClient
+from src.utils.ics import patch_feed
+from src.utils.memory import MEMORY, memory_stage
+from src.utils.metrics import METRICS, METRICS_PATH, host_of
+from src.utils.page_cache import PAGE_CACHE_PATH, ParsedPageCache
+from src.utils.parsing import ParseStage
+from src.utils.profiling import PROFILER, profile_stage
+from src.utils.report import RunReport
+from src.utils.runtime import AsyncRuntime
+from src.utils.shards import (
+    event_to_dict,
+    load_shard_manifests,
+    parse_shard,
+    remove_shard_manifests,
+    shard_events,
+    shard_of,
+    write_shard_manifest,
+)
+from src.utils.state import state_path
+from src.utils.store import EventStore
+from src.utils.tracing import TRACER, span
+
+
+ICS_DIR = Path("docs/ics")
+INDEX_PATH = Path("docs/index.html")
+
+
+@dataclass
+class ScrapeResources:
+    """Scrape dependencies that outlive a single team refresh.
+
+    A one-shot build leaves both unset (each scraper launches its own browser
+    and uses plain requests); the daemon keeps one set warm for its lifetime.
+    With ``runtime.mode: asyncio`` start_run() also brings up the event loop
+    and its shared async Chromium, and scrapes go through async_scrapers().
+    """
+
+    browser: Optional[BrowserProvider] = None
+    http: Optional[requests.Session] = None
+    # Per-run indexes, set by start_run() when enabled in config.
+    harborcenter_league: Optional[HarborcenterLeague] = None
+    erie_subseasons: Optional[SubseasonSchedule] = None
+    runtime: Optional[AsyncRuntime] = None
+    async_browser: Optional[AsyncBrowserProvider] = None
+    scrape_slots: Optional[asyncio.Semaphore] = None
+    # How many prefetched teams may be scraping ahead of the one being read.
+    prefetch_depth: int = 0
+    _prefetched: Dict[tuple, "ScrapeStream"] = field(default_factory=dict, init=False, repr=False)
+    _prefetch_queue: Dict[tuple, tuple] = field(default_factory=dict, init=False, repr=False)
+
+    def scrapers(self, team_name: str | None) -> List[Scraper]:
+        return [
+            BondSportsScraper(team_name=team_name, browser_provider=self.browser),
+            ErieMetroScraper(team_name=team_name, session=self.http, subseasons=self.erie_subseasons),
+            HarborcenterScraper(team_name=team_name, browser_provider=self.browser, league=self.harborcenter_league),
+        ]
+
+    def async_scrapers(self, team_name: str | None) -> List[AsyncScraper]:
+        return [
+            AsyncBondSportsScraper(team_name=team_name, browser_provider=self.async_browser),
+            AsyncErieMetroScraper(team_name=team_name, session=self.http, subseasons=self.erie_subseasons),
+            AsyncHarborcenterScraper(
+                team_name=team_name, browser_provider=self.async_browser, league=self.harborcenter_league
+            ),
+        ]
+
+    def start_run(self, config: AppConfig) -> None:
+        """Drop per-run indexes so each run sees fresh league pages."""
+        self.harborcenter_league = (
+            HarborcenterLeague(browser_provider=self.browser) if config.harborcenter.league_index else None
+        )
+        self.erie_subseasons = SubseasonSchedule() if config.erie.subseason_index else None
+
+        if config.runtime.mode != "asyncio":
+            self._close_runtime()
+            return
+        if self.runtime is None:
+            self.runtime = AsyncRuntime(workers=config.runtime.executor_workers)
+            self.async_browser = AsyncBrowserProvider()
+        else:
+            self.runtime.run(self._discard_prefetched())
+        self.scrape_slots = asyncio.Semaphore(config.runtime.max_concurrency)
+        self.prefetch_depth = config.runtime.max_concurrency
+
+    def prefetch(self, urls: List[str], timezone: str, team_name: str | None, parse_stage: ParseStage) -> None:
+        """Start scraping a team now; iter_events() picks the stream up later.
+
+        Lets a run queue every due team up front so fetches and renders for
+        later teams overlap the store and feed work for earlier ones, within
+        ``runtime.max_concurrency``. At most ``prefetch_depth`` teams are
+        scraped ahead of the one being read; the rest wait their turn, so
+        unread events can't pile up past what the memory budget allows for.
+        A no-op without the asyncio runtime.
+        """
+        if self.runtime is None:
+            return
+        key = (team_name, tuple(urls), timezone)
+        if key in self._prefetched or key in self._prefetch_queue:
+            return
+        self._prefetch_queue[key] = (urls, timezone, team_name, parse_stage)
+        self.runtime.run(self._start_prefetched())
+
+    async def stream_events(
+        self, urls: List[str], timezone: str, team_name: str | None, parse_stage: ParseStage
+    ) -> AsyncIterator[Event]:
+        key = (team_name, tuple(urls), timezone)
+        self._prefetch_queue.pop(key, None)
+        stream = self._prefetched.pop(key, None)
+        if stream is None:
+            stream = ScrapeStream(self, urls, timezone, team_name, parse_stage)
+        # Reading this team frees a place in the prefetch window.
+        await self._start_prefetched()
+        try:
+            async for event in stream:
+                yield event
+        finally:
+            await stream.cancel()
+
+    async def _start_prefetched(self) -> None:
+        while self._prefetch_queue and len(self._prefetched) < self.prefetch_depth:
+            key = next(iter(self._prefetch_queue))
+            urls, timezone, team_name, parse_stage = self._prefetch_queue.pop(key)
+            self._prefetched[key] = ScrapeStream(self, urls, timezone, team_name, parse_stage)
+
+    async def _discard_prefetched(self) -> None:
+        self._prefetch_queue = {}
+        streams, self._prefetched = list(self._prefetched.values()), {}
+        for stream in streams:
+            await stream.cancel()
+
+    def _close_runtime(self) -> None:
+        if self.runtime is None:
+            return
+        self.runtime.run(self._discard_prefetched())
+        if self.async_browser is not None:
+            self.runtime.run(self.async_browser.close())
+        self.runtime.close()
+        self.runtime = None
+        self.async_browser = None
+        self.scrape_slots = None
+
+    def close(self) -> None:
+        self._close_runtime()
+        if self.browser is not None:
+            self.browser.close()
+        if self.http is not None:
+            self.http.close()
 
 
 def slugify(name: str) -> str:
@@ -23,9 +186,19 @@ def slugify(name: str) -> str:
     return slug or "calendar"
 
 
-def collect_events(urls: List[str], timezone: str, team_name: str | None = None) -> List[Event]:
-    scrapers = [BondSportsScraper(team_name=team_name), ErieMetroScraper(team_name=team_name), HarborcenterScraper(team_name=team_name)]
-    events: List[Event] = []
+def iter_events(
+    urls: List[str],
+    timezone: str,
+    team_name: str | None = None,
+    parse_stage: ParseStage | None = None,
+    resources: ScrapeResources | None = None,
+) -> Iterator[Event]:
+    parse_stage = parse_stage or ParseStage()
+    if resources is not None and resources.runtime is not None:
+        yield from resources.runtime.iterate(resources.stream_events(urls, timezone, team_name, parse_stage))
+        return
+
+    scrapers = (resources or ScrapeResources()).scrapers(team_name)
 
     for url in urls:
         handled = False
@@ -33,80 +206,370 @@ def collect_events(urls: List[str], timezone: str, team_name: str | None = None)
             if s.can_handle(url):
                 handled = True
                 logger.info(f"Scraping {url} with {s.__class__.__name__}")
+                labels = {"scraper": s.__class__.__name__, "host": host_of(url)}
+                started = time.perf_counter()
+                count = 0
+                outcome = "failure"
                 try:
-                    found = s.scrape(url, timezone)
-                    events.extend(found)
+                    stage = f"scrape {labels['scraper']}"
+                    with span("scrape", url=url, scraper=labels["scraper"]), profile_stage(stage), memory_stage(stage):
+                        for ev in parse_stage.iter_events(s, metered_pages(s.iter_pages(url, timezone), labels), timezone):
+                            count += 1
+                            yield ev
+                    outcome = "success" if count else "empty"
                 except Exception as exc:
                     logger.error(f"Failed to scrape {url}: {exc}")
+                finally:
+                    METRICS.observe("hockey_scrape_duration_seconds", time.perf_counter() - started, labels)
+                    METRICS.inc("hockey_scrape_total", {**labels, "outcome": outcome})
+                    METRICS.inc("hockey_scrape_events_total", labels, count)
                 break
         if not handled:
             logger.warning(f"No scraper available for URL: {url}")
-    return events
 
 
-def build_team_feeds() -> None:
-    config = load_config()
+class ScrapeStream:
+    """One team's URLs scraped concurrently on the asyncio runtime.
+
+    Every URL starts as its own task when the stream is created (on the
+    runtime's loop); iterating replays the events in URL order, each URL's
+    pages as soon as they are parsed, so dedupe and the store see exactly
+    what the sync path would produce.
+    """
+
+    def __init__(
+        self,
+        resources: ScrapeResources,
+        urls: List[str],
+        timezone: str,
+        team_name: str | None,
+        parse_stage: ParseStage,
+    ) -> None:
+        scrapers = resources.async_scrapers(team_name)
+        self.queues: List[asyncio.Queue] = []
+        self.tasks: List[asyncio.Task] = []
+        for url in urls:
+            scraper = next((s for s in scrapers if s.can_handle(url)), None)
+            if scraper is None:
+                logger.warning(f"No scraper available for URL: {url}")
+                continue
+            queue: asyncio.Queue = asyncio.Queue()
+            self.queues.append(queue)
+            self.tasks.append(
+                asyncio.create_task(scrape_url(scraper, url, timezone, parse_stage, queue, resources.scrape_slots))
+            )
+
+    async def __aiter__(self) -> AsyncIterator[Event]:
+        for queue in self.queues:
+            while (events := await queue.get()) is not None:
+                for event in events:
+                    yield event
+
+    async def cancel(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
 
-    timezone = config.timezone
+async def scrape_url(
+    scraper: AsyncScraper,
+    url: str,
+    timezone: str,
+    parse_stage: ParseStage,
+    out: asyncio.Queue,
+    slots: asyncio.Semaphore | None = None,
+) -> None:
+    """iter_events' per-URL body for the asyncio runtime: lists of parsed
+    events go to ``out`` page by page, then None once the URL is done."""
+    labels = {"scraper": scraper.__class__.__name__, "host": host_of(url)}
+    try:
+        async with slots or nullcontext():
+            logger.info(f"Scraping {url} with {labels['scraper']}")
+            started = time.perf_counter()
+            count = 0
+            outcome = "failure"
+            try:
+                # Stages interleave on the loop thread, so only the span is
+                # kept here; parsing is profiled on its executor thread.
+                with span("scrape", url=url, scraper=labels["scraper"]):
+                    async for source_url, payload in scraper.aiter_pages(url, timezone):
+                        METRICS.inc("hockey_fetch_bytes_total", labels, payload_size(payload))
+                        events = await parse_stage.parse_async(scraper, source_url, payload, timezone)
+                        count += len(events)
+                        out.put_nowait(events)
+                outcome = "success" if count else "empty"
+            except Exception as exc:
+                logger.error(f"Failed to scrape {url}: {exc}")
+            finally:
+                METRICS.observe("hockey_scrape_duration_seconds", time.perf_counter() - started, labels)
+                METRICS.inc("hockey_scrape_total", {**labels, "outcome": outcome})
+                METRICS.inc("hockey_scrape_events_total", labels, count)
+    finally:
+        out.put_nowait(None)
 
-    docs = Path("docs/ics")
-    docs.mkdir(parents=True, exist_ok=True)
 
+def payload_size(payload: Any) -> int:
+    if isinstance(payload, str):
+        return len(payload.encode("utf-8"))
+    if payload is None:
+        return 0
+    # In-browser extraction hands over records instead of HTML.
+    return len(json.dumps(payload, default=str))
+
+
+def metered_pages(pages: Iterable[RawPage], labels: Dict[str, str]) -> Iterator[RawPage]:
+    for source_url, payload in pages:
+        METRICS.inc("hockey_fetch_bytes_total", labels, payload_size(payload))
+        yield source_url, payload
+
+
+def collect_events(
+    urls: List[str],
+    timezone: str,
+    team_name: str | None = None,
+    parse_stage: ParseStage | None = None,
+    resources: ScrapeResources | None = None,
+) -> List[Event]:
+    return list(iter_events(urls, timezone, team_name=team_name, parse_stage=parse_stage, resources=resources))
+
+
+def iter_unique_events(events: Iterable[Event]) -> Iterator[Event]:
+    # Dedupe with source IDs when available so the same game can move from
+    # "schedule" to "scores" without creating a second calendar event.
+    # Only the keys are remembered, so this streams.
+    seen = set()
+    for e in events:
+        if e.external_id:
+            key = e.external_id
+        else:
+            # Create a normalized version for deduplication
+            normalized_location = ""
+            if e.location:
+                # Normalize Harborcenter locations to be consistent
+                if "LECOM Harborcenter" in e.location:
+                    normalized_location = "LECOM Harborcenter"
+                else:
+                    normalized_location = e.location
+
+            key = f"{e.summary}|{e.start.isoformat()}|{e.end.isoformat()}|{normalized_location}"
+        if key not in seen:
+            seen.add(key)
+            yield e
+
+
+def file_identity(path: Path) -> Tuple[int, int] | None:
+    # patch_feed swaps in a new file when it writes, so the inode changes.
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+def publish_feed(path: Path, events: Iterable[Event], cal_name: str, timezone: str, report: RunReport) -> None:
+    # Patch the published feed so unchanged games keep their exact bytes;
+    # only added/changed/removed VEVENTs move.
+    before = file_identity(path)
+    with span("publish_feed", feed=path.name), profile_stage("build_ics"), memory_stage("build_ics"):
+        changes = patch_feed(path, METRICS.count_events(events, path.name), cal_name=cal_name, tz_name=timezone)
+    for change in changes:
+        logger.info(f"{path.name}: {change.kind} {change.summary} ({change.start})")
+        METRICS.inc("hockey_feed_changes_total", {"kind": change.kind})
+    if file_identity(path) != before:
+        METRICS.inc("hockey_feed_writes_total", {"feed": path.name})
+    report.section("changes")[path.name] = [asdict(c) for c in changes]
+
+
+def aggregate_teams(config: AppConfig, aggregate: AggregateFeed) -> List[Team]:
+    teams: List[Team] = []
+    for season in config.seasons:
+        if aggregate.seasons and season.id not in aggregate.seasons:
+            continue
+        if not aggregate.seasons and not season.active:
+            continue
+        teams.extend(team for team in season.teams if not aggregate.teams or team.id in aggregate.teams)
+    return teams
+
+
+def build_aggregate_feeds(config: AppConfig, store: EventStore, docs: Path, report: RunReport) -> List[str]:
+    """Write the combined feeds from the stored per-team lists; no rescraping."""
+    links: List[str] = []
+    for aggregate in config.aggregates:
+        filename = f"{slugify(aggregate.name)}.ics"
+        streams = [store.events_for_team(team.id) for team in aggregate_teams(config, aggregate)]
+        publish_feed(
+            docs / filename,
+            merge_sorted_events(streams, location=aggregate.location),
+            cal_name=aggregate.name,
+            timezone=config.timezone,
+            report=report,
+        )
+        links.append(f'<li><a href="ics/{filename}">{aggregate.name}</a></li>')
+    return links
+
+
+def check_conflicts(config: AppConfig, store: EventStore, docs: Path, report: RunReport) -> List[str]:
+    """Report cross-team double-bookings over every active team's stored games."""
+    streams = [
+        tag_team(team.name, store.events_for_team(team.id))
+        for season in config.seasons
+        if season.active
+        for team in season.teams
+        if team.active
+    ]
+    conflicts = find_conflicts(
+        heapq.merge(*streams, key=lambda pair: pair[1].start),
+        timedelta(minutes=config.conflicts.min_gap_minutes),
+    )
+    for conflict in conflicts:
+        logger.warning(
+            f"Schedule conflict ({conflict.kind}, {conflict.gap_minutes} min): "
+            f"{conflict.first_team} {conflict.first.summary} / {conflict.second_team} {conflict.second.summary}"
+        )
+    report.sections["conflicts"] = [conflict.to_dict() for conflict in conflicts]
+
+    if not config.conflicts.feed:
+        return []
+    publish_feed(
+        docs / "conflicts.ics",
+        sorted((conflict.to_event() for conflict in conflicts), key=lambda e: e.start),
+        cal_name="Schedule Conflicts",
+        timezone=config.timezone,
+        report=report,
+    )
+    return ['<li><a href="ics/conflicts.ics">Schedule Conflicts</a></li>']
+
+
+def season_sort_key(season: Season):
     # Sort seasons by start date descending (most recent first), unknown dates last
-    def season_sort_key(season):
-        return (season.start is not None, season.start or datetime.min.date())
+    return (season.start is not None, season.start or datetime.min.date())
 
-    sorted_seasons = sorted(config.seasons, key=season_sort_key, reverse=True)
 
-    # Track link targets for index (name+season slugs)
-    season_sections: List[str] = []
+def refresh_team(
+    config: AppConfig,
+    season: Season,
+    team: Team,
+    store: EventStore,
+    parse_stage: ParseStage,
+    report: RunReport,
+    run_started: datetime,
+    resources: ScrapeResources | None = None,
+    gcal: GoogleCalendarClient | None = None,
+) -> int:
+    """Scrape one active team into the store and republish its feeds.
 
-    for season in sorted_seasons:
-        season_slug = slugify(season.name)
-        team_links = []
-        
-        for team in season.teams:
-            # Always show team in index with link, but only update ICS for active teams
-            name_slug = slugify(team.name)
-            preferred_filename = f"{name_slug}-{season_slug}.ics"
-            
-            if team.active and season.active:
-                # Generate fresh ICS for active teams
-                events: List[Event] = collect_events(team.urls, timezone, team_name=team.name)
-                # Dedupe with source IDs when available so the same game can move from
-                # "schedule" to "scores" without creating a second calendar event.
-                unique_map = {}
-                for e in events:
-                    if e.external_id:
-                        key = e.external_id
-                        if key not in unique_map:
-                            unique_map[key] = e
-                        continue
+    Returns the number of events scraped (0 when every source failed, in
+    which case the stored schedule is kept as is).
+    """
+    with span("team", team=team.id), profile_stage("team"), memory_stage("team"):
+        feed_name, *upcoming_names = team_feed_names(config, season, team)
+        ICS_DIR.mkdir(parents=True, exist_ok=True)
+
+        # Pages and rows stream through dedupe into the event store, and the feed
+        # is rendered from the store so played games are retained.
+        events = iter_events(team.urls, config.timezone, team_name=team.name, parse_stage=parse_stage, resources=resources)
+        upserted = store.sync_team(team.id, season.id, iter_unique_events(events), run_started)
+        if not upserted:
+            logger.warning(f"No events scraped for {team.name}; keeping its stored schedule")
+        publish_feed(ICS_DIR / feed_name, store.events_for_team(team.id), team.name, config.timezone, report)
 
-                    # Create a normalized version for deduplication
-                    normalized_location = ""
-                    if e.location:
-                        # Normalize Harborcenter locations to be consistent
-                        if "LECOM Harborcenter" in e.location:
-                            normalized_location = "LECOM Harborcenter"
-                        else:
-                            normalized_location = e.location
-                    
-                    key = f"{e.summary}|{e.start.isoformat()}|{e.end.isoformat()}|{normalized_location}"
-                    if key not in unique_map:
-                        unique_map[key] = e
-                unique_events = sorted(unique_map.values(), key=lambda e: e.start)
-                ics_bytes = build_ics(unique_events, cal_name=team.name, tz_name=timezone)
-                (docs / preferred_filename).write_bytes(ics_bytes)
-
-            team_links.append(f'<li><a href="ics/{preferred_filename}">{team.name}</a></li>')
-        
+        if config.upcoming and upcoming_names:
+            window = config.upcoming
+            publish_feed(
+                ICS_DIR / upcoming_names[0],
+                store.events_between(
+                    run_started - timedelta(days=window.days_behind),
+                    run_started + timedelta(days=window.days_ahead),
+                    team_id=team.id,
+                ),
+                f"{team.name} (Upcoming)",
+                config.timezone,
+                report,
+            )
+
+        if team.google_calendar_id:
+            sync_google_calendar(team, store, report, gcal)
+    return upserted
+
+
+def sync_google_calendar(team: Team, store: EventStore, report: RunReport, gcal: GoogleCalendarClient | None) -> None:
+    if gcal is None:
+        logger.warning(f"Skipping Google Calendar sync for {team.name}: no GOOGLE_REFRESH_TOKEN (with client id/secret) or GOOGLE_CALENDAR_TOKEN is set")
+        return
+    try:
+        result = CalendarSync(gcal, team.google_calendar_id).sync(store.events_for_team(team.id))
+    except Exception as exc:
+        logger.error(f"Google Calendar sync failed for {team.name}: {exc}")
+        return
+    logger.info(
+        f"Google Calendar {team.name}: {result.inserted} inserted, {result.patched} patched, "
+        f"{result.deleted} deleted, {result.unchanged} unchanged, {len(result.failed)} failed "
+        f"in {result.batches} batch(es)"
+    )
+    report.section("google_calendar")[team.id] = asdict(result)
+
+
+def team_feed_names(config: AppConfig, season: Season, team: Team) -> List[str]:
+    """The team's feed filename, then its upcoming feed if it gets one."""
+    base = f"{slugify(team.name)}-{slugify(season.name)}"
+    names = [f"{base}.ics"]
+    if config.upcoming and team.active and season.active:
+        names.append(f"{base}-upcoming.ics")
+    return names
+
+
+def team_link(config: AppConfig, season: Season, team: Team) -> str:
+    # Always show team in index with link, but only active teams get the
+    # rolling upcoming feed.
+    filename, *upcoming_names = team_feed_names(config, season, team)
+    if config.upcoming and upcoming_names:
+        upcoming_filename = upcoming_names[0]
+        return (
+            f'<li><a href="ics/{filename}">{team.name}</a>'
+            f' (<a href="ics/{upcoming_filename}">next {config.upcoming.days_ahead} days</a>)</li>'
+        )
+    return f'<li><a href="ics/{filename}">{team.name}</a></li>'
+
+
+def publish_site(
+    config: AppConfig,
+    store: EventStore,
+    report: RunReport,
+    known_feeds: Dict[str, dict] | None = None,
+) -> None:
+    """Combined feeds, conflicts, manifest and index.html from the stored events."""
+    ICS_DIR.mkdir(parents=True, exist_ok=True)
+    season_sections: List[str] = []
+    for season in sorted(config.seasons, key=season_sort_key, reverse=True):
+        team_links = [team_link(config, season, team) for team in season.teams]
         # Always add season section if there are teams
         if team_links:
             season_sections.append(f"<h2>{season.name}</h2>\n<ul>\n{chr(10).join(team_links)}\n</ul>")
 
-    index = Path("docs/index.html")
-    index.write_text(
+    # Combined calendars merge the per-team lists already in the store.
+    with span("aggregates"), profile_stage("aggregates"):
+        aggregate_links = build_aggregate_feeds(config, store, ICS_DIR, report)
+    with span("conflicts"), profile_stage("conflicts"):
+        aggregate_links += check_conflicts(config, store, ICS_DIR, report)
+    if aggregate_links:
+        season_sections.append(f"<h2>Combined Calendars</h2>\n<ul>\n{chr(10).join(aggregate_links)}\n</ul>")
+
+    # Precompressed copies plus sizes/hashes of every feed for cheap refreshes.
+    with span("manifest"), profile_stage("manifest"):
+        feeds = update_manifest(ICS_DIR, known=known_feeds)["feeds"]
+    report.sections["manifest"] = {
+        "feeds": len(feeds),
+        "bytes": sum(entry["bytes"] for entry in feeds.values()),
+        "gzip_bytes": sum(entry["gzip_bytes"] for entry in feeds.values()),
+    }
+
+    write_index(season_sections)
+
+
+def write_index(season_sections: List[str]) -> None:
+    # The page around the links is static, so identical text means the set
+    # of links is unchanged; leave the file (and its mtime) alone then.
+    html = (
         f"""
 <!DOCTYPE html>
 <html lang=\"en\">
@@ -138,10 +601,247 @@ def build_team_feeds() -> None:
   <p>Bryan Karchensky</p>
 </body>
 </html>
-""".strip(),
-        encoding="utf-8",
+""".strip()
+    )
+    if INDEX_PATH.exists() and INDEX_PATH.read_text(encoding="utf-8") == html:
+        return
+    INDEX_PATH.write_text(html, encoding="utf-8")
+
+
+def write_metrics(config: AppConfig, report: RunReport) -> None:
+    finished = datetime.now(report.started_at.tzinfo)
+    METRICS.set("hockey_build_duration_seconds", (finished - report.started_at).total_seconds())
+    METRICS.set("hockey_build_last_success_timestamp_seconds", finished.timestamp())
+    try:
+        METRICS.write_textfile(config.metrics_textfile or METRICS_PATH)
+    except OSError as exc:
+        # Metrics are best effort; never fail a build over them.
+        logger.warning(f"Failed to write metrics textfile: {exc}")
+
+
+def build_team_feeds(
+    shard: Tuple[int, int] | None = None, changed_only: bool = False, run_id: str | None = None
+) -> None:
+    """Scrape every active team and publish the site.
+
+    With ``shard=(i, n)`` only the active teams hashed to shard i are built,
+    and instead of the combined feeds and index a shard manifest is written
+    for merge_shards() to assemble, stamped with ``run_id``. With ``changed_only`` teams whose config
+    and published feeds are unchanged since the last build, and that are
+    not yet due for a refresh, are skipped.
+    """
+    config = load_config()
+    report = RunReport()
+    gcal = GoogleCalendarClient.from_env()
+    resources = ScrapeResources()
+    try:
+        resources.start_run(config)
+        build_state = BuildState(
+            state_path(f"build-state-shard-{shard[0]}-of-{shard[1]}.json") if shard else BUILD_STATE_PATH
+        )
+        page_cache = (
+            ParsedPageCache(state_path(f"parsed-pages-shard-{shard[0]}-of-{shard[1]}.json") if shard else PAGE_CACHE_PATH)
+            if config.parse_cache
+            else None
+        )
+        shard_teams: Dict[str, dict] = {}
+        shard_feeds: List[str] = []
+        MEMORY.start(config.memory)
+
+        with ParseStage(workers=config.parse_workers, cache=page_cache) as parse_stage, EventStore() as store:
+            plan = []
+            for season in sorted(config.seasons, key=season_sort_key, reverse=True):
+                if not season.active:
+                    continue
+                for team in season.teams:
+                    if not team.active:
+                        continue
+                    if shard and shard_of(team.id, shard[1]) != shard[0]:
+                        continue
+
+                    feed_names = team_feed_names(config, season, team)
+                    config_fp = team_fingerprint(config, season, team)
+                    reason = build_state.rebuild_reason(
+                        team.id,
+                        config_fp,
+                        output_fingerprint(ICS_DIR / name for name in feed_names),
+                        report.started_at,
+                        timedelta(minutes=team.refresh_interval_minutes or config.refresh_interval_minutes),
+                    )
+                    plan.append((season, team, feed_names, config_fp, reason))
+
+            # Under the asyncio runtime every team starts scraping now; the loop
+            # below still stores and publishes them one at a time, in order.
+            for _, team, _, _, reason in plan:
+                if reason is not None or not changed_only:
+                    resources.prefetch(team.urls, config.timezone, team.name, parse_stage)
+
+            for season, team, feed_names, config_fp, reason in plan:
+                if changed_only and reason is None:
+                    logger.info(f"Skipping {team.name}: unchanged and not due")
+                    seen_at = build_state.built_at(team.id)
+                    report.section("skipped")[team.id] = seen_at
+                    upserted = None
+                else:
+                    if changed_only:
+                        logger.info(f"Rebuilding {team.name}: {reason}")
+                    upserted = refresh_team(
+                        config, season, team, store, parse_stage, report, report.started_at, resources=resources, gcal=gcal
+                    )
+                    MEMORY.enforce(parse_stage)
+                    build_state.record(
+                        team.id,
+                        config_fp,
+                        output_fingerprint(ICS_DIR / name for name in feed_names),
+                        report.started_at,
+                    )
+                    seen_at = report.started_at.isoformat()
+
+                if shard:
+                    shard_teams[team.id] = {
+                        "season_id": season.id,
+                        # Skipped teams replay with their own last build time
+                        # so the merge doesn't treat them as freshly scraped.
+                        "seen_at": seen_at,
+                        "upserted": upserted,
+                        "events": [event_to_dict(ev) for ev in store.events_for_team(team.id)],
+                    }
+                    shard_feeds.extend(feed_names)
+
+            if shard is None:
+                publish_site(config, store, report)
+
+    finally:
+        resources.close()
+    report.sections["memory"] = MEMORY.stop()
+    build_state.save()
+    if page_cache is not None:
+        report.sections["parse_cache"] = {"hits": page_cache.hits, "misses": page_cache.misses}
+        page_cache.save()
+    if shard is None:
+        report.write()
+        write_metrics(config, report)
+        return
+
+    index, count = shard
+    path = write_shard_manifest(
+        index,
+        count,
+        report.started_at.isoformat(),
+        shard_teams,
+        feed_entries(ICS_DIR, shard_feeds),
+        run_id=run_id,
     )
+    logger.info(f"Shard {index}/{count}: built {len(shard_teams)} team(s), wrote {path}")
+    report.write(state_path(f"run-report-shard-{index}-of-{count}.json"))
+    write_metrics(config, report)
+
+
+def merge_shards(count: int, run_id: str | None = None) -> None:
+    """Assemble the site from `count` shard builds.
+
+    Each shard's stored events are replayed into the local event store (so
+    shards may have run on other machines), then the combined feeds,
+    conflicts, global manifest and index.html are published as usual.
+    Manifests from another run (or too old) fail the merge, and merged
+    ones are removed afterwards.
+    """
+    config = load_config()
+    report = RunReport()
+    manifests = load_shard_manifests(count, run_id=run_id)
+    known_feeds: Dict[str, dict] = {}
+
+    with EventStore() as store:
+        for manifest in manifests:
+            for team_id, entry in manifest["teams"].items():
+                seen_at = dateparser.isoparse(entry.get("seen_at") or manifest["started_at"])
+                store.sync_team(team_id, entry["season_id"], shard_events(entry), seen_at)
+            known_feeds.update(manifest["feeds"])
+        publish_site(config, store, report, known_feeds=known_feeds)
+
+    remove_shard_manifests(count)
+    logger.info(f"Merged {count} shard(s): {sum(len(m['teams']) for m in manifests)} team(s)")
+    report.write()
+    write_metrics(config, report)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Scrape team schedules and publish ICS feeds under docs/")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Stay resident and refresh each team on its own interval instead of running once",
+    )
+    mode.add_argument(
+        "--shard",
+        metavar="I/N",
+        help="Build only the active teams hashed to shard I of N (0-based) and write a shard manifest",
+    )
+    mode.add_argument(
+        "--merge-shards",
+        metavar="N",
+        type=int,
+        help="Publish combined feeds, manifest and index.html from N shard manifests",
+    )
+    parser.add_argument(
+        "--run-id",
+        default=os.environ.get("GITHUB_RUN_ID"),
+        help="Stamp shard manifests with this id; --merge-shards rejects manifests from other runs "
+        "(default: $GITHUB_RUN_ID)",
+    )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Skip teams whose config and feeds are unchanged since the last build and that are not due",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        type=Path,
+        help="Record spans and write a Chrome trace-event JSON timeline (open in Perfetto or chrome://tracing)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        type=Path,
+        help="cProfile each stage (scrape per scraper, parse, build_ics, ...), parse inline, "
+        "write DIR/<stage>.prof and print the top hotspots",
+    )
+    args = parser.parse_args(argv)
+
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as exc:
+            parser.error(str(exc))
+    if args.merge_shards is not None and args.merge_shards < 1:
+        parser.error("--merge-shards needs at least 1 shard")
+    if args.daemon and args.changed_only:
+        parser.error("--changed-only does not apply to --daemon, which schedules each team itself")
+
+    if args.trace:
+        TRACER.enable()
+    if args.profile:
+        PROFILER.enable()
+    try:
+        if args.daemon:
+            from src.daemon import ScrapeDaemon
+
+            ScrapeDaemon().run()
+        elif args.merge_shards is not None:
+            merge_shards(args.merge_shards, run_id=args.run_id)
+        else:
+            build_team_feeds(shard=shard, changed_only=args.changed_only, run_id=args.run_id)
+    finally:
+        if args.profile:
+            PROFILER.disable()
+            PROFILER.dump(args.profile)
+        if args.trace:
+            TRACER.export(args.trace)
+            logger.info(f"Wrote trace with {len(TRACER.events())} span(s) to {args.trace}")
 
 
 if __name__ == "__main__":
-    build_team_feeds()
+    main()
@@ -1,16 +1,100 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
+import asyncio
 
 from src.utils.events import Event
 
 
+# (source_url, raw payload) for one fetched page. The payload is whatever the
+# scraper's parse() understands: an HTML string or in-page extracted records.
+RawPage = Tuple[str, Any]
+
+
 class Scraper(ABC):
     @abstractmethod
     def can_handle(self, url: str) -> bool:  # pragma: no cover
         raise NotImplementedError
 
     @abstractmethod
-    def scrape(self, url: str, timezone: str) -> List[Event]:  # pragma: no cover
-        raise NotImplementedError
\ No newline at end of file
+    def iter_pages(self, url: str, timezone: str) -> Iterator[RawPage]:  # pragma: no cover
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_parse(self, source_url: str, payload: Any, timezone: str) -> Iterator[Event]:  # pragma: no cover
+        raise NotImplementedError
+
+    def content_fingerprint(self, payload: Any) -> Optional[str]:
+        # Hash of the part of a payload iter_parse() reads, for reusing last
+        # run's events (see ParsedPageCache); None always re-parses.
+        return None
+
+    def prepare_parse(self, source_url: str, payload: Any) -> None:
+        # Called in this process before a payload is parsed on a pool worker,
+        # which only gets a pickled copy of the scraper: shared per-run
+        # lookups the parse needs are filled in here, once.
+        pass
+
+    def lookups_failed(self, source_url: str) -> bool:
+        # True when the last iter_parse() of source_url fell back on a failed
+        # network lookup; those events are not reused on the next run.
+        return False
+
+    def iter_events(self, url: str, timezone: str) -> Iterator[Event]:
+        # Pages are yielded as soon as they are fetched and events as soon as
+        # each row is parsed, so only one page payload is alive at a time and
+        # downstream work starts before the last page arrives.
+        for source_url, payload in self.iter_pages(url, timezone):
+            yield from self.iter_parse(source_url, payload, timezone)
+
+    def fetch(self, url: str, timezone: str) -> List[RawPage]:
+        return list(self.iter_pages(url, timezone))
+
+    def parse(self, source_url: str, payload: Any, timezone: str) -> List[Event]:
+        return list(self.iter_parse(source_url, payload, timezone))
+
+    def scrape(self, url: str, timezone: str) -> List[Event]:
+        return list(self.iter_events(url, timezone))
+
+
+class AsyncScraper(ABC):
+    """Scraper contract for the asyncio runtime (see src.utils.runtime).
+
+    Fetching is a coroutine so one event loop can overlap many pages and
+    browser renders. Parsing stays synchronous: BeautifulSoup and dateutil
+    hold the GIL anyway, and some parsers fetch extra pages with requests,
+    so ``aiter_events`` runs ``parse`` on the loop's executor threads.
+    """
+
+    @abstractmethod
+    def can_handle(self, url: str) -> bool:  # pragma: no cover
+        raise NotImplementedError
+
+    @abstractmethod
+    def aiter_pages(self, url: str, timezone: str) -> AsyncIterator[RawPage]:  # pragma: no cover
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_parse(self, source_url: str, payload: Any, timezone: str) -> Iterator[Event]:  # pragma: no cover
+        raise NotImplementedError
+
+    def content_fingerprint(self, payload: Any) -> Optional[str]:
+        return None
+
+    def prepare_parse(self, source_url: str, payload: Any) -> None:
+        pass
+
+    def lookups_failed(self, source_url: str) -> bool:
+        return False
+
+    def parse(self, source_url: str, payload: Any, timezone: str) -> List[Event]:
+        return list(self.iter_parse(source_url, payload, timezone))
+
+    async def aiter_events(self, url: str, timezone: str) -> AsyncIterator[Event]:
+        async for source_url, payload in self.aiter_pages(url, timezone):
+            for event in await asyncio.to_thread(self.parse, source_url, payload, timezone):
+                yield event
+
+    async def scrape_async(self, url: str, timezone: str) -> List[Event]:
+        return [event async for event in self.aiter_events(url, timezone)]
@@ -1,50 +1,363 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from hashlib import sha256
+from typing import Any, AsyncIterator, Iterator, List, Optional, Union
+import asyncio
+import json
 import re
+import time
 
 from bs4 import BeautifulSoup, Tag
-from playwright.sync_api import sync_playwright
+from loguru import logger
+from playwright.async_api import Page as AsyncPage
+from playwright.async_api import Response as AsyncResponse
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Page, Response
 import pytz
 
-from src.scrapers.base import Scraper
+from src.scrapers.base import AsyncScraper, RawPage, Scraper
+from src.utils.browser import AsyncBrowserProvider, BrowserProvider, async_open_browser, open_browser
 from src.utils.events import Event, guess_end
+from src.utils.metrics import METRICS
+from src.utils.tracing import span
 
 
 SCORE_RE = re.compile(r"\b(\d+)\s*-\s*(\d+)\b")
+CARD_HTML_RE = re.compile(r"<article\b[^>]*data-testid=[\"']game-card-[^>]*>.*?</article>", re.IGNORECASE | re.DOTALL)
+VENUE_HTML_RE = re.compile(
+    r"data-testid=[\"']competition-subtitle[\"'][^>]*>.*?</(?:div|p|span|h[1-6]|header|section)>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Network capture: the game cards are rendered from JSON the page fetches from
+# the Bond API, so we read those responses directly and stop once the API has
+# been quiet for CAPTURE_QUIET_MS after the first game payload.
+CAPTURE_TIMEOUT_MS = 20000
+CAPTURE_QUIET_MS = 750
+CAPTURE_POLL_MS = 100
+# Best guesses at the API's field names. A capture is only trusted when it
+# accounts for every game the page shows (see _capture_complete); a miss here
+# costs the slower DOM path, not games.
+GAME_START_KEYS = ("startDate", "startDateTime", "startTime", "startsAt", "start")
+GAME_TEAM_KEYS = ("homeTeam", "awayTeam", "teams", "competitors", "participants")
+# Pagination hints: more pages to come, or a total larger than what arrived.
+MORE_PAGES_KEYS = ("hasMore", "hasNextPage", "hasNext", "nextPage", "nextCursor", "nextPageToken")
+TOTAL_COUNT_KEYS = ("totalCount", "totalItems", "totalResults", "total")
+
+
+# Runs inside the rendered page and returns just the fields _event_from_record
+# needs, so we don't ship the whole DOM back through page.content(). Text is
+# gathered the way BeautifulSoup's get_text(sep, strip=True) does it, so both
+# extraction paths produce identical records.
+EXTRACT_SCRIPT = """
+() => {
+  const text = (el, sep = " ") => {
+    if (!el) return null;
+    const parts = [];
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+      const t = walker.currentNode.nodeValue.trim();
+      if (t) parts.push(t);
+    }
+    return parts.join(sep);
+  };
+  const byTestId = (root, id) => root.querySelector(`[data-testid="${id}"]`);
+  const cards = Array.from(document.querySelectorAll('article[data-testid^="game-card-"]'))
+    .filter((card) => card.getAttribute("data-testid").split("-").length === 3)
+    .map((card) => {
+      const id = card.getAttribute("data-testid").slice("game-card-".length);
+      const date = byTestId(card, `game-card-${id}-date`);
+      const time = date ? date.querySelector("time[datetime]") : null;
+      return {
+        id,
+        teams: text(byTestId(card, `game-card-${id}-teams`)),
+        datetime: time ? time.getAttribute("datetime") : null,
+        date: text(date),
+        time: text(byTestId(card, `game-card-${id}-time`)),
+        space: text(byTestId(card, `game-card-${id}-space`)),
+        status: text(byTestId(card, `game-card-${id}-status`)),
+      };
+    });
+  return { venue: text(byTestId(document, "competition-subtitle"), ""), cards };
+}
+"""
+
+
+# Game cards currently rendered, filtered the way EXTRACT_SCRIPT filters them.
+CARD_COUNT_SCRIPT = """
+() => Array.from(document.querySelectorAll('article[data-testid^="game-card-"]'))
+  .filter((card) => card.getAttribute("data-testid").split("-").length === 3).length
+"""
+
+
+def _walk_dicts(data: Any) -> Iterator[dict]:
+    if isinstance(data, dict):
+        yield data
+        for value in data.values():
+            yield from _walk_dicts(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from _walk_dicts(item)
+
+
+def _name_of(value: Any) -> Optional[str]:
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, dict):
+        for key in ("name", "title", "displayName"):
+            if isinstance(value.get(key), str) and value[key].strip():
+                return value[key].strip()
+        for key in ("team", "resource", "space"):
+            if key in value:
+                return _name_of(value[key])
+    return None
+
+
+def _game_teams(game: dict) -> Optional[str]:
+    if "homeTeam" in game or "awayTeam" in game:
+        names = [_name_of(game.get("homeTeam")), _name_of(game.get("awayTeam"))]
+    else:
+        sides = next((game[key] for key in GAME_TEAM_KEYS if isinstance(game.get(key), list)), [])
+        names = [_name_of(side) for side in sides]
+    names = [name for name in names if name]
+    # Exactly two sides: seasons/divisions also carry start dates and team lists.
+    return " vs ".join(names) if len(names) == 2 else None
+
+
+def _game_score(game: dict) -> Optional[str]:
+    home = game.get("homeScore", game.get("homeTeamScore"))
+    away = game.get("awayScore", game.get("awayTeamScore"))
+    if isinstance(home, (int, float)) and isinstance(away, (int, float)):
+        return f"{int(home)} - {int(away)}"
+    return None
+
+
+def game_records_from_json(data: Any) -> List[dict]:
+    """Pull game-card-shaped records out of a Bond API JSON payload."""
+    records: dict[str, dict] = {}
+    for node in _walk_dicts(data):
+        game_id = node.get("id")
+        start = next((node[key] for key in GAME_START_KEYS if isinstance(node.get(key), str)), None)
+        teams = _game_teams(node)
+        if game_id is None or not start or not teams:
+            continue
+
+        status = node.get("status") if isinstance(node.get("status"), str) else ""
+        score = _game_score(node)
+        if score:
+            status = f"{status} {score}".strip()
+
+        records[str(game_id)] = {
+            "id": str(game_id),
+            "teams": teams,
+            "datetime": start,
+            "date": start,
+            "time": None,
+            "space": _name_of(node.get("space") or node.get("resource")),
+            "status": status,
+        }
+    return list(records.values())
+
+
+def has_more_pages(data: Any) -> Optional[bool]:
+    """Whether a Bond API payload says further pages of results exist, or
+    None when it carries no pagination fields at all."""
+    hints = [node[key] for node in _walk_dicts(data) for key in MORE_PAGES_KEYS if key in node]
+    if not hints:
+        return None
+    return any(hint not in (None, False, "", 0) for hint in hints)
+
+
+def advertised_total(data: Any) -> int:
+    """The largest result count a Bond API payload advertises (0 if none)."""
+    totals = [
+        node[key]
+        for node in _walk_dicts(data)
+        for key in TOTAL_COUNT_KEYS
+        if isinstance(node.get(key), int) and not isinstance(node.get(key), bool)
+    ]
+    return max(totals, default=0)
+
+
+def venue_from_json(data: Any) -> Optional[str]:
+    for node in _walk_dicts(data):
+        for key in ("venueName", "facilityName"):
+            if isinstance(node.get(key), str) and node[key].strip():
+                return node[key].strip()
+        for key in ("venue", "facility"):
+            name = _name_of(node.get(key)) if isinstance(node.get(key), dict) else None
+            if name:
+                return name
+    return None
 
 
 class BondSportsScraper(Scraper):
-    def __init__(self, team_name: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        team_name: Optional[str] = None,
+        extract_in_browser: bool = True,
+        capture_network: bool = True,
+        browser_provider: Optional[BrowserProvider] = None,
+    ) -> None:
         self.team_name = team_name
+        self.extract_in_browser = extract_in_browser
+        self.capture_network = capture_network
+        self.browser_provider = browser_provider
 
     def can_handle(self, url: str) -> bool:
         return "bondsports.co" in url
 
-    def scrape(self, url: str, timezone: str) -> List[Event]:
-        html = self._render_page(url)
-        return self._parse(html, url, timezone)
+    def iter_pages(self, url: str, timezone: str) -> Iterator[RawPage]:
+        yield (url, self._render_payload(url))
 
-    def _render_page(self, url: str) -> str:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
+    def iter_parse(self, source_url: str, payload: Union[str, dict], timezone: str) -> Iterator[Event]:
+        if isinstance(payload, str):
+            payload = self._records_from_html(payload)
+        venue = payload.get("venue") or None
+
+        for record in payload.get("cards") or []:
+            event = self._event_from_record(record, source_url, timezone, venue)
+            if event:
+                yield event
+
+    def content_fingerprint(self, payload: Union[str, dict]) -> str:
+        # The venue subtitle and the game cards; text dates without a year
+        # are read against the current one, so that is part of it too.
+        if isinstance(payload, str):
+            region = "".join(VENUE_HTML_RE.findall(payload) + CARD_HTML_RE.findall(payload))
+        else:
+            region = json.dumps(payload, sort_keys=True, default=str)
+        return sha256(f"{date.today().year}|{region}".encode("utf-8")).hexdigest()
+
+    def _render_payload(self, url: str) -> Union[str, dict]:
+        with open_browser(self.browser_provider) as browser:
             page = browser.new_page()
+            try:
+                return self._page_payload(page, url)
+            finally:
+                page.close()
+
+    def _page_payload(self, page: Page, url: str) -> Union[str, dict]:
+        payload: Union[str, dict, None] = None
+        strategy = "network_capture"
+        if self.capture_network:
+            payload = self._capture_payload(page, url)
+            if payload is not None and not self._capture_complete(page, payload):
+                payload = None
+            if payload is None:
+                # No (complete) game JSON; the page is loaded, let the DOM path
+                # finish, clicking "Show All" for any games not yet listed.
+                self._settle_page(page)
+        else:
+            self._load_page(page, url)
+        if payload is None and self.extract_in_browser:
+            strategy = "dom_extract"
+            try:
+                payload = page.evaluate(EXTRACT_SCRIPT)
+            except PlaywrightError:
+                # Fall back to a full DOM dump and the BeautifulSoup parser.
+                payload = None
+        if payload is None:
+            strategy = "html"
+            payload = page.content()
+        METRICS.inc("hockey_fetch_strategy_total", {"scraper": self.__class__.__name__, "strategy": strategy})
+        return payload
+
+    def _capture_payload(self, page: Page, url: str) -> Optional[dict]:
+        pending: List[Response] = []
+
+        def on_response(response: Response) -> None:
+            if response.request.resource_type not in ("xhr", "fetch"):
+                return
+            if "bondsports" not in response.url:
+                return
+            if "json" not in (response.headers.get("content-type") or ""):
+                return
+            pending.append(response)
+
+        page.on("response", on_response)
+        try:
+            with span("goto", url=url):
+                page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            venue: Optional[str] = None
+            cards: dict[str, dict] = {}
+            more_pages = False
+            total = 0
+            deadline = time.monotonic() + CAPTURE_TIMEOUT_MS / 1000
+            last_response = time.monotonic()
+
+            while time.monotonic() < deadline:
+                # wait_for_timeout pumps Playwright's event loop so on_response fires.
+                with span("capture poll", responses=len(pending)):
+                    page.wait_for_timeout(CAPTURE_POLL_MS)
+                while pending:
+                    response = pending.pop(0)
+                    last_response = time.monotonic()
+                    try:
+                        data = response.json()
+                    except Exception:
+                        continue
+                    venue = venue or venue_from_json(data)
+                    # The latest page's hint wins: page 1 says "more", the last says none.
+                    more = has_more_pages(data)
+                    more_pages = more_pages if more is None else more
+                    total = max(total, advertised_total(data))
+                    for record in game_records_from_json(data):
+                        cards[record["id"]] = record
+
+                if cards and (time.monotonic() - last_response) * 1000 >= CAPTURE_QUIET_MS:
+                    break
+        finally:
+            page.remove_listener("response", on_response)
+
+        if not cards:
+            return None
+        if more_pages or total > len(cards):
+            # A later page or lazily loaded batch never arrived.
+            logger.info(f"Captured {len(cards)} games of {total or 'more'} from {url}; reading the page instead")
+            return None
+        return {"venue": venue, "cards": list(cards.values())}
+
+    def _capture_complete(self, page: Page, payload: dict) -> bool:
+        """Whether the captured games are the whole schedule.
+
+        The page must not be offering "Show All" (more games behind it) or
+        showing more game cards than the capture found, which also catches
+        games the JSON matcher failed to recognise.
+        """
+        show_all = page.locator("text=/Show All/")
+        if show_all.count() > 0 and show_all.first.is_visible():
+            return False
+        try:
+            rendered = page.evaluate(CARD_COUNT_SCRIPT)
+        except PlaywrightError:
+            return True
+        return rendered <= len(payload["cards"])
+
+    def _load_page(self, page: Page, url: str) -> None:
+        with span("goto", url=url):
             page.goto(url, wait_until="networkidle", timeout=60000)
+        self._settle_page(page)
+
+    def _settle_page(self, page: Page) -> None:
+        with span("settle"):
             page.wait_for_timeout(5000)
 
-            show_all = page.locator("text=/Show All/")
-            if show_all.count() > 0 and show_all.first.is_visible():
+        show_all = page.locator("text=/Show All/")
+        if show_all.count() > 0 and show_all.first.is_visible():
+            with span("show all"):
                 show_all.first.click()
                 page.wait_for_timeout(3000)
 
-            html = page.content()
-            browser.close()
-        return html
-
     def _parse(self, html: str, source_url: str, timezone: str) -> List[Event]:
+        return self.parse(source_url, html, timezone)
+
+    def _parse_records(self, payload: dict, source_url: str, timezone: str) -> List[Event]:
+        return self.parse(source_url, payload, timezone)
+
+    def _records_from_html(self, html: str) -> dict:
         soup = BeautifulSoup(html, "html.parser")
-        events: List[Event] = []
 
         venue_el = soup.find(attrs={"data-testid": "competition-subtitle"})
         venue = venue_el.get_text(strip=True) if venue_el else None
@@ -54,40 +367,57 @@ class BondSportsScraper(Scraper):
             attrs={"data-testid": lambda v: v and v.startswith("game-card-") and v.count("-") == 2},
         )
 
-        for card in cards:
-            event = self._parse_card(card, source_url, timezone, venue)
-            if event:
-                events.append(event)
-
-        return events
+        return {"venue": venue, "cards": (self._card_record(card) for card in cards)}
 
-    def _parse_card(self, card: Tag, source_url: str, timezone: str, venue: Optional[str] = None) -> Optional[Event]:
+    def _card_record(self, card: Tag) -> dict:
         game_id = card["data-testid"].replace("game-card-", "")
 
-        teams_div = card.find(attrs={"data-testid": f"game-card-{game_id}-teams"})
-        if not teams_div:
-            return None
+        def text(suffix: str) -> Optional[str]:
+            el = card.find(attrs={"data-testid": f"game-card-{game_id}-{suffix}"})
+            return el.get_text(" ", strip=True) if el else None
 
-        teams_text = teams_div.get_text(" ", strip=True)
+        date_div = card.find(attrs={"data-testid": f"game-card-{game_id}-date"})
+        time_el = date_div.find("time", attrs={"datetime": True}) if date_div else None
+
+        return {
+            "id": game_id,
+            "teams": text("teams"),
+            "datetime": time_el["datetime"] if time_el else None,
+            "date": text("date"),
+            "time": text("time"),
+            "space": text("space"),
+            "status": text("status"),
+        }
+
+    def _event_from_record(
+        self,
+        record: dict,
+        source_url: str,
+        timezone: str,
+        venue: Optional[str] = None,
+    ) -> Optional[Event]:
+        game_id = record["id"]
+
+        teams_text = record.get("teams")
+        if teams_text is None:
+            return None
 
         if self.team_name and not self._team_matches(teams_text):
             return None
 
-        start = self._parse_start(card, game_id, timezone)
+        start = self._parse_start(record, timezone)
         if not start:
             return None
 
-        space_div = card.find(attrs={"data-testid": f"game-card-{game_id}-space"})
-        space = space_div.get_text(" ", strip=True) if space_div else None
+        space = record.get("space")
         if space and venue:
             location = f"{space}, {venue}"
         else:
             location = space or venue
 
-        status_div = card.find(attrs={"data-testid": f"game-card-{game_id}-status"})
-        status = status_div.get_text(" ", strip=True) if status_div else ""
+        status = record.get("status") or ""
 
-        score = self._extract_score(card, game_id)
+        score = self._extract_score(status)
         summary = teams_text
         if score:
             summary = f"{summary} ({score})"
@@ -114,15 +444,13 @@ class BondSportsScraper(Scraper):
         haystack = teams_text.lower()
         return needle in haystack
 
-    def _parse_start(self, card: Tag, game_id: str, timezone: str) -> Optional[datetime]:
-        date_div = card.find(attrs={"data-testid": f"game-card-{game_id}-date"})
-        if not date_div:
+    def _parse_start(self, record: dict, timezone: str) -> Optional[datetime]:
+        if record.get("date") is None:
             return None
 
         # Prefer the <time datetime="..."> ISO attribute (UTC)
-        time_el = date_div.find("time", attrs={"datetime": True})
-        if time_el:
-            iso = time_el["datetime"]
+        iso = record.get("datetime")
+        if iso:
             try:
                 dt_utc = datetime.fromisoformat(iso.replace("Z", "+00:00"))
                 return dt_utc.astimezone(pytz.timezone(timezone))
@@ -130,10 +458,7 @@ class BondSportsScraper(Scraper):
                 pass
 
         # Fallback: parse text
-        date_text = date_div.get_text(" ", strip=True)
-        time_div = card.find(attrs={"data-testid": f"game-card-{game_id}-time"})
-        time_text = time_div.get_text(" ", strip=True) if time_div else ""
-        combined = f"{date_text} {time_text}".strip()
+        combined = f"{record.get('date') or ''} {record.get('time') or ''}".strip()
 
         try:
             from dateutil import parser as dateparser
@@ -145,12 +470,132 @@ class BondSportsScraper(Scraper):
 
         return None
 
-    def _extract_score(self, card: Tag, game_id: str) -> Optional[str]:
-        status_div = card.find(attrs={"data-testid": f"game-card-{game_id}-status"})
-        if not status_div:
-            return None
-        text = status_div.get_text(" ", strip=True)
-        match = SCORE_RE.search(text)
+    def _extract_score(self, status: str) -> Optional[str]:
+        match = SCORE_RE.search(status)
         if match:
             return f"{match.group(1)}-{match.group(2)}"
         return None
+
+
+class AsyncBondSportsScraper(BondSportsScraper, AsyncScraper):
+    """BondSportsScraper for the asyncio runtime; same strategies, same records."""
+
+    def __init__(
+        self,
+        team_name: Optional[str] = None,
+        extract_in_browser: bool = True,
+        capture_network: bool = True,
+        browser_provider: Optional[AsyncBrowserProvider] = None,
+    ) -> None:
+        super().__init__(team_name=team_name, extract_in_browser=extract_in_browser, capture_network=capture_network)
+        self.browser_provider = browser_provider
+
+    async def aiter_pages(self, url: str, timezone: str) -> AsyncIterator[RawPage]:
+        yield (url, await self._render_payload_async(url))
+
+    async def _render_payload_async(self, url: str) -> Union[str, dict]:
+        async with async_open_browser(self.browser_provider) as browser:
+            page = await browser.new_page()
+            try:
+                return await self._page_payload_async(page, url)
+            finally:
+                await page.close()
+
+    async def _page_payload_async(self, page: AsyncPage, url: str) -> Union[str, dict]:
+        payload: Union[str, dict, None] = None
+        strategy = "network_capture"
+        if self.capture_network:
+            payload = await self._capture_payload_async(page, url)
+            if payload is not None and not await self._capture_complete_async(page, payload):
+                payload = None
+            if payload is None:
+                await self._settle_page_async(page)
+        else:
+            with span("goto", url=url):
+                await page.goto(url, wait_until="networkidle", timeout=60000)
+            await self._settle_page_async(page)
+        if payload is None and self.extract_in_browser:
+            strategy = "dom_extract"
+            try:
+                payload = await page.evaluate(EXTRACT_SCRIPT)
+            except PlaywrightError:
+                payload = None
+        if payload is None:
+            strategy = "html"
+            payload = await page.content()
+        METRICS.inc("hockey_fetch_strategy_total", {"scraper": self.__class__.__name__, "strategy": strategy})
+        return payload
+
+    async def _capture_payload_async(self, page: AsyncPage, url: str) -> Optional[dict]:
+        pending: List[AsyncResponse] = []
+
+        def on_response(response: AsyncResponse) -> None:
+            if response.request.resource_type not in ("xhr", "fetch"):
+                return
+            if "bondsports" not in response.url:
+                return
+            if "json" not in (response.headers.get("content-type") or ""):
+                return
+            pending.append(response)
+
+        page.on("response", on_response)
+        try:
+            with span("goto", url=url):
+                await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            venue: Optional[str] = None
+            cards: dict[str, dict] = {}
+            more_pages = False
+            total = 0
+            deadline = time.monotonic() + CAPTURE_TIMEOUT_MS / 1000
+            last_response = time.monotonic()
+
+            while time.monotonic() < deadline:
+                with span("capture poll", responses=len(pending)):
+                    await asyncio.sleep(CAPTURE_POLL_MS / 1000)
+                while pending:
+                    response = pending.pop(0)
+                    last_response = time.monotonic()
+                    try:
+                        data = await response.json()
+                    except Exception:
+                        continue
+                    venue = venue or venue_from_json(data)
+                    # The latest page's hint wins: page 1 says "more", the last says none.
+                    more = has_more_pages(data)
+                    more_pages = more_pages if more is None else more
+                    total = max(total, advertised_total(data))
+                    for record in game_records_from_json(data):
+                        cards[record["id"]] = record
+
+                if cards and (time.monotonic() - last_response) * 1000 >= CAPTURE_QUIET_MS:
+                    break
+        finally:
+            page.remove_listener("response", on_response)
+
+        if not cards:
+            return None
+        if more_pages or total > len(cards):
+            # A later page or lazily loaded batch never arrived.
+            logger.info(f"Captured {len(cards)} games of {total or 'more'} from {url}; reading the page instead")
+            return None
+        return {"venue": venue, "cards": list(cards.values())}
+
+    async def _capture_complete_async(self, page: AsyncPage, payload: dict) -> bool:
+        show_all = page.locator("text=/Show All/")
+        if await show_all.count() > 0 and await show_all.first.is_visible():
+            return False
+        try:
+            rendered = await page.evaluate(CARD_COUNT_SCRIPT)
+        except PlaywrightError:
+            return True
+        return rendered <= len(payload["cards"])
+
+    async def _settle_page_async(self, page: AsyncPage) -> None:
+        with span("settle"):
+            await page.wait_for_timeout(5000)
+
+        show_all = page.locator("text=/Show All/")
+        if await show_all.count() > 0 and await show_all.first.is_visible():
+            with span("show all"):
+                await show_all.first.click()
+                await page.wait_for_timeout(3000)
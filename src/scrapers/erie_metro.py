@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime, timedelta
+from hashlib import sha256
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 import random
 import asyncio
+import threading
 import warnings
 import logging
 import re
-from urllib.parse import urljoin
+from urllib.parse import parse_qs, urljoin, urlsplit
 
 import requests
 from bs4 import BeautifulSoup, Tag
@@ -15,8 +19,11 @@ from dateutil import parser as dateparser
 import pytz
 from playwright.async_api import async_playwright, Page
 
-from src.scrapers.base import Scraper
+from src.scrapers.base import AsyncScraper, RawPage, Scraper
 from src.utils.events import Event, guess_end, localize, adjust_year_if_past
+from src.utils.metrics import METRICS
+from src.utils.state import state_path
+from src.utils.tracing import span
 
 # Suppress asyncio warnings
 logging.getLogger('asyncio').setLevel(logging.CRITICAL)
@@ -26,6 +33,9 @@ warnings.filterwarnings('ignore', category=RuntimeWarning, module='asyncio')
 SCORE_RE = re.compile(r"\b\d+\s*-\s*\d+\b")
 SEASON_RANGE_RE = re.compile(r"\b(20\d{2})\s*[-/]\s*(\d{2,4})\b")
 OG_TITLE_TIME_RE = re.compile(r"-\s*(.+)$")
+GAME_ID_RE = re.compile(r"/game/show/(\d+)")
+ROW_GAME_ID_RE = re.compile(r"game_list_row_(\d+)")
+START_TIME_RE = re.compile(r"\b\d{1,2}:\d{2}\s*[AaPp]\.?[Mm]\.?(?:\s*[A-Z]{2,4}\b)?")
 MAC_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -34,12 +44,41 @@ MAC_HEADERS = {
     "Connection": "keep-alive",
     "Upgrade-Insecure-Requests": "1",
 }
+MOBILE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+# Cookies/local storage from the last browser session that got through, so the
+# fallback can skip the homepage warm-up. Stale state is discarded on failure.
+SESSION_STATE_PATH = state_path("erie_metro_storage_state.json")
+SESSION_STATE_MAX_AGE = timedelta(days=7)
+# _extract_season_years reads the first 1000 characters of page text; a season
+# range within this many raw HTML characters is certainly among them.
+SEASON_HEAD_CHARS = 1000
 
 
 class ErieMetroScraper(Scraper):
-    def __init__(self, team_name: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        team_name: Optional[str] = None,
+        session_state_path: Optional[Path] = SESSION_STATE_PATH,
+        session: Optional[requests.Session] = None,
+        subseasons: Optional["SubseasonSchedule"] = None,
+    ) -> None:
         self.team_name = team_name
+        self.session_state_path = session_state_path
+        # A shared Session keeps connections to the site alive between teams;
+        # without one, plain requests.get opens a new connection per page.
+        # None (not the requests module) keeps the scraper picklable for the
+        # parse pool.
+        self.http = session
+        self.subseasons = subseasons
         self._game_start_cache: dict[str, datetime] = {}
+        # Pages whose last parse had a FINAL row with no resolvable start time.
+        self._failed_lookups: set[str] = set()
 
     def can_handle(self, url: str) -> bool:
         return "eriemetrosports.com" in url
@@ -140,7 +179,7 @@ class ErieMetroScraper(Scraper):
             return self._game_start_cache[game_url]
 
         try:
-            resp = requests.get(game_url, timeout=20, headers=MAC_HEADERS)
+            resp = self._get(game_url, timeout=20, headers=MAC_HEADERS)
             resp.raise_for_status()
             soup = BeautifulSoup(resp.text, "html.parser")
             og_title = soup.find("meta", attrs={"property": "og:title"})
@@ -161,52 +200,84 @@ class ErieMetroScraper(Scraper):
         except Exception:
             return None
 
-    def scrape(self, url: str, timezone: str) -> List[Event]:
-        """Main scrape method that uses Mac user agent (working) with browser automation fallback"""
+    def iter_pages(self, url: str, timezone: str) -> Iterator[RawPage]:
+        yield (url, self._fetch_team_page(url))
+
+    def _fetch_team_page(self, url: str) -> Optional[str]:
+        """Fetch the team page using Mac user agent (working) with browser automation fallback"""
         # Strategy 1: Mac user agent (most reliable)
         try:
-            resp = requests.get(url, timeout=30, headers=MAC_HEADERS)
+            resp = self._get(url, timeout=30, headers=MAC_HEADERS)
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "html.parser")
+            self._record_strategy("mac_ua")
+            return resp.text
         except Exception as e:
             print(f"Mac user agent failed, trying browser automation: {e}")
             
             # Strategy 2: Browser automation fallback
             try:
-                content = asyncio.run(self._scrape_with_browser(url))
-                soup = BeautifulSoup(content, "html.parser")
+                html = self._run_browser(url)
+                self._record_strategy("browser")
+                return html
             except Exception as e2:
                 print(f"Browser automation failed, trying mobile user agent: {e2}")
                 
                 # Strategy 3: Mobile user agent fallback
                 try:
-                    resp = requests.get(url, timeout=30, headers={
-                        'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                        'Accept-Language': 'en-US,en;q=0.5',
-                        'Accept-Encoding': 'gzip, deflate',
-                        'Connection': 'keep-alive',
-                    })
+                    resp = self._get(url, timeout=30, headers=MOBILE_HEADERS)
                     resp.raise_for_status()
-                    soup = BeautifulSoup(resp.text, "html.parser")
+                    self._record_strategy("mobile_ua")
+                    return resp.text
                 except Exception as e3:
-                    # If all strategies fail, return placeholder event
+                    # If all strategies fail, parse() yields nothing for the missing page
                     print(f"All scraping strategies failed for Erie Metro. Mac UA: {e}, Browser: {e2}, Mobile UA: {e3}")
-                    return [Event(
-                        summary=f"{self.team_name} - Schedule Unavailable",
-                        start=datetime.now(pytz.timezone(timezone)),
-                        end=datetime.now(pytz.timezone(timezone)),
-                        timezone=timezone,
-                        location="Erie Metro Sports",
-                        description="Unable to retrieve schedule due to bot protection. Please check the website directly.",
-                        source_url=url,
-                    )]
-
-        events: List[Event] = []
+                    self._record_strategy("failed")
+                    return None
+
+    def content_fingerprint(self, payload: Optional[str]) -> Optional[str]:
+        """Hash of the schedule table and the season heading that dates it.
+
+        Only a failed fetch (no payload, no events) is always re-parsed. A
+        page with no season range in its head resolves years against today,
+        so its fingerprint also changes daily.
+        """
+        if payload is None:
+            return None
+        start = payload.find("<table")
+        end = payload.rfind("</table>")
+        table = payload[start:end] if 0 <= start < end else ""
+        season = SEASON_RANGE_RE.search(payload[:SEASON_HEAD_CHARS])
+        dated_by = season.group(0) if season else date.today().isoformat()
+        return sha256(f"{dated_by}|{table}".encode("utf-8")).hexdigest()
+
+    def prepare_parse(self, source_url: str, payload: Optional[str]) -> None:
+        if payload is not None and self.subseasons is not None:
+            self.subseasons.prime(source_url, self)
+
+    def lookups_failed(self, source_url: str) -> bool:
+        return source_url in self._failed_lookups
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        with span("http get", url=url):
+            return (self.http or requests).get(url, **kwargs)
+
+    def _record_strategy(self, strategy: str) -> None:
+        METRICS.inc("hockey_fetch_strategy_total", {"scraper": self.__class__.__name__, "strategy": strategy})
+
+    def iter_parse(self, source_url: str, payload: Optional[str], timezone: str) -> Iterator[Event]:
+        url = source_url
+        self._failed_lookups.discard(url)
+        if payload is None:
+            # Every fetch strategy failed. Yield nothing so the event store
+            # keeps the last schedule that did come through (see
+            # EventStore.sync_team) instead of replacing it with a placeholder.
+            return
+
+        soup = BeautifulSoup(payload, "html.parser")
 
         table = soup.find("table")
         if not table:
-            return events
+            return
 
         rows = table.find_all("tr")
         tz = pytz.timezone(timezone)
@@ -249,8 +320,16 @@ class ErieMetroScraper(Scraper):
             start = None
             time_candidate = status_text if re.search(r"\d", status_text or "") else ""
 
+            if not time_candidate and game_url and self.subseasons is not None:
+                # FINAL rows hide the time; the subseason schedule lists it,
+                # one request for the whole league instead of one per game.
+                time_candidate = self.subseasons.start_time(game_url, url, self) or ""
+
             if not time_candidate and game_url:
                 start = self._fetch_game_start(game_url, timezone)
+                if start is None:
+                    # Parsed from the bare date below; worth retrying next run.
+                    self._failed_lookups.add(url)
 
             if not start:
                 dt_text = f"{date_text} {time_candidate}".strip()
@@ -307,59 +386,92 @@ class ErieMetroScraper(Scraper):
 
             end = guess_end(start)
             external_id = game_url or f"{url}#{tr.get('id', date_text)}"
-            events.append(
-                Event(
-                    summary=summary,
-                    start=start,
-                    end=end,
-                    timezone=timezone,
-                    location=location,
-                    description="\n".join(description_lines),
-                    source_url=game_url or url,
-                    external_id=external_id,
-                )
+            yield Event(
+                summary=summary,
+                start=start,
+                end=end,
+                timezone=timezone,
+                location=location,
+                description="\n".join(description_lines),
+                source_url=game_url or url,
+                external_id=external_id,
             )
 
-        return events
+    def _load_session_state(self) -> Optional[Path]:
+        path = self.session_state_path
+        if not path or not path.exists():
+            return None
+        age = datetime.now().timestamp() - path.stat().st_mtime
+        if age > SESSION_STATE_MAX_AGE.total_seconds():
+            self._discard_session_state()
+            return None
+        return path
+
+    def _discard_session_state(self) -> None:
+        if self.session_state_path:
+            self.session_state_path.unlink(missing_ok=True)
+
+    def _run_browser(self, url: str) -> str:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._scrape_with_browser(url))
+        # A loop is already running on this thread (e.g. the daemon's shared
+        # sync Playwright browser), so run ours on a thread of its own.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self._scrape_with_browser(url)).result()
 
     async def _scrape_with_browser(self, url: str) -> str:
-        """Scrape using browser automation"""
+        """Scrape using browser automation, reusing a saved session when one exists"""
+        state = self._load_session_state()
+        if state:
+            try:
+                return await self._browser_fetch(url, state)
+            except Exception as e:
+                # Cookies expired or the bot check no longer accepts them; drop
+                # the saved state and pay for a full warm-up instead.
+                print(f"Saved Erie Metro session rejected, starting a fresh one: {e}")
+                self._discard_session_state()
+        return await self._browser_fetch(url, None)
+
+    async def _browser_fetch(self, url: str, storage_state: Optional[Path]) -> str:
         playwright = await async_playwright().start()
         browser = None
         page = None
         
         try:
             # Launch browser with enhanced stealth settings for cloud environments
-            browser = await playwright.chromium.launch(
-                headless=True,
-                args=[
-                    '--no-sandbox',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--disable-web-security',
-                    '--disable-features=VizDisplayCompositor',
-                    '--disable-extensions',
-                    '--disable-plugins',
-                    '--disable-gpu',
-                    '--disable-software-rasterizer',
-                    '--disable-background-timer-throttling',
-                    '--disable-backgrounding-occluded-windows',
-                    '--disable-renderer-backgrounding',
-                    '--disable-field-trial-config',
-                    '--disable-ipc-flooding-protection',
-                    '--no-first-run',
-                    '--no-default-browser-check',
-                    '--disable-default-apps',
-                    '--disable-popup-blocking',
-                    '--disable-prompt-on-repost',
-                    '--disable-sync',
-                    '--disable-translate',
-                    '--hide-scrollbars',
-                    '--mute-audio',
-                    '--no-zygote',
-                    '--single-process',
-                ]
-            )
+            with span("browser launch", shared=False):
+                browser = await playwright.chromium.launch(
+                    headless=True,
+                    args=[
+                        '--no-sandbox',
+                        '--disable-blink-features=AutomationControlled',
+                        '--disable-dev-shm-usage',
+                        '--disable-web-security',
+                        '--disable-features=VizDisplayCompositor',
+                        '--disable-extensions',
+                        '--disable-plugins',
+                        '--disable-gpu',
+                        '--disable-software-rasterizer',
+                        '--disable-background-timer-throttling',
+                        '--disable-backgrounding-occluded-windows',
+                        '--disable-renderer-backgrounding',
+                        '--disable-field-trial-config',
+                        '--disable-ipc-flooding-protection',
+                        '--no-first-run',
+                        '--no-default-browser-check',
+                        '--disable-default-apps',
+                        '--disable-popup-blocking',
+                        '--disable-prompt-on-repost',
+                        '--disable-sync',
+                        '--disable-translate',
+                        '--hide-scrollbars',
+                        '--mute-audio',
+                        '--no-zygote',
+                        '--single-process',
+                    ]
+                )
             
             # Create context with realistic settings
             context = await browser.new_context(
@@ -367,6 +479,7 @@ class ErieMetroScraper(Scraper):
                 user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 locale='en-US',
                 timezone_id='America/New_York',
+                storage_state=str(storage_state) if storage_state else None,
             )
             
             page = await context.new_page()
@@ -423,25 +536,42 @@ class ErieMetroScraper(Scraper):
                 });
             """)
             
-            # First visit homepage to establish session
-            try:
-                await page.goto('https://www.eriemetrosports.com/', wait_until='domcontentloaded', timeout=10000)
-                await asyncio.sleep(random.uniform(1, 3))
-            except Exception:
-                pass  # Continue even if homepage fails
+            # First visit homepage to establish session (a saved session already has one)
+            if not storage_state:
+                try:
+                    with span("goto", url="https://www.eriemetrosports.com/"):
+                        await page.goto('https://www.eriemetrosports.com/', wait_until='domcontentloaded', timeout=10000)
+                    with span("wait"):
+                        await asyncio.sleep(random.uniform(1, 3))
+                except Exception:
+                    pass  # Continue even if homepage fails
             
             # Navigate to the target page
-            response = await page.goto(url, wait_until='domcontentloaded', timeout=15000)
+            with span("goto", url=url):
+                response = await page.goto(url, wait_until='domcontentloaded', timeout=15000)
             
             if response and response.status == 403:
                 raise Exception(f"403 Forbidden: {url}")
             
             # Wait a bit for content to load with random delay
-            await asyncio.sleep(random.uniform(2, 4))
+            with span("wait"):
+                if storage_state:
+                    await asyncio.sleep(random.uniform(0.5, 1))
+                else:
+                    await asyncio.sleep(random.uniform(2, 4))
             
             # Get page content
             content = await page.content()
             
+            if "<table" not in content:
+                # A challenge/interstitial page instead of the schedule; don't
+                # persist (or keep trusting) the session that produced it.
+                if storage_state:
+                    raise Exception(f"No schedule table in response: {url}")
+            elif self.session_state_path:
+                self.session_state_path.parent.mkdir(parents=True, exist_ok=True)
+                await context.storage_state(path=str(self.session_state_path))
+            
             # Clean up resources before returning
             await page.close()
             await browser.close()
@@ -466,3 +596,139 @@ class ErieMetroScraper(Scraper):
             except Exception:
                 pass
             raise Exception(f"Browser scraping failed: {e}")
+
+
+class AsyncErieMetroScraper(ErieMetroScraper, AsyncScraper):
+    """ErieMetroScraper for the asyncio runtime.
+
+    The requests calls run on the loop's executor threads and the browser
+    fallback is awaited on the loop directly instead of going through
+    asyncio.run. Parsing (which may fetch game pages) is left to the caller's
+    executor, like every AsyncScraper.
+    """
+
+    async def aiter_pages(self, url: str, timezone: str) -> AsyncIterator[RawPage]:
+        yield (url, await self._fetch_team_page_async(url))
+
+    async def _fetch_team_page_async(self, url: str) -> Optional[str]:
+        """_fetch_team_page's strategy chain without blocking the loop."""
+        try:
+            html = await asyncio.to_thread(self._get_text, url, MAC_HEADERS)
+            self._record_strategy("mac_ua")
+            return html
+        except Exception as e:
+            # ``e`` is unbound once its except block ends; keep it for the summary.
+            mac_error = e
+            print(f"Mac user agent failed, trying browser automation: {e}")
+
+        try:
+            html = await self._scrape_with_browser(url)
+            self._record_strategy("browser")
+            return html
+        except Exception as e2:
+            browser_error = e2
+            print(f"Browser automation failed, trying mobile user agent: {e2}")
+
+        try:
+            html = await asyncio.to_thread(self._get_text, url, MOBILE_HEADERS)
+            self._record_strategy("mobile_ua")
+            return html
+        except Exception as e3:
+            print(f"All scraping strategies failed for Erie Metro. Mac UA: {mac_error}, Browser: {browser_error}, Mobile UA: {e3}")
+            self._record_strategy("failed")
+            return None
+
+    def _get_text(self, url: str, headers: Dict[str, str]) -> str:
+        resp = self._get(url, timeout=30, headers=headers)
+        resp.raise_for_status()
+        return resp.text
+
+
+class SubseasonSchedule:
+    """Start times for every game in a subseason, fetched once per run.
+
+    Team pages show "FINAL" instead of a time once a game is played. The
+    ``subseason=`` id in our URLs also names the league-wide schedule, which
+    still lists each game's time, so a single fetch per subseason answers
+    every team page; only ids it doesn't list fall back to the game's own
+    page. A subseason whose schedule can't be fetched is remembered as empty
+    for the rest of the run.
+
+    Pages parsed on the process pool see a pickled copy of the index, so the
+    scraper primes it in this process first (``prepare_parse``); game-page
+    fallbacks made inside a worker are not shared back.
+    """
+
+    def __init__(self) -> None:
+        self.fetches = 0
+        self._times: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def start_time(self, game_url: str, page_url: str, scraper: ErieMetroScraper) -> Optional[str]:
+        game = GAME_ID_RE.search(game_url)
+        subseason = _subseason_of(game_url) or _subseason_of(page_url)
+        if not game or not subseason:
+            return None
+        return self._schedule(subseason, page_url, scraper).get(game.group(1))
+
+    def prime(self, page_url: str, scraper: ErieMetroScraper) -> None:
+        subseason = _subseason_of(page_url)
+        if subseason:
+            self._schedule(subseason, page_url, scraper)
+
+    def _schedule(self, subseason: str, page_url: str, scraper: ErieMetroScraper) -> Dict[str, str]:
+        with self._lock:
+            if subseason not in self._times:
+                self._times[subseason] = self._fetch(subseason_schedule_url(page_url, subseason), scraper)
+            return self._times[subseason]
+
+    def _fetch(self, url: str, scraper: ErieMetroScraper) -> Dict[str, str]:
+        self.fetches += 1
+        try:
+            resp = scraper._get(url, timeout=30, headers=MAC_HEADERS)
+            resp.raise_for_status()
+        except Exception as exc:
+            print(f"Subseason schedule unavailable, using game pages instead: {url}: {exc}")
+            return {}
+        return subseason_start_times(resp.text)
+
+
+def _subseason_of(url: str) -> Optional[str]:
+    values = parse_qs(urlsplit(url).query).get("subseason")
+    return values[0] if values else None
+
+
+def subseason_schedule_url(page_url: str, subseason: str) -> str:
+    # Keep whatever sits in front of /schedule/ (origin, or a proxy prefix).
+    prefix = page_url.split("/schedule/", 1)[0] if "/schedule/" in page_url else page_url.split("?", 1)[0].rstrip("/")
+    return f"{prefix}/schedule/subseason/{subseason}"
+
+
+def subseason_start_times(html: str) -> Dict[str, str]:
+    """{game id: start time text} from a subseason schedule page."""
+    times: Dict[str, str] = {}
+    soup = BeautifulSoup(html, "html.parser")
+    for tr in soup.find_all("tr"):
+        match = ROW_GAME_ID_RE.search(tr.get("id") or "")
+        game_ids = {match.group(1)} if match else set()
+        for link in tr.find_all("a", href=True):
+            game = GAME_ID_RE.search(link["href"])
+            if game:
+                game_ids.add(game.group(1))
+        if not game_ids:
+            continue
+        start = START_TIME_RE.search(tr.get_text(" ", strip=True))
+        if not start:
+            continue
+        for game_id in game_ids:
+            times[game_id] = start.group(0)
+    return times
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from hashlib import sha256
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+import asyncio
+import json
 import re
+import threading
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup, Tag
-from playwright.sync_api import Page, sync_playwright
+from loguru import logger
+from playwright.async_api import Browser as AsyncBrowser
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Browser, Page
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
-from src.scrapers.base import Scraper
+from src.scrapers.base import AsyncScraper, RawPage, Scraper
+from src.utils.browser import AsyncBrowserProvider, BrowserProvider, async_open_browser, open_browser
 from src.utils.events import Event, guess_end, localize
+from src.utils.metrics import METRICS
+from src.utils.tracing import span
 
 
 GAME_LABEL_RE = re.compile(
@@ -18,42 +30,117 @@ GAME_LABEL_RE = re.compile(
     re.IGNORECASE,
 )
 SCORE_RE = re.compile(r"\b(\d+)\s*-\s*(\d+)\b")
+TEAM_URL_RE = re.compile(r"^(.*?#/(\d+))/team/(\d+)/(schedule|scores)")
+TEAM_LINK_RE = re.compile(r"/team/(\d+)\b")
+ROW_HTML_RE = re.compile(r"<tr\b[^>]*\brole=[\"']article[\"'][^>]*>.*?</tr>", re.IGNORECASE | re.DOTALL)
+# Runs inside the rendered SPA and returns one compact record per game row with
+# only the fields _event_from_record reads. Text is joined the way
+# BeautifulSoup's get_text(" ", strip=True) does it, so the in-page path and
+# the HTML path (_row_record) produce identical records.
+ROW_EXTRACT_SCRIPT = """
+() => {
+  const text = (el) => {
+    if (!el) return null;
+    const parts = [];
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+      const t = walker.currentNode.nodeValue.trim();
+      if (t) parts.push(t);
+    }
+    return parts.join(" ");
+  };
+  return Array.from(document.querySelectorAll("tr[role='article']")).map((row) => ({
+    label: text(row.querySelector("div.sr-only")),
+    cells: Array.from(row.querySelectorAll("td")).map(text),
+    status: text(row.querySelector("td.actions")) || "",
+    links: Array.from(row.querySelectorAll("a[href]")).map((a) => a.getAttribute("href")),
+  }));
+}
+"""
 
 
 class HarborcenterScraper(Scraper):
-    def __init__(self, team_name: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        team_name: Optional[str] = None,
+        extract_in_browser: bool = True,
+        browser_provider: Optional[BrowserProvider] = None,
+        league: Optional["HarborcenterLeague"] = None,
+    ) -> None:
         self.team_name = team_name
+        self.extract_in_browser = extract_in_browser
+        self.browser_provider = browser_provider
+        self.league = league
+
+    def __getstate__(self) -> dict:
+        # Parse workers never fetch, so the league index (every team's rows)
+        # isn't shipped to them with each payload.
+        return {**self.__dict__, "league": None}
 
     def can_handle(self, url: str) -> bool:
         return "rinksatharborcenter.com" in url
 
-    def scrape(self, url: str, timezone: str) -> List[Event]:
-        pages: List[tuple[str, str]] = []
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-
-            for page_url in self._target_urls(url):
-                # Render each tab in a fresh page. The schedule/scores URLs
-                # differ only by the hash fragment, so reusing one page turns
-                # the second navigation into a same-document (hash-only) change:
-                # it doesn't reload, networkidle returns immediately, and the
-                # SPA intermittently failed to re-render the new tab in time,
-                # dropping every row. A fresh page forces a full load that boots
-                # the SPA against the correct hash every time.
-                page = browser.new_page()
-                try:
-                    html = self._render_page(page, page_url)
-                    pages.append((page_url, html))
-                finally:
-                    page.close()
+    def iter_pages(self, url: str, timezone: str) -> Iterator[RawPage]:
+        if self.league is not None:
+            pages = self.league.team_pages(url, self._target_urls(url), self.team_name)
+            if pages is not None:
+                self._record_strategy("league_index")
+                yield from pages
+                return
+
+        with open_browser(self.browser_provider) as browser:
+            yield from self._render_tabs(browser, self._target_urls(url))
+
+    def _render_tabs(self, browser: Browser, page_urls: List[str]) -> Iterator[RawPage]:
+        """Render the tabs side by side and yield each one, in order, once extracted.
 
-            browser.close()
+        Every tab still gets a fresh page. The schedule/scores URLs differ
+        only by the hash fragment, so reusing one page turns the second
+        navigation into a same-document (hash-only) change: it doesn't
+        reload, networkidle returns immediately, and the SPA intermittently
+        failed to re-render the new tab in time, dropping every row. A fresh
+        page forces a full load that boots the SPA against the correct hash
+        every time.
 
-        events: List[Event] = []
-        for source_url, html in pages:
-            events.extend(self._parse_page(source_url, html, timezone))
-        return events
+        The pages share one context and all navigations start before any
+        wait, so Chromium loads the tabs concurrently. Tabs are then finished
+        in ``page_urls`` order and each is yielded as soon as its own rows are
+        extracted, so the first tab is parsed while the rest are still
+        loading; the fixed settle delay is paid once per team rather than
+        once per tab.
+        """
+        context = browser.new_context()
+        try:
+            pages = [context.new_page() for _ in page_urls]
+            for page, page_url in zip(pages, page_urls):
+                with span("goto", url=page_url):
+                    page.goto(page_url, wait_until="commit", timeout=60000)
+            for number, (page, page_url) in enumerate(zip(pages, page_urls)):
+                with span("wait rows", url=page_url):
+                    self._wait_for_rows(page)
+                    if number == 0:
+                        page.wait_for_timeout(1000)
+                self._load_all_rows(page)
+                payload = self._extract_payload(page)
+                page.close()
+                yield (page_url, payload)
+        finally:
+            context.close()
+
+    def iter_parse(self, source_url: str, payload: Union[str, List[dict]], timezone: str) -> Iterator[Event]:
+        records = self._iter_row_records(payload) if isinstance(payload, str) else payload
+        for record in records:
+            event = self._event_from_record(record, source_url, timezone)
+            if event:
+                yield event
+
+    def content_fingerprint(self, payload: Union[str, List[dict]]) -> str:
+        # Only the game rows are read, whichever form the tab arrived in.
+        if isinstance(payload, str):
+            region = "".join(ROW_HTML_RE.findall(payload))
+        else:
+            region = json.dumps(payload, sort_keys=True, default=str)
+        return sha256(region.encode("utf-8")).hexdigest()
 
     def _target_urls(self, url: str) -> List[str]:
         companion = self._companion_url(url)
@@ -73,8 +160,25 @@ class HarborcenterScraper(Scraper):
             return url.replace("/scores", "/schedule")
         return None
 
-    def _render_page(self, page: Page, url: str) -> str:
-        page.goto(url, wait_until="networkidle", timeout=60000)
+    def _extract_payload(self, page: Page) -> Union[str, List[dict]]:
+        if not self.extract_in_browser:
+            self._record_strategy("html")
+            return page.content()
+
+        try:
+            records = page.evaluate(ROW_EXTRACT_SCRIPT)
+        except PlaywrightError:
+            # The page is already loaded; fall back to a full DOM dump.
+            self._record_strategy("html")
+            return page.content()
+        self._record_strategy("dom_extract")
+        return records
+
+    def _record_strategy(self, strategy: str) -> None:
+        METRICS.inc("hockey_fetch_strategy_total", {"scraper": self.__class__.__name__, "strategy": strategy})
+
+    def _wait_for_rows(self, page: Page) -> None:
+        page.wait_for_load_state("networkidle", timeout=60000)
         # Wait for an actual game row (with its screen-reader label) to render
         # instead of sleeping a fixed interval. A page that genuinely has no
         # games will time out here and fall through with zero rows, which is
@@ -83,9 +187,6 @@ class HarborcenterScraper(Scraper):
             page.wait_for_selector("tr[role='article'] div.sr-only", timeout=20000)
         except PlaywrightTimeoutError:
             pass
-        page.wait_for_timeout(1000)
-        self._load_all_rows(page)
-        return page.content()
 
     def _load_all_rows(self, page: Page) -> None:
         while True:
@@ -98,29 +199,40 @@ class HarborcenterScraper(Scraper):
                 return
 
             before = page.locator("tr[role='article']").count()
-            button.click()
-            page.wait_for_timeout(1500)
+            with span("load more", rows=before):
+                button.click()
+                page.wait_for_timeout(1500)
             after = page.locator("tr[role='article']").count()
             if after <= before:
                 return
 
     def _parse_page(self, source_url: str, html: str, timezone: str) -> List[Event]:
-        soup = BeautifulSoup(html, "html.parser")
-        events: List[Event] = []
+        return self.parse(source_url, html, timezone)
 
-        for row in soup.select("tr[role='article']"):
-            event = self._parse_row(row, source_url, timezone)
-            if event:
-                events.append(event)
+    def _parse_records(self, source_url: str, records: List[dict], timezone: str) -> List[Event]:
+        return self.parse(source_url, records, timezone)
 
-        return events
+    def _iter_row_records(self, html: str) -> Iterator[dict]:
+        soup = BeautifulSoup(html, "html.parser")
+        for row in soup.select("tr[role='article']"):
+            yield self._row_record(row)
 
-    def _parse_row(self, row: Tag, source_url: str, timezone: str) -> Optional[Event]:
+    def _row_record(self, row: Tag) -> dict:
         label = row.find("div", class_="sr-only")
+        actions_cell = row.find("td", class_=lambda cls: cls and "actions" in cls.split())
+        return {
+            "label": label.get_text(" ", strip=True) if label else None,
+            "cells": [cell.get_text(" ", strip=True) for cell in row.find_all("td")],
+            "status": actions_cell.get_text(" ", strip=True) if actions_cell else "",
+            "links": [link["href"] for link in row.find_all("a", href=True)],
+        }
+
+    def _event_from_record(self, record: dict, source_url: str, timezone: str) -> Optional[Event]:
+        label = record.get("label")
         if not label:
             return None
 
-        label_text = " ".join(label.get_text(" ", strip=True).split())
+        label_text = " ".join(label.split())
         label_match = GAME_LABEL_RE.search(label_text)
         if not label_match:
             return None
@@ -133,14 +245,11 @@ class HarborcenterScraper(Scraper):
         )
         start = localize(dt_naive, timezone)
 
-        cells = row.find_all("td")
-        location = cells[-1].get_text(" ", strip=True) if cells else None
-        status_text = ""
-        actions_cell = row.find("td", class_=lambda cls: cls and "actions" in cls.split())
-        if actions_cell:
-            status_text = " ".join(actions_cell.get_text(" ", strip=True).split())
+        cells = record.get("cells") or []
+        location = cells[-1] if cells else None
+        status_text = " ".join((record.get("status") or "").split())
 
-        score_text = self._extract_score_text(row)
+        score_text = self._extract_score_text(cells)
         summary = f"{away_team} vs. {home_team}"
         if score_text:
             summary = f"{summary} ({score_text})"
@@ -151,7 +260,7 @@ class HarborcenterScraper(Scraper):
         if score_text:
             description_lines.append(f"Score: {score_text}")
 
-        game_url = self._extract_game_url(row, source_url)
+        game_url = self._extract_game_url(record.get("links") or [], source_url)
         return Event(
             summary=summary,
             start=start,
@@ -163,19 +272,281 @@ class HarborcenterScraper(Scraper):
             external_id=game_url,
         )
 
-    def _extract_game_url(self, row: Tag, source_url: str) -> Optional[str]:
-        for link in row.find_all("a", href=True):
-            href = link["href"]
+    def _extract_game_url(self, links: List[str], source_url: str) -> Optional[str]:
+        for href in links:
             if "/game/" in href:
                 return urljoin(source_url.split("#", 1)[0], href)
         return None
 
-    def _extract_score_text(self, row: Tag) -> Optional[str]:
-        for cell in row.find_all("td"):
-            text = " ".join(cell.get_text(" ", strip=True).split())
+    def _extract_score_text(self, cells: List[str]) -> Optional[str]:
+        for cell in cells:
+            text = " ".join((cell or "").split())
             if not text or re.search(r"[A-Za-z]", text):
                 continue
             match = SCORE_RE.search(text)
             if match:
                 return f"{match.group(1)}-{match.group(2)}"
         return None
+
+
+class AsyncHarborcenterScraper(HarborcenterScraper, AsyncScraper):
+    """HarborcenterScraper for the asyncio runtime.
+
+    Each tab renders in its own task (and fresh page, see _render_tabs), so
+    the waits overlap for real; tabs are still yielded in _target_urls order.
+    """
+
+    def __init__(
+        self,
+        team_name: Optional[str] = None,
+        extract_in_browser: bool = True,
+        browser_provider: Optional[AsyncBrowserProvider] = None,
+        league: Optional["HarborcenterLeague"] = None,
+    ) -> None:
+        super().__init__(team_name=team_name, extract_in_browser=extract_in_browser, league=league)
+        self.browser_provider = browser_provider
+
+    async def aiter_pages(self, url: str, timezone: str) -> AsyncIterator[RawPage]:
+        if self.league is not None:
+            pages = await self.league.team_pages_async(url, self._target_urls(url), self.team_name, self)
+            if pages is not None:
+                self._record_strategy("league_index")
+                for page in pages:
+                    yield page
+                return
+
+        async with async_open_browser(self.browser_provider) as browser:
+            async for page in self._render_tabs_async(browser, self._target_urls(url)):
+                yield page
+
+    async def _render_tabs_async(self, browser: AsyncBrowser, page_urls: List[str]) -> AsyncIterator[RawPage]:
+        context = await browser.new_context()
+        tasks = [asyncio.create_task(self._render_tab_async(context, page_url)) for page_url in page_urls]
+        try:
+            for page_url, task in zip(page_urls, tasks):
+                yield (page_url, await task)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await context.close()
+
+    async def _render_tab_async(self, context: AsyncBrowserContext, page_url: str) -> Union[str, List[dict]]:
+        # Same navigation and waits as _render_tabs; each tab is its own task,
+        # so the settle delays overlap.
+        page = await context.new_page()
+        try:
+            with span("goto", url=page_url):
+                await page.goto(page_url, wait_until="commit", timeout=60000)
+            with span("wait rows", url=page_url):
+                await page.wait_for_load_state("networkidle", timeout=60000)
+                try:
+                    await page.wait_for_selector("tr[role='article'] div.sr-only", timeout=20000)
+                except PlaywrightTimeoutError:
+                    pass
+                await page.wait_for_timeout(1000)
+            await self._load_all_rows_async(page)
+            return await self._extract_payload_async(page)
+        finally:
+            await page.close()
+
+    async def _load_all_rows_async(self, page: AsyncPage) -> None:
+        while True:
+            load_more = page.locator("text=LOAD MORE")
+            if await load_more.count() == 0:
+                return
+
+            button = load_more.first
+            if not await button.is_visible():
+                return
+
+            before = await page.locator("tr[role='article']").count()
+            with span("load more", rows=before):
+                await button.click()
+                await page.wait_for_timeout(1500)
+            after = await page.locator("tr[role='article']").count()
+            if after <= before:
+                return
+
+    async def _extract_payload_async(self, page: AsyncPage) -> Union[str, List[dict]]:
+        if not self.extract_in_browser:
+            self._record_strategy("html")
+            return await page.content()
+
+        try:
+            records = await page.evaluate(ROW_EXTRACT_SCRIPT)
+        except PlaywrightError:
+            self._record_strategy("html")
+            return await page.content()
+        self._record_strategy("dom_extract")
+        return records
+
+
+def _team_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+class HarborcenterLeague:
+    """League-wide schedule and scores, rendered once and shared by every team.
+
+    All our Harborcenter teams sit under one league id, so instead of two SPA
+    renders per team (schedule and scores) the league's own schedule and
+    scores tabs (``stats#/<league>/schedule``) are rendered once per run and
+    their rows indexed by team. A team is matched by the team id in a row's
+    links when the site provides one, otherwise by its name in the row label.
+    A team with no rows in the index, a name that may belong to more than one
+    team (see _LeagueIndex.records), or a league that failed to render gets
+    ``None`` and falls back to rendering its own pages.
+    """
+
+    def __init__(
+        self,
+        extract_in_browser: bool = True,
+        browser_provider: Optional[BrowserProvider] = None,
+    ) -> None:
+        self.renderer = HarborcenterScraper(extract_in_browser=extract_in_browser, browser_provider=browser_provider)
+        self.renders = 0
+        self._indexes: Dict[str, Optional["_LeagueIndex"]] = {}
+        self._lock = threading.Lock()
+        self._async_lock: Optional[asyncio.Lock] = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"], state["_async_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._async_lock = None
+
+    def team_pages(self, url: str, target_urls: List[str], team_name: Optional[str]) -> Optional[List[RawPage]]:
+        match = TEAM_URL_RE.match(url)
+        if not match:
+            return None
+        league_url, team_id = match.group(1), match.group(3)
+        return self._team_pages(self._index(league_url), team_id, target_urls, team_name)
+
+    async def team_pages_async(
+        self,
+        url: str,
+        target_urls: List[str],
+        team_name: Optional[str],
+        renderer: "AsyncHarborcenterScraper",
+    ) -> Optional[List[RawPage]]:
+        """team_pages() for the asyncio runtime, rendering with ``renderer``."""
+        match = TEAM_URL_RE.match(url)
+        if not match:
+            return None
+        league_url, team_id = match.group(1), match.group(3)
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        # Teams scraped concurrently wait on the one render of their league.
+        async with self._async_lock:
+            if league_url not in self._indexes:
+                self._indexes[league_url] = await self._build_index_async(league_url, renderer)
+            index = self._indexes[league_url]
+        return self._team_pages(index, team_id, target_urls, team_name)
+
+    def _team_pages(
+        self,
+        index: Optional["_LeagueIndex"],
+        team_id: str,
+        target_urls: List[str],
+        team_name: Optional[str],
+    ) -> Optional[List[RawPage]]:
+        if index is None:
+            return None
+        pages: List[RawPage] = []
+        for page_url in target_urls:
+            tab = "scores" if "/scores" in page_url else "schedule"
+            records = index.records(tab, team_id, team_name)
+            if records is None:
+                logger.warning(
+                    f"League rows for {team_name!r} may belong to more than one team; rendering its own pages"
+                )
+                return None
+            pages.append((page_url, records))
+        if not any(records for _, records in pages):
+            return None
+        return pages
+
+    def _index(self, league_url: str) -> Optional["_LeagueIndex"]:
+        # Teams refresh one after another, but the daemon and future
+        # concurrent runs may ask at once; render each league only once.
+        with self._lock:
+            if league_url not in self._indexes:
+                self._indexes[league_url] = self._build_index(league_url)
+            return self._indexes[league_url]
+
+    def _build_index(self, league_url: str) -> Optional["_LeagueIndex"]:
+        index = _LeagueIndex()
+        try:
+            with span("league render", url=league_url), open_browser(self.renderer.browser_provider) as browser:
+                tabs = {f"{league_url}/{tab}": tab for tab in ("scores", "schedule")}
+                for page_url, payload in self.renderer._render_tabs(browser, list(tabs)):
+                    self._add_tab(index, tabs[page_url], payload)
+        except Exception as exc:
+            logger.warning(f"League render failed for {league_url}, falling back to team pages: {exc}")
+            return None
+        logger.info(f"Indexed {index.rows} league rows from {league_url}")
+        return index
+
+    async def _build_index_async(self, league_url: str, renderer: "AsyncHarborcenterScraper") -> Optional["_LeagueIndex"]:
+        index = _LeagueIndex()
+        try:
+            with span("league render", url=league_url):
+                async with async_open_browser(renderer.browser_provider) as browser:
+                    tabs = {f"{league_url}/{tab}": tab for tab in ("scores", "schedule")}
+                    async for page_url, payload in renderer._render_tabs_async(browser, list(tabs)):
+                        self._add_tab(index, tabs[page_url], payload)
+        except Exception as exc:
+            logger.warning(f"League render failed for {league_url}, falling back to team pages: {exc}")
+            return None
+        logger.info(f"Indexed {index.rows} league rows from {league_url}")
+        return index
+
+    def _add_tab(self, index: "_LeagueIndex", tab: str, payload: Union[str, List[dict]]) -> None:
+        self.renders += 1
+        records = self.renderer._iter_row_records(payload) if isinstance(payload, str) else payload
+        for record in records:
+            index.add(tab, record)
+
+
+class _LeagueIndex:
+    def __init__(self) -> None:
+        self.by_team_id: Dict[Tuple[str, str], List[dict]] = {}
+        self.by_name: Dict[Tuple[str, str], List[dict]] = {}
+        self.rows = 0
+
+    def add(self, tab: str, record: dict) -> None:
+        self.rows += 1
+        team_ids = {m.group(1) for href in record.get("links") or [] for m in TEAM_LINK_RE.finditer(href)}
+        for team_id in team_ids:
+            self.by_team_id.setdefault((tab, team_id), []).append(record)
+        label_match = GAME_LABEL_RE.search(" ".join((record.get("label") or "").split()))
+        if label_match:
+            for name in {_team_key(label_match.group(1)), _team_key(label_match.group(2))}:
+                self.by_name.setdefault((tab, name), []).append(record)
+
+    def records(self, tab: str, team_id: str, team_name: Optional[str]) -> Optional[List[dict]]:
+        """The team's rows on one tab, or None if its name alone can't tell it apart.
+
+        Divisions can reuse a team name, and a name match sees all of them.
+        Matches are only trusted if no row links a (necessarily other) team
+        id and no two games fall on the same day; otherwise the caller
+        renders the team's own pages, which costs time but never mixes rows.
+        """
+        records = self.by_team_id.get((tab, team_id))
+        if records is None and team_name:
+            records = self.by_name.get((tab, _team_key(team_name)))
+            if records and _shared_name(records):
+                return None
+        return list(records or [])
+
+
+def _shared_name(records: List[dict]) -> bool:
+    if any(TEAM_LINK_RE.search(href) for record in records for href in record.get("links") or []):
+        return True
+    days = [GAME_LABEL_RE.search(" ".join(record["label"].split())).group(3) for record in records]
+    return len(set(days)) < len(days)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import argparse
+import threading
+import time
+from urllib.parse import unquote
+
+from loguru import logger
+
+from src.config import load_config
+from src.utils.feeds import gzip_bytes
+
+
+CONTENT_TYPES = {
+    ".ics": "text/calendar; charset=utf-8",
+    ".html": "text/html; charset=utf-8",
+    ".json": "application/json",
+    ".gz": "application/gzip",
+}
+# Never tell clients to wait less than this before revalidating.
+MIN_MAX_AGE = 60
+
+
+@dataclass
+class CachedFile:
+    mtime_ns: int
+    size: int
+    body: bytes
+    etag: str
+    gzip_etag: str
+    content_type: str
+    # Compressed on first gzip request, and only when no fresh .gz copy exists.
+    gzip_body: Optional[bytes] = None
+
+
+class FeedCache:
+    """In-memory copies of the files under docs/, reloaded when they change.
+
+    Each lookup is a single stat(); the file is only re-read (and re-hashed)
+    when its mtime or size differs from the cached copy. Gzip clients get the
+    precompressed <feed>.ics.gz written by the build when it is at least as
+    new as the feed, so the server only compresses files that lack one.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root.resolve()
+        self._files: Dict[Path, CachedFile] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, url_path: str) -> Optional[Path]:
+        rel = unquote(url_path.split("?", 1)[0]).lstrip("/") or "index.html"
+        path = (self.root / rel).resolve()
+        if self.root not in path.parents or not path.is_file():
+            return None
+        return path
+
+    def get(self, path: Path) -> Optional[CachedFile]:
+        try:
+            stat = path.stat()
+        except OSError:
+            with self._lock:
+                self._files.pop(path, None)
+            return None
+
+        cached = self._files.get(path)
+        if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            return cached
+
+        body = path.read_bytes()
+        digest = sha256(body).hexdigest()[:32]
+        cached = CachedFile(
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            body=body,
+            etag=f'"{digest}"',
+            # A different representation needs its own strong validator.
+            gzip_etag=f'"{digest}-gz"',
+            content_type=CONTENT_TYPES.get(path.suffix, "application/octet-stream"),
+        )
+        with self._lock:
+            self._files[path] = cached
+        return cached
+
+    def get_gzip(self, path: Path, cached: CachedFile) -> Tuple[bytes, str]:
+        """(gzip body, ETag) for a cached file, preferring its .gz sibling."""
+        gz_path = path.with_name(f"{path.name}.gz")
+        gz = self.get(gz_path) if gz_path.is_file() else None
+        if gz is not None and gz.mtime_ns >= cached.mtime_ns:
+            return gz.body, gz.etag
+        if cached.gzip_body is None:
+            cached.gzip_body = gzip_bytes(cached.body)
+        return cached.gzip_body, cached.gzip_etag
+
+
+def accepts_gzip(header: Optional[str]) -> bool:
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def max_age_for(cached: CachedFile, refresh_seconds: int, now: Optional[float] = None) -> int:
+    # Feeds only change when the scheduled build runs, so a client can keep
+    # its copy until the next build is due; after that it revalidates.
+    now = time.time() if now is None else now
+    next_refresh = cached.mtime_ns / 1e9 + refresh_seconds
+    return max(MIN_MAX_AGE, int(next_refresh - now))
+
+
+class FeedRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; with Nagle on, keep-alive
+    # clients stall ~40 ms on delayed ACKs between them.
+    disable_nagle_algorithm = True
+    server: "FeedServer"
+
+    def do_HEAD(self) -> None:
+        self._serve(send_body=False)
+
+    def do_GET(self) -> None:
+        self._serve(send_body=True)
+
+    def _serve(self, send_body: bool) -> None:
+        path = self.server.cache.resolve(self.path)
+        cached = self.server.cache.get(path) if path else None
+        if cached is None:
+            self._send(404, {"Content-Type": "text/plain; charset=utf-8"}, b"Not Found", send_body)
+            return
+
+        use_gzip = path.suffix != ".gz" and accepts_gzip(self.headers.get("Accept-Encoding"))
+        body, etag = self.server.cache.get_gzip(path, cached) if use_gzip else (cached.body, cached.etag)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={max_age_for(cached, self.server.refresh_seconds)}",
+            "Vary": "Accept-Encoding",
+        }
+
+        if etag_matches(self.headers.get("If-None-Match"), etag):
+            self._send(304, headers, b"", send_body=False)
+            return
+
+        headers["Content-Type"] = cached.content_type
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+        self._send(200, headers, body, send_body)
+
+    def _send(self, status: int, headers: Dict[str, str], body: bytes, send_body: bool) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class FeedServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], root: Path, refresh_seconds: int) -> None:
+        super().__init__(address, FeedRequestHandler)
+        self.cache = FeedCache(root)
+        self.refresh_seconds = refresh_seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve docs/ (index.html and ics feeds) with caching headers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--docs", type=Path, default=Path("docs"))
+    args = parser.parse_args()
+
+    config = load_config()
+    server = FeedServer((args.host, args.port), args.docs, refresh_seconds=config.refresh_interval_minutes * 60)
+    logger.info(f"Serving {args.docs} on http://{args.host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
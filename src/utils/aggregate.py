@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import heapq
+from typing import Iterable, Iterator, Optional
+
+from src.utils.events import Event
+
+
+def merge_sorted_events(streams: Iterable[Iterable[Event]], location: Optional[str] = None) -> Iterator[Event]:
+    """K-way merge of per-team event streams that are each sorted by start.
+
+    Streams are consumed lazily (heapq.merge holds one event per stream), a
+    game shared by two teams is emitted once (first stream wins, by UID), and
+    `location` optionally keeps only events whose location contains it.
+    """
+    needle = location.lower() if location else None
+    seen = set()
+    for ev in heapq.merge(*streams, key=lambda e: e.start):
+        if needle and needle not in (ev.location or "").lower():
+            continue
+        uid = ev.google_event_id()
+        if uid in seen:
+            continue
+        seen.add(uid)
+        yield ev
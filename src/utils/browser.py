@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Optional
+import asyncio
+
+from loguru import logger
+from playwright.async_api import Browser as AsyncBrowser
+from playwright.async_api import Playwright as AsyncPlaywright
+from playwright.async_api import async_playwright
+from playwright.sync_api import Browser, Playwright, sync_playwright
+
+from src.utils.tracing import span
+
+
+class BrowserProvider:
+    """A headless Chromium kept open across scrapes (daemon mode).
+
+    Launching Chromium costs more than rendering most schedule pages, so a
+    long-running process holds one browser and hands it to every scraper.
+    Scrapers open a fresh context per team (``new_page()`` or
+    ``new_context()``), so cookies and storage still don't leak between
+    teams. The browser is
+    relaunched if it has crashed or disconnected.
+    """
+
+    def __init__(self) -> None:
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self.launches = 0
+
+    def browser(self) -> Browser:
+        if self._browser is None or not self._browser.is_connected():
+            with span("browser launch", shared=True):
+                if self._playwright is None:
+                    self._playwright = sync_playwright().start()
+                self._browser = self._playwright.chromium.launch(headless=True)
+            self.launches += 1
+            logger.info("Launched shared Chromium")
+        return self._browser
+
+    def __getstate__(self) -> dict:
+        # Scrapers holding the provider are pickled to parse workers, which
+        # never render; they get an unlaunched copy.
+        return {**self.__dict__, "_playwright": None, "_browser": None}
+
+    def recycle(self) -> None:
+        """Close the browser to hand its memory back; the next browser() relaunches."""
+        if self._browser is not None:
+            logger.info("Recycling shared Chromium")
+        self.close()
+
+    def close(self) -> None:
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception as exc:
+                logger.warning(f"Closing shared Chromium failed: {exc}")
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+
+@contextmanager
+def open_browser(provider: Optional[BrowserProvider] = None) -> Iterator[Browser]:
+    """Yield the provider's warm browser, or launch one for this block only."""
+    if provider is not None:
+        yield provider.browser()
+        return
+    with sync_playwright() as p:
+        with span("browser launch", shared=False):
+            browser = p.chromium.launch(headless=True)
+        try:
+            yield browser
+        finally:
+            browser.close()
+
+
+class AsyncBrowserProvider:
+    """BrowserProvider for the asyncio runtime: one Chromium shared by every
+    scrape on the runtime's loop, launched on first use.
+
+    Concurrent scrapes wait on one launch instead of racing to start several.
+    Async Playwright objects belong to the loop that created them, so this
+    provider must only be used from that loop.
+    """
+
+    def __init__(self) -> None:
+        self._playwright: Optional[AsyncPlaywright] = None
+        self._browser: Optional[AsyncBrowser] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.launches = 0
+
+    async def browser(self) -> AsyncBrowser:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                with span("browser launch", shared=True):
+                    if self._playwright is None:
+                        self._playwright = await async_playwright().start()
+                    self._browser = await self._playwright.chromium.launch(headless=True)
+                self.launches += 1
+                logger.info("Launched shared Chromium (asyncio)")
+        return self._browser
+
+    async def close(self) -> None:
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception as exc:
+                logger.warning(f"Closing shared Chromium failed: {exc}")
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+@asynccontextmanager
+async def async_open_browser(provider: Optional[AsyncBrowserProvider] = None) -> AsyncIterator[AsyncBrowser]:
+    """open_browser() for async scrapers."""
+    if provider is not None:
+        yield await provider.browser()
+        return
+    async with async_playwright() as p:
+        with span("browser launch", shared=False):
+            browser = await p.chromium.launch(headless=True)
+        try:
+            yield browser
+        finally:
+            await browser.close()
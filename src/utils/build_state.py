@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from hashlib import sha256
+from pathlib import Path
+from typing import Iterable, Optional
+import json
+
+from dateutil import parser as dateparser
+
+from src.config import AppConfig, Season, Team
+from src.utils.state import load_json, state_path, write_json
+
+
+BUILD_STATE_PATH = state_path("build-state.json")
+# A team counts as due slightly early, so a cron run that fires a few minutes
+# before the previous one's interval is up doesn't skip it for a whole cycle.
+DUE_GRACE = 0.05
+
+
+def team_fingerprint(config: AppConfig, season: Season, team: Team) -> str:
+    """Hash of everything in config.yaml that changes what a team's feeds contain."""
+    fields = {
+        "team": team.id,
+        "name": team.name,
+        "urls": team.urls,
+        "season": season.id,
+        "season_name": season.name,
+        "timezone": config.timezone,
+        "upcoming": config.upcoming.model_dump() if config.upcoming else None,
+        "google_calendar_id": team.google_calendar_id,
+    }
+    return sha256(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def output_fingerprint(paths: Iterable[Path]) -> str:
+    digest = sha256()
+    for path in paths:
+        digest.update(path.name.encode("utf-8"))
+        digest.update(sha256(path.read_bytes()).digest() if path.exists() else b"missing")
+    return digest.hexdigest()
+
+
+class BuildState:
+    """Per-team fingerprints from the last build, for --changed-only runs.
+
+    A team is rebuilt when it is new, its config fingerprint changed, its
+    published feeds no longer match what the last build wrote, or its
+    refresh interval has elapsed; everything else keeps its stored events
+    and feeds untouched.
+    """
+
+    def __init__(self, path: Path = BUILD_STATE_PATH) -> None:
+        self.path = path
+        self.teams: dict = (load_json(path, default={}) or {}).get("teams", {})
+
+    def rebuild_reason(
+        self,
+        team_id: str,
+        config_fp: str,
+        output_fp: str,
+        now: datetime,
+        interval: timedelta,
+    ) -> Optional[str]:
+        entry = self.teams.get(team_id)
+        if entry is None:
+            return "new"
+        if entry.get("config") != config_fp:
+            return "config changed"
+        if entry.get("output") != output_fp:
+            return "output changed"
+        built_at = dateparser.isoparse(entry["built_at"])
+        if now - built_at >= interval * (1 - DUE_GRACE):
+            return "due"
+        return None
+
+    def built_at(self, team_id: str) -> Optional[str]:
+        entry = self.teams.get(team_id)
+        return entry["built_at"] if entry else None
+
+    def record(self, team_id: str, config_fp: str, output_fp: str, built_at: datetime) -> None:
+        self.teams[team_id] = {"config": config_fp, "output": output_fp, "built_at": built_at.isoformat()}
+
+    def save(self) -> None:
+        write_json(self.path, {"teams": self.teams})
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+import heapq
+from typing import Iterable, Iterator, List, Tuple
+
+from src.utils.events import Event
+
+
+@dataclass
+class Conflict:
+    kind: str  # overlap | tight
+    gap_minutes: int  # negative when the games overlap
+    first_team: str
+    first: Event
+    second_team: str
+    second: Event
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "gap_minutes": self.gap_minutes,
+            "first": {"team": self.first_team, "summary": self.first.summary, "start": self.first.start.isoformat()},
+            "second": {"team": self.second_team, "summary": self.second.summary, "start": self.second.start.isoformat()},
+        }
+
+    def to_event(self) -> Event:
+        label = "Overlap" if self.kind == "overlap" else f"{self.gap_minutes} min apart"
+        return Event(
+            summary=f"Conflict ({label}): {self.first_team} / {self.second_team}",
+            start=min(self.first.start, self.second.start),
+            end=max(self.first.end, self.second.end),
+            timezone=self.first.timezone,
+            location=" / ".join(loc for loc in (self.first.location, self.second.location) if loc) or None,
+            description=f"{self.first_team}: {self.first.summary}\n{self.second_team}: {self.second.summary}",
+            external_id=f"conflict:{self.first.google_event_id()}:{self.second.google_event_id()}",
+        )
+
+
+def tag_team(team: str, events: Iterable[Event]) -> Iterator[Tuple[str, Event]]:
+    for ev in events:
+        yield team, ev
+
+
+def find_conflicts(events: Iterable[Tuple[str, Event]], min_gap: timedelta) -> List[Conflict]:
+    """Sweep (team, event) pairs sorted by start for cross-team clashes.
+
+    A heap of earlier games ordered by end time holds only those that can
+    still clash (end + min_gap after the current start), so the sweep is
+    O(n log n) plus the number of conflicts reported. Input must be sorted by
+    start, e.g. a heapq.merge of per-team store queries. Two teams listing the
+    same game (same UID) is not a conflict.
+    """
+    active: List[Tuple] = []
+    conflicts: List[Conflict] = []
+    counter = 0
+
+    for team, ev in events:
+        while active and active[0][0] + min_gap <= ev.start:
+            heapq.heappop(active)
+
+        uid = ev.google_event_id()
+        for _, _, other_team, other, other_uid in active:
+            if other_team == team or other_uid == uid:
+                continue
+            gap = ev.start - other.end
+            kind = "overlap" if gap < timedelta(0) else "tight"
+            conflicts.append(Conflict(kind, int(gap.total_seconds() // 60), other_team, other, team, ev))
+
+        counter += 1
+        heapq.heappush(active, (ev.end, counter, team, ev, uid))
+
+    return conflicts
@@ -32,6 +32,9 @@ class Event:
     def to_google_body(self) -> dict:
         tz = self.timezone
         return {
+            # Google keeps deleted events as "cancelled" under the same ID, so
+            # a game that returns must be confirmed again, not just patched.
+            "status": "confirmed",
             "summary": self.summary,
             "location": self.location or None,
             "description": self.description or None,
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from hashlib import sha256
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+import gzip
+import json
+
+from src.utils.state import load_json
+
+
+MANIFEST_NAME = "manifest.json"
+
+
+def gzip_bytes(data: bytes) -> bytes:
+    # mtime=0 keeps the output deterministic, so an unchanged feed produces an
+    # unchanged .gz and nothing new to commit.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def feed_entry(path: Path, previous: Optional[dict] = None) -> dict:
+    """Manifest entry for one feed, rebuilding its .ics.gz only if it changed."""
+    data = path.read_bytes()
+    digest = sha256(data).hexdigest()
+    gz_path = path.with_name(f"{path.name}.gz")
+
+    if not previous or previous.get("sha256") != digest or not gz_path.exists():
+        gz_path.write_bytes(gzip_bytes(data))
+    gz_data = gz_path.read_bytes()
+    return {
+        "bytes": len(data),
+        "sha256": digest,
+        "gzip": gz_path.name,
+        "gzip_bytes": len(gz_data),
+        "gzip_sha256": sha256(gz_data).hexdigest(),
+    }
+
+
+def feed_entries(docs: Path, names: Iterable[str]) -> Dict[str, dict]:
+    """Entries for just these feeds (a shard's share of the manifest)."""
+    previous = load_json(docs / MANIFEST_NAME, default={}).get("feeds", {})
+    return {name: feed_entry(docs / name, previous.get(name)) for name in sorted(names) if (docs / name).exists()}
+
+
+def update_manifest(docs: Path, known: Optional[Dict[str, dict]] = None) -> dict:
+    """Refresh <feed>.ics.gz for every feed in `docs` and write manifest.json.
+
+    Compressed copies are only rebuilt when a feed's hash differs from the
+    previous manifest (or the .gz is missing); the manifest file itself is
+    only rewritten when an entry changed. Entries in `known` (from shard
+    manifests) are taken as is when the file size still matches, so the
+    merge step doesn't re-read feeds the shards already hashed.
+    """
+    manifest_path = docs / MANIFEST_NAME
+    previous = load_json(manifest_path, default={}).get("feeds", {})
+    known = known or {}
+    feeds = {}
+
+    for path in sorted(docs.glob("*.ics")):
+        entry = known.get(path.name)
+        if entry and entry["bytes"] == path.stat().st_size and (docs / entry["gzip"]).exists():
+            feeds[path.name] = entry
+        else:
+            feeds[path.name] = feed_entry(path, previous.get(path.name))
+
+    # Feeds that no longer exist drop their stale compressed copies.
+    for gz_path in docs.glob("*.ics.gz"):
+        if gz_path.name[: -len(".gz")] not in feeds:
+            gz_path.unlink()
+
+    manifest = {"feeds": feeds}
+    text = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    if not manifest_path.exists() or manifest_path.read_text(encoding="utf-8") != text:
+        manifest_path.write_text(text, encoding="utf-8")
+    return manifest
@@ -0,0 +1,404 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from hashlib import sha1
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+import json
+import os
+import random
+import time
+import uuid
+
+from loguru import logger
+import requests
+
+from src.utils.events import Event
+from src.utils.state import load_json, state_path, write_json
+from src.utils.tracing import span
+
+
+API_ROOT = "https://www.googleapis.com"
+BATCH_PATH = "/batch/calendar/v3"
+# Google accepts up to 1000 calls per batch but recommends far fewer; larger
+# batches mostly just fail together when the calendar is rate limited.
+MAX_BATCH_SIZE = 50
+MAX_RETRIES = 5
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 32.0
+RETRYABLE_STATUSES = {403, 429, 500, 502, 503, 504}
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+# Renew an access token this long before Google says it expires.
+TOKEN_EXPIRY_MARGIN_SECONDS = 120
+# A static access token (about an hour of life; fine for one-off runs)...
+TOKEN_ENV = "GOOGLE_CALENDAR_TOKEN"
+# ...or an OAuth client plus refresh token, renewed as needed (scheduled runs
+# and the daemon).
+CLIENT_ID_ENV = "GOOGLE_CLIENT_ID"
+CLIENT_SECRET_ENV = "GOOGLE_CLIENT_SECRET"
+REFRESH_TOKEN_ENV = "GOOGLE_REFRESH_TOKEN"
+TOKEN_URI_ENV = "GOOGLE_TOKEN_URI"
+API_ROOT_ENV = "GOOGLE_CALENDAR_API"
+
+
+def remote_event_id(ev: Event) -> str:
+    # Google event IDs may only use base32hex characters (a-v, 0-9); the
+    # feed UID is "evt_<hex>", so dropping the underscore gives a valid ID
+    # that still maps 1:1 to the UID.
+    return ev.google_event_id().replace("_", "")
+
+
+def body_hash(body: dict) -> str:
+    return sha1(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CalendarOp:
+    kind: str  # "insert", "patch" or "delete"
+    calendar_id: str
+    event_id: str
+    body: Optional[dict] = None
+
+    def request_line(self) -> str:
+        events = f"/calendar/v3/calendars/{quote(self.calendar_id, safe='')}/events"
+        if self.kind == "insert":
+            return f"POST {events}"
+        method = "PATCH" if self.kind == "patch" else "DELETE"
+        return f"{method} {events}/{quote(self.event_id, safe='')}"
+
+
+@dataclass
+class OpResult:
+    op: CalendarOp
+    status: int
+    body: Optional[dict] = None
+
+    @property
+    def ok(self) -> bool:
+        # A delete of something already gone is as good as a delete.
+        return 200 <= self.status < 300 or (self.op.kind == "delete" and self.status in (404, 410))
+
+
+def encode_batch(parts: List[Tuple[str, str, Optional[dict]]], boundary: str) -> bytes:
+    """multipart/mixed body of application/http parts: (content_id, start_line, json)."""
+    chunks = []
+    for content_id, start_line, payload in parts:
+        chunks.append(f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <{content_id}>\r\n\r\n")
+        chunks.append(f"{start_line}\r\n")
+        if payload is not None:
+            chunks.append(f"Content-Type: application/json\r\n\r\n{json.dumps(payload)}\r\n")
+        else:
+            chunks.append("\r\n")
+    chunks.append(f"--{boundary}--\r\n")
+    return "".join(chunks).encode("utf-8")
+
+
+def decode_batch(body: bytes, content_type: str) -> List[Tuple[str, str, Optional[dict]]]:
+    """Inverse of encode_batch; used for both batch requests and responses."""
+    boundary = ""
+    for param in content_type.split(";")[1:]:
+        name, _, value = param.strip().partition("=")
+        if name.lower() == "boundary":
+            boundary = value.strip('"')
+    if not boundary:
+        raise ValueError(f"No multipart boundary in {content_type!r}")
+
+    parts = []
+    text = body.decode("utf-8").replace("\r\n", "\n")
+    for chunk in text.split(f"--{boundary}")[1:]:
+        if chunk.startswith("--"):
+            break
+        outer, _, message = chunk.strip("\n").partition("\n\n")
+        content_id = ""
+        for line in outer.splitlines():
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-id":
+                content_id = value.strip().strip("<>")
+        head, _, payload = message.partition("\n\n")
+        start_line = head.splitlines()[0] if head else ""
+        payload = payload.strip()
+        parts.append((content_id, start_line, json.loads(payload) if payload else None))
+    return parts
+
+
+class OAuthCredentials:
+    """An OAuth access token renewed from a refresh token.
+
+    Access tokens expire after about an hour, well within a daemon's
+    lifetime; this fetches a new one before the old one runs out, and on
+    demand when the API rejects it anyway (``refresh()`` after a 401).
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        refresh_token: str,
+        token_uri: str = TOKEN_URI,
+        session: Optional[requests.Session] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_token = refresh_token
+        self.token_uri = token_uri
+        self.session = session or requests.Session()
+        self.clock = clock
+        self.refreshes = 0
+        self._access_token: Optional[str] = None
+        self._expires_at = 0.0
+
+    def token(self) -> str:
+        if self._access_token is None or self.clock() >= self._expires_at:
+            self.refresh()
+        return self._access_token
+
+    def expire(self) -> None:
+        """Drop the current token; the next token() call fetches a new one."""
+        self._access_token = None
+
+    def refresh(self) -> None:
+        with span("http post", url=self.token_uri):
+            resp = self.session.post(
+                self.token_uri,
+                data={
+                    "grant_type": "refresh_token",
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "refresh_token": self.refresh_token,
+                },
+                timeout=30,
+            )
+        resp.raise_for_status()
+        data = resp.json()
+        self.refreshes += 1
+        self._access_token = data["access_token"]
+        lifetime = float(data.get("expires_in", 3600))
+        self._expires_at = self.clock() + max(0.0, lifetime - TOKEN_EXPIRY_MARGIN_SECONDS)
+        logger.info("Refreshed Google Calendar access token")
+
+
+class GoogleCalendarClient:
+    """Calendar API v3 over the batch endpoint, with retry and backoff.
+
+    Whole-batch failures (connection errors, 429/5xx) and individual parts
+    that come back rate limited are retried with exponential backoff and
+    jitter; everything else is returned to the caller as is. With
+    ``credentials`` the access token is renewed as it expires, and a 401 is
+    retried once with a freshly refreshed token.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        api_root: str = API_ROOT,
+        session: Optional[requests.Session] = None,
+        batch_size: int = MAX_BATCH_SIZE,
+        max_retries: int = MAX_RETRIES,
+        backoff: float = BACKOFF_SECONDS,
+        sleep: Callable[[float], None] = time.sleep,
+        credentials: Optional[OAuthCredentials] = None,
+    ) -> None:
+        if token is None and credentials is None:
+            raise ValueError("GoogleCalendarClient needs an access token or OAuth credentials")
+        self.token = token
+        self.credentials = credentials
+        self.api_root = api_root.rstrip("/")
+        self.session = session or requests.Session()
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.sleep = sleep
+        self.batches_sent = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["GoogleCalendarClient"]:
+        api_root = os.environ.get(API_ROOT_ENV) or API_ROOT
+        refresh = [os.environ.get(name) for name in (CLIENT_ID_ENV, CLIENT_SECRET_ENV, REFRESH_TOKEN_ENV)]
+        if all(refresh):
+            client_id, client_secret, refresh_token = refresh
+            credentials = OAuthCredentials(
+                client_id, client_secret, refresh_token, token_uri=os.environ.get(TOKEN_URI_ENV) or TOKEN_URI
+            )
+            return cls(api_root=api_root, credentials=credentials)
+        token = os.environ.get(TOKEN_ENV)
+        if not token:
+            return None
+        return cls(token, api_root=api_root)
+
+    def _access_token(self) -> str:
+        return self.credentials.token() if self.credentials is not None else self.token
+
+    def execute(self, ops: List[CalendarOp]) -> List[OpResult]:
+        results: List[OpResult] = []
+        for i in range(0, len(ops), self.batch_size):
+            results.extend(self._execute_chunk(ops[i : i + self.batch_size]))
+        return results
+
+    def _execute_chunk(self, ops: List[CalendarOp]) -> List[OpResult]:
+        done: Dict[int, OpResult] = {}
+        pending = list(enumerate(ops))
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.sleep(self._delay(attempt))
+            try:
+                responses = self._send([op for _, op in pending])
+            except _RetryableBatchError as exc:
+                logger.warning(f"Calendar batch failed ({exc}); attempt {attempt + 1}/{self.max_retries + 1}")
+                continue
+
+            retry = []
+            unauthorized = False
+            for (index, op), (status, body) in zip(pending, responses):
+                result = OpResult(op, status, body)
+                if status in RETRYABLE_STATUSES and (status != 403 or _rate_limited(body)):
+                    retry.append((index, op))
+                elif status == 401 and self.credentials is not None:
+                    unauthorized = True
+                    retry.append((index, op))
+                done[index] = result
+            if unauthorized:
+                self.credentials.expire()
+            pending = retry
+            if not pending:
+                break
+        return [done.get(index, OpResult(op, 0)) for index, op in enumerate(ops)]
+
+    def _delay(self, attempt: int) -> float:
+        delay = min(MAX_BACKOFF_SECONDS, self.backoff * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _send(self, ops: List[CalendarOp]) -> List[Tuple[int, Optional[dict]]]:
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = [(f"item-{i}", f"{op.request_line()} HTTP/1.1", op.body) for i, op in enumerate(ops)]
+        data = encode_batch(parts, boundary)
+        for refreshed in (False, True):
+            self.batches_sent += 1
+            try:
+                with span("http post", url=f"{self.api_root}{BATCH_PATH}", ops=len(ops)):
+                    resp = self.session.post(
+                        f"{self.api_root}{BATCH_PATH}",
+                        data=data,
+                        headers={
+                            "Authorization": f"Bearer {self._access_token()}",
+                            "Content-Type": f"multipart/mixed; boundary={boundary}",
+                        },
+                        timeout=60,
+                    )
+            except requests.RequestException as exc:
+                raise _RetryableBatchError(str(exc)) from exc
+            if resp.status_code != 401 or self.credentials is None or refreshed:
+                break
+            # The token expired early or was revoked; renew it once. A failed
+            # refresh surfaces as a retryable batch error from the next post.
+            self.credentials.expire()
+        if resp.status_code in RETRYABLE_STATUSES:
+            raise _RetryableBatchError(f"HTTP {resp.status_code}")
+        resp.raise_for_status()
+
+        by_id: Dict[str, Tuple[int, Optional[dict]]] = {}
+        for content_id, status_line, body in decode_batch(resp.content, resp.headers.get("Content-Type", "")):
+            # "HTTP/1.1 200 OK"; Content-IDs come back as "response-item-N".
+            by_id[content_id.replace("response-", "", 1)] = (int(status_line.split()[1]), body)
+        return [by_id.get(f"item-{i}", (0, None)) for i in range(len(ops))]
+
+
+class _RetryableBatchError(Exception):
+    pass
+
+
+def _rate_limited(body: Optional[dict]) -> bool:
+    errors = ((body or {}).get("error") or {}).get("errors") or []
+    return any(e.get("reason") in ("rateLimitExceeded", "userRateLimitExceeded") for e in errors)
+
+
+@dataclass
+class SyncResult:
+    inserted: int = 0
+    patched: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    failed: List[dict] = field(default_factory=list)
+    batches: int = 0
+
+
+class CalendarSync:
+    """Push one team's events into a Google Calendar, touching only changes.
+
+    What was last pushed is cached locally as {event id: body hash}, so an
+    unchanged game costs no API call at all; new games are inserted, changed
+    ones patched, and games that disappeared from the schedule deleted.
+    Failed calls leave the cache untouched and are retried next run.
+    """
+
+    def __init__(self, client: GoogleCalendarClient, calendar_id: str, cache_path: Optional[Path] = None) -> None:
+        self.client = client
+        self.calendar_id = calendar_id
+        digest = sha1(calendar_id.encode("utf-8")).hexdigest()[:12]
+        self.cache_path = cache_path or state_path(f"gcal-{digest}.json")
+
+    def plan(self, events: Iterable[Event], cached: Dict[str, str]) -> Tuple[List[CalendarOp], Dict[str, str], int]:
+        ops: List[CalendarOp] = []
+        hashes: Dict[str, str] = {}
+        unchanged = 0
+        for ev in events:
+            event_id = remote_event_id(ev)
+            body = ev.to_google_body()
+            digest = body_hash(body)
+            hashes[event_id] = digest
+            if event_id not in cached:
+                ops.append(CalendarOp("insert", self.calendar_id, event_id, {"id": event_id, **body}))
+            elif cached[event_id] != digest:
+                ops.append(CalendarOp("patch", self.calendar_id, event_id, body))
+            else:
+                unchanged += 1
+        for event_id in cached.keys() - hashes.keys():
+            ops.append(CalendarOp("delete", self.calendar_id, event_id))
+        return ops, hashes, unchanged
+
+    def sync(self, events: Iterable[Event]) -> SyncResult:
+        state = load_json(self.cache_path, {}) or {}
+        cached: Dict[str, str] = state.get("events", {}) if state.get("calendar_id") == self.calendar_id else {}
+        ops, hashes, unchanged = self.plan(events, cached)
+        result = SyncResult(unchanged=unchanged)
+        if not ops:
+            return result
+
+        batches_before = self.client.batches_sent
+        results = self.client.execute(ops)
+        # Remote state drifted from the cache (cache lost, or edited in the
+        # calendar): retry an insert that already exists as a patch and a
+        # patch of a missing event as an insert.
+        redo = []
+        for r in results:
+            if r.op.kind == "insert" and r.status == 409:
+                body = dict(r.op.body or {})
+                body.pop("id", None)
+                redo.append(CalendarOp("patch", self.calendar_id, r.op.event_id, body))
+            elif r.op.kind == "patch" and r.status in (404, 410):
+                redo.append(CalendarOp("insert", self.calendar_id, r.op.event_id, {"id": r.op.event_id, **(r.op.body or {})}))
+        if redo:
+            redone = {op.event_id: res for op, res in zip(redo, self.client.execute(redo))}
+            results = [redone.get(r.op.event_id, r) for r in results]
+        result.batches = self.client.batches_sent - batches_before
+
+        for r in results:
+            event_id = r.op.event_id
+            if not r.ok:
+                result.failed.append({"kind": r.op.kind, "event_id": event_id, "status": r.status})
+                # Keep what we believed before so the next run retries.
+                if event_id in cached:
+                    hashes[event_id] = cached[event_id]
+                else:
+                    hashes.pop(event_id, None)
+                continue
+            if r.op.kind == "delete":
+                result.deleted += 1
+            elif r.op.kind == "insert":
+                result.inserted += 1
+            else:
+                result.patched += 1
+
+        write_json(self.cache_path, {"calendar_id": self.calendar_id, "events": hashes})
+        return result
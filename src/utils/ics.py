@@ -1,15 +1,33 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
+import os
+import re
 import pytz
 from icalendar import Calendar, Event as IcsEvent
 
 from src.utils.events import Event
+from src.utils.tracing import span
 
 
-def build_ics(
-    events: Iterable[Event],
+CALENDAR_END = b"END:VCALENDAR\r\n"
+VEVENT_RE = re.compile(rb"BEGIN:VEVENT\r?\n.*?END:VEVENT\r?\n", re.DOTALL)
+# Properties whose change means the game moved rather than just got a score.
+MOVE_PROPERTIES = ("DTSTART", "DTEND", "LOCATION")
+
+
+@dataclass
+class FeedChange:
+    kind: str  # added | moved | scored | updated | cancelled
+    uid: str
+    summary: str
+    start: str
+
+
+def render_header(
     prodid: str = "-//Hockey Events//EN",
     cal_name: Optional[str] = None,
     tz_name: Optional[str] = None,
@@ -24,24 +42,208 @@ def build_ics(
     if tz_name:
         cal.add("X-WR-TIMEZONE", tz_name)
 
+    # An empty calendar serializes as header + END line; split the END off so
+    # events can be streamed between them.
+    return cal.to_ical()[: -len(CALENDAR_END)]
+
+
+def render_vevent(ev: Event, dtstamp: datetime) -> bytes:
+    ics_ev = IcsEvent()
+    ics_ev.add("summary", ev.summary)
+    # Convert to UTC for broad compatibility
+    start_utc = ev.start.astimezone(pytz.UTC)
+    end_utc = ev.end.astimezone(pytz.UTC)
+    ics_ev.add("dtstart", start_utc)
+    ics_ev.add("dtend", end_utc)
+    ics_ev.add("dtstamp", dtstamp)
+    if ev.location:
+        ics_ev.add("location", ev.location)
+    if ev.description:
+        ics_ev.add("description", ev.description)
+    if ev.source_url:
+        ics_ev.add("url", ev.source_url)
+    ics_ev.add("uid", ev.google_event_id())
+    return ics_ev.to_ical()
+
+
+def iter_ics(
+    events: Iterable[Event],
+    prodid: str = "-//Hockey Events//EN",
+    cal_name: Optional[str] = None,
+    tz_name: Optional[str] = None,
+) -> Iterator[bytes]:
+    """Yield the calendar as byte chunks: header, one chunk per VEVENT, footer.
+
+    Byte-for-byte identical to Calendar.to_ical() on the full calendar, but no
+    whole-calendar object or buffer is ever built.
+    """
+    yield render_header(prodid=prodid, cal_name=cal_name, tz_name=tz_name)
+
+    now_utc = datetime.utcnow().replace(tzinfo=pytz.UTC)
+    for ev in events:
+        yield render_vevent(ev, now_utc)
+
+    yield CALENDAR_END
+
+
+def _vevent_properties(block: bytes) -> Dict[str, bytes]:
+    # Unfold continuation lines, then key each content line by property name.
+    unfolded = re.sub(rb"\r?\n[ \t]", b"", block)
+    props: Dict[str, bytes] = {}
+    for line in unfolded.splitlines():
+        name, _, value = line.partition(b":")
+        props[name.split(b";", 1)[0].decode("ascii", "replace").upper()] = value
+    props.pop("DTSTAMP", None)
+    return props
+
+
+def index_vevents(data: bytes) -> Dict[str, bytes]:
+    """Map UID -> raw VEVENT block, copied verbatim apart from line endings."""
+    index: Dict[str, bytes] = {}
+    for match in VEVENT_RE.finditer(data):
+        # Feeds are CRLF on publish, but a checkout may hand us LF; normalize
+        # so copied blocks match the freshly rendered ones.
+        block = re.sub(rb"\r?\n", b"\r\n", match.group(0))
+        uid = _vevent_properties(block).get("UID")
+        if uid:
+            index[uid.decode("utf-8", "replace")] = block
+    return index
+
+
+def _change(kind: str, uid: str, props: Dict[str, bytes]) -> FeedChange:
+    return FeedChange(
+        kind=kind,
+        uid=uid,
+        summary=props.get("SUMMARY", b"").decode("utf-8", "replace"),
+        start=props.get("DTSTART", b"").decode("utf-8", "replace"),
+    )
+
+
+def patch_ics(
+    existing: Optional[bytes],
+    events: Iterable[Event],
+    cal_name: Optional[str] = None,
+    tz_name: Optional[str] = None,
+) -> Tuple[bytes, List[FeedChange]]:
+    """Rebuild a feed on top of the previously published one.
+
+    VEVENTs whose content is unchanged (ignoring DTSTAMP) are copied through
+    verbatim, so an unchanged game keeps its bytes and DTSTAMP; only added,
+    changed and removed events are re-emitted. Returns the new feed and the
+    list of changes against the old one.
+    """
+    changes: List[FeedChange] = []
+    data = b"".join(iter_patched_ics(existing, events, changes, cal_name=cal_name, tz_name=tz_name))
+    return data, changes
+
+
+def iter_patched_ics(
+    existing: Optional[bytes],
+    events: Iterable[Event],
+    changes: List[FeedChange],
+    cal_name: Optional[str] = None,
+    tz_name: Optional[str] = None,
+) -> Iterator[bytes]:
+    """patch_ics() as byte chunks, like iter_ics(); changes are appended to
+    ``changes`` as the chunks are produced (cancellations at the end)."""
+    old_blocks = index_vevents(existing) if existing else {}
     now_utc = datetime.utcnow().replace(tzinfo=pytz.UTC)
+    yield render_header(cal_name=cal_name, tz_name=tz_name)
+    seen = set()
 
     for ev in events:
-        ics_ev = IcsEvent()
-        ics_ev.add("summary", ev.summary)
-        # Convert to UTC for broad compatibility
-        start_utc = ev.start.astimezone(pytz.UTC)
-        end_utc = ev.end.astimezone(pytz.UTC)
-        ics_ev.add("dtstart", start_utc)
-        ics_ev.add("dtend", end_utc)
-        ics_ev.add("dtstamp", now_utc)
-        if ev.location:
-            ics_ev.add("location", ev.location)
-        if ev.description:
-            ics_ev.add("description", ev.description)
-        if ev.source_url:
-            ics_ev.add("url", ev.source_url)
-        ics_ev.add("uid", ev.google_event_id())
-        cal.add_component(ics_ev)
-
-    return cal.to_ical()
\ No newline at end of file
+        uid = ev.google_event_id()
+        if uid in seen:
+            continue
+        seen.add(uid)
+
+        block = render_vevent(ev, now_utc)
+        old_block = old_blocks.get(uid)
+        if old_block is None:
+            changes.append(_change("added", uid, _vevent_properties(block)))
+            yield block
+            continue
+
+        old_props = _vevent_properties(old_block)
+        new_props = _vevent_properties(block)
+        if old_props == new_props:
+            yield old_block
+            continue
+
+        if any(old_props.get(name) != new_props.get(name) for name in MOVE_PROPERTIES):
+            kind = "moved"
+        elif old_props.get("SUMMARY") != new_props.get("SUMMARY"):
+            kind = "scored"
+        else:
+            kind = "updated"
+        changes.append(_change(kind, uid, new_props))
+        yield block
+
+    for uid, old_block in old_blocks.items():
+        if uid not in seen:
+            changes.append(_change("cancelled", uid, _vevent_properties(old_block)))
+
+    yield CALENDAR_END
+
+
+def patch_feed(
+    path: Path,
+    events: Iterable[Event],
+    cal_name: Optional[str] = None,
+    tz_name: Optional[str] = None,
+) -> List[FeedChange]:
+    """Patch the published feed at `path` in place; untouched files aren't rewritten.
+
+    The patched feed streams straight into the temp file (see
+    _write_atomic); it is swapped in only if its bytes differ.
+    """
+    existing = path.read_bytes() if path.exists() else None
+    changes: List[FeedChange] = []
+    chunks = iter_patched_ics(existing, events, changes, cal_name=cal_name, tz_name=tz_name)
+    with span("build_ics", feed=path.name):
+        _write_atomic(path, chunks, unless_equal=existing)
+    return changes
+
+
+def build_ics(
+    events: Iterable[Event],
+    prodid: str = "-//Hockey Events//EN",
+    cal_name: Optional[str] = None,
+    tz_name: Optional[str] = None,
+) -> bytes:
+    return b"".join(iter_ics(events, prodid=prodid, cal_name=cal_name, tz_name=tz_name))
+
+
+def write_ics(
+    path: Path,
+    events: Iterable[Event],
+    cal_name: Optional[str] = None,
+    tz_name: Optional[str] = None,
+) -> None:
+    _write_atomic(path, iter_ics(events, cal_name=cal_name, tz_name=tz_name))
+
+
+def _write_atomic(path: Path, chunks: Iterable[bytes], unless_equal: Optional[bytes] = None) -> bool:
+    # Stream into a temp file and swap it in, so a failed run never leaves a
+    # half-written feed for subscribers. With ``unless_equal`` (the current
+    # contents) the chunks are compared as they are written and an identical
+    # result is discarded, leaving the published file untouched.
+    tmp = path.with_name(f"{path.name}.tmp")
+    same = unless_equal is not None
+    written = 0
+    try:
+        with tmp.open("wb") as f:
+            for chunk in chunks:
+                if same and unless_equal[written : written + len(chunk)] != chunk:
+                    same = False
+                f.write(chunk)
+                written += len(chunk)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if same and written == len(unless_equal):
+        tmp.unlink()
+        return False
+    with span("write_ics", feed=path.name, bytes=written):
+        os.replace(tmp, path)
+    return True
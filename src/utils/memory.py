@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+import os
+import threading
+import tracemalloc
+
+from loguru import logger
+
+from src.config import MemorySettings
+
+
+PROC = Path("/proc")
+MB = 1024 * 1024
+BROWSER_MARKERS = ("chrome", "chromium", "headless_shell")
+_NO_STAGE = nullcontext()
+
+
+@dataclass
+class ProcessSample:
+    self_rss: int = 0
+    # Proportional set size where /proc offers it: Chromium's processes share
+    # most of their pages, and summing plain RSS would count them repeatedly.
+    children: int = 0
+    browser: int = 0
+    processes: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.self_rss + self.children
+
+
+def _kb_field(path: Path, name: str) -> Optional[int]:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(name):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def process_memory(pid: int, proc: Path = PROC) -> int:
+    pss = _kb_field(proc / str(pid) / "smaps_rollup", "Pss:")
+    if pss is not None:
+        return pss
+    return _kb_field(proc / str(pid) / "status", "VmRSS:") or 0
+
+
+def descendants(pid: int, proc: Path = PROC) -> List[int]:
+    children: Dict[int, List[int]] = {}
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text(encoding="utf-8")
+        except OSError:
+            continue
+        # The command name may hold spaces or parens; ppid is the second
+        # field after its closing paren.
+        fields = stat.rsplit(")", 1)[-1].split()
+        if len(fields) > 1:
+            children.setdefault(int(fields[1]), []).append(int(entry.name))
+
+    found: List[int] = []
+    stack = [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def sample_processes(pid: Optional[int] = None, proc: Path = PROC) -> ProcessSample:
+    """This process's RSS plus its descendants' memory (Playwright drivers,
+    Chromium, parse-pool workers); zeros where /proc isn't available."""
+    pid = pid or os.getpid()
+    if not (proc / str(pid)).exists():
+        return ProcessSample()
+    sample = ProcessSample(self_rss=_kb_field(proc / str(pid) / "status", "VmRSS:") or 0)
+    for child in descendants(pid, proc):
+        used = process_memory(child, proc)
+        sample.children += used
+        sample.processes += 1
+        try:
+            cmdline = (proc / str(child) / "cmdline").read_bytes().decode("utf-8", "replace").lower()
+        except OSError:
+            cmdline = ""
+        if any(marker in cmdline for marker in BROWSER_MARKERS):
+            sample.browser += used
+    return sample
+
+
+class MemoryMonitor:
+    """Memory peaks for the run report, and budgets enforced between teams.
+
+    A background thread samples process and child memory every
+    ``sample_seconds``. With ``tracemalloc`` on, ``stage()`` records each
+    stage's Python allocation peak (nested stages fold into their parent).
+    ``enforce()`` runs between team refreshes: over the browser budget the
+    shared Chromium is recycled, over the RSS budget the parse pool is
+    halved, so a small runner degrades instead of getting OOM-killed.
+    """
+
+    def __init__(self, sampler: Callable[[], ProcessSample] = sample_processes) -> None:
+        self.settings = MemorySettings()
+        self.tracing = False
+        self.sampler = sampler
+        self.peak = ProcessSample()
+        self.python_peak = 0
+        self.stages: Dict[str, dict] = {}
+        self.actions: List[str] = []
+        self._stack: List[list] = []
+        self._owner: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_tracemalloc = False
+
+    def start(self, settings: MemorySettings) -> "MemoryMonitor":
+        self.settings = settings
+        self.peak = ProcessSample()
+        self.python_peak = 0
+        self.stages = {}
+        self.actions = []
+        self._stack = []
+        self._owner = threading.get_ident()
+        if settings.tracemalloc:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self.tracing = True
+        self.sample()
+        if settings.sample_seconds > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sample_loop, name="memory-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> dict:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.sample()
+        if self.tracing:
+            self.python_peak = max(self.python_peak, tracemalloc.get_traced_memory()[1])
+            self.tracing = False
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+        return self.summary()
+
+    def sample(self) -> ProcessSample:
+        sample = self.sampler()
+        with self._lock:
+            self.peak = ProcessSample(
+                self_rss=max(self.peak.self_rss, sample.self_rss),
+                children=max(self.peak.children, sample.children),
+                browser=max(self.peak.browser, sample.browser),
+                processes=max(self.peak.processes, sample.processes),
+            )
+        return sample
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.settings.sample_seconds):
+            try:
+                self.sample()
+            except Exception as exc:
+                logger.debug(f"Memory sample failed: {exc}")
+
+    def stage(self, name: str):
+        # tracemalloc's peak is process-wide, so only the thread that started
+        # the monitor keeps a stage stack.
+        if not self.tracing or threading.get_ident() != self._owner:
+            return _NO_STAGE
+        return self._stage(name)
+
+    @contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1][2] = max(self._stack[-1][2], peak)
+        tracemalloc.reset_peak()
+        frame = [name, current, current]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            frame[2] = max(frame[2], tracemalloc.get_traced_memory()[1])
+            for i in range(len(self._stack) - 1, -1, -1):
+                if self._stack[i] is frame:
+                    del self._stack[i]
+                    break
+            if self._stack:
+                self._stack[-1][2] = max(self._stack[-1][2], frame[2])
+            tracemalloc.reset_peak()
+            self.python_peak = max(self.python_peak, frame[2])
+            entry = self.stages.setdefault(name, {"calls": 0, "peak_mb": 0.0, "growth_mb": 0.0})
+            entry["calls"] += 1
+            entry["peak_mb"] = max(entry["peak_mb"], round(frame[2] / MB, 2))
+            entry["growth_mb"] = max(entry["growth_mb"], round((frame[2] - frame[1]) / MB, 2))
+
+    def enforce(self, parse_stage=None, browser=None) -> List[str]:
+        """Apply the budgets to a fresh sample; returns what was done."""
+        settings = self.settings
+        if not settings.rss_budget_mb and not settings.browser_budget_mb:
+            return []
+        sample = self.sample()
+        actions: List[str] = []
+        if settings.browser_budget_mb and sample.browser > settings.browser_budget_mb * MB and browser is not None:
+            browser.recycle()
+            actions.append(f"recycled browser at {sample.browser / MB:.0f} MB (budget {settings.browser_budget_mb} MB)")
+        elif settings.rss_budget_mb and sample.total > settings.rss_budget_mb * MB:
+            if parse_stage is not None and parse_stage.workers > 1:
+                workers = parse_stage.shrink()
+                actions.append(f"parse workers down to {workers} at {sample.total / MB:.0f} MB (budget {settings.rss_budget_mb} MB)")
+            elif browser is not None and sample.browser:
+                browser.recycle()
+                actions.append(f"recycled browser at {sample.total / MB:.0f} MB (budget {settings.rss_budget_mb} MB)")
+        for action in actions:
+            logger.warning(f"Memory budget: {action}")
+        self.actions.extend(actions)
+        return actions
+
+    def summary(self) -> dict:
+        with self._lock:
+            peak = self.peak
+        data = {
+            "rss_peak_mb": round(peak.self_rss / MB, 1),
+            "children_peak_mb": round(peak.children / MB, 1),
+            "browser_peak_mb": round(peak.browser / MB, 1),
+            "child_processes_peak": peak.processes,
+            "budget_actions": list(self.actions),
+        }
+        if self.stages:
+            data["python_peak_mb"] = round(self.python_peak / MB, 1)
+            data["stages"] = self.stages
+        return data
+
+
+MEMORY = MemoryMonitor()
+
+
+def memory_stage(name: str):
+    """``with memory_stage("build_ics"):`` — free unless tracemalloc is on."""
+    return MEMORY.stage(name)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+import os
+import threading
+
+from src.utils.state import state_path
+
+
+METRICS_PATH = state_path("metrics.prom")
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# name -> (type, help, histogram buckets)
+METRIC_DEFINITIONS: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {
+    "hockey_scrape_duration_seconds": (
+        "histogram", "Time to fetch and parse one configured URL.", LATENCY_BUCKETS,
+    ),
+    "hockey_scrape_total": ("counter", "Scraped URLs by outcome (success, empty, failure).", ()),
+    "hockey_scrape_events_total": ("counter", "Events parsed from scraped pages.", ()),
+    "hockey_fetch_bytes_total": ("counter", "Bytes of page payload handed to the parsers.", ()),
+    "hockey_fetch_strategy_total": (
+        "counter", "Which fetch strategy produced each page (fallbacks included).", (),
+    ),
+    "hockey_parse_cache_total": (
+        "counter", "Pages whose events were reused (hit) or re-parsed (miss) by fingerprint.", (),
+    ),
+    "hockey_feed_events": ("gauge", "Events in each published feed.", ()),
+    "hockey_feed_writes_total": ("counter", "Feeds rewritten because their content changed.", ()),
+    "hockey_feed_changes_total": ("counter", "Per-event feed changes by kind.", ()),
+    "hockey_build_duration_seconds": ("gauge", "Wall time of the last build.", ()),
+    "hockey_build_last_success_timestamp_seconds": (
+        "gauge", "Unix time the last build finished.", (),
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+T = TypeVar("T")
+
+
+def _labels(labels: Optional[Mapping[str, str]]) -> Labels:
+    return tuple(sorted((labels or {}).items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def host_of(url: str) -> str:
+    # Stand-in and proxied URLs carry the site's host as the first path
+    # segment; label by the real site either way.
+    parts = urlsplit(url)
+    for host in ("eriemetrosports.com", "rinksatharborcenter.com", "bondsports.co"):
+        if host in url:
+            return host
+    return parts.hostname or "unknown"
+
+
+class Metrics:
+    """Counters, gauges and histograms rendered in the Prometheus text format.
+
+    Each run writes its values to a textfile for node_exporter's textfile
+    collector; counters start from zero in every process, so they describe
+    the last run (or, for the daemon, everything since it started).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, list]] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self._histograms.clear()
+
+    def inc(self, name: str, labels: Optional[Mapping[str, str]] = None, amount: float = 1.0) -> None:
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            key = _labels(labels)
+            series[key] = series.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, labels: Optional[Mapping[str, str]] = None) -> None:
+        with self._lock:
+            self._values.setdefault(name, {})[_labels(labels)] = value
+
+    def observe(self, name: str, value: float, labels: Optional[Mapping[str, str]] = None) -> None:
+        buckets = METRIC_DEFINITIONS[name][2]
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # [per-bucket counts..., +Inf count, sum]
+            state = series.setdefault(_labels(labels), [0] * (len(buckets) + 1) + [0.0])
+            state[bisect_left(buckets, value)] += 1
+            state[-1] += value
+
+    def value(self, name: str, labels: Optional[Mapping[str, str]] = None) -> Optional[float]:
+        with self._lock:
+            return self._values.get(name, {}).get(_labels(labels))
+
+    def count_events(self, events: Iterable[T], feed: str) -> Iterator[T]:
+        """Pass events through, recording how many went into `feed`."""
+        count = 0
+        for ev in events:
+            count += 1
+            yield ev
+        self.set("hockey_feed_events", count, {"feed": feed})
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            names = sorted(set(self._values) | set(self._histograms))
+            for name in names:
+                kind, help_text, buckets = METRIC_DEFINITIONS.get(name, ("untyped", "", ()))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(self._values.get(name, {}).items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                for labels, state in sorted(self._histograms.get(name, {}).items()):
+                    cumulative = 0
+                    for bound, count in zip(list(buckets) + [float("inf")], state[:-1]):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(state[-1])}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path = METRICS_PATH) -> None:
+        # node_exporter may read the file at any moment, so replace it
+        # atomically rather than writing in place.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+METRICS = Metrics()
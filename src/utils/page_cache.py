@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import sys
+import threading
+
+from dateutil import parser as dateparser
+import pytz
+
+from src.utils.events import Event
+from src.utils.metrics import METRICS
+from src.utils.shards import event_from_dict, event_to_dict
+from src.utils.state import load_json, state_path, write_json
+
+
+PAGE_CACHE_PATH = state_path("parsed-pages.json")
+# Pages not fetched for this long (teams removed from config, renamed URLs)
+# are dropped when the cache is saved.
+PAGE_CACHE_MAX_AGE = timedelta(days=30)
+# Besides the scraper's own module, event construction lives here.
+PARSER_MODULES = ("src.utils.events",)
+
+_module_digests: Dict[str, str] = {}
+
+
+def parser_version(scraper: Any) -> str:
+    """Hash of the source of the modules that turn a payload into events, so
+    a parser fix invalidates every page parsed by the old code."""
+    digest = sha256()
+    for name in (type(scraper).__module__, *PARSER_MODULES):
+        if name not in _module_digests:
+            path = getattr(sys.modules.get(name), "__file__", None)
+            try:
+                _module_digests[name] = sha256(Path(path).read_bytes()).hexdigest() if path else name
+            except OSError:
+                _module_digests[name] = name
+        digest.update(_module_digests[name].encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ParsedPageCache:
+    """Events parsed from each page on earlier runs, keyed by a fingerprint
+    of the page's schedule region.
+
+    Sites rarely honour conditional GETs, but the part of a page the parser
+    reads (Erie's table, Harborcenter's game rows, Bond's game cards) is
+    usually byte-identical between runs. Each scraper hashes just that
+    region (``content_fingerprint``); when it matches what was stored for
+    the same page, team and timezone, the stored events are reused and
+    BeautifulSoup, dateutil and any per-game lookups are skipped. Scrapers
+    that return None for a payload are always parsed, and a parse whose
+    lookups failed (``Scraper.lookups_failed``) is not stored, so the next
+    run retries it.
+    """
+
+    def __init__(self, path: Path = PAGE_CACHE_PATH) -> None:
+        self.path = path
+        self.pages: Dict[str, dict] = (load_json(path, default={}) or {}).get("pages", {})
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(scraper: Any, source_url: str, timezone: str) -> str:
+        # Async scrapers live beside their sync twin and parse identically,
+        # so the module (not the class) names the parser.
+        return f"{type(scraper).__module__}|{getattr(scraper, 'team_name', None)}|{timezone}|{source_url}"
+
+    def fingerprint(self, scraper: Any, payload: Any) -> Optional[str]:
+        region = scraper.content_fingerprint(payload)
+        if region is None:
+            return None
+        return sha256(f"{parser_version(scraper)}|{region}".encode("utf-8")).hexdigest()
+
+    def get(self, scraper: Any, source_url: str, timezone: str, fingerprint: str) -> Optional[List[Event]]:
+        labels = {"scraper": type(scraper).__name__}
+        with self._lock:
+            entry = self.pages.get(self.key(scraper, source_url, timezone))
+            if entry is None or entry["fingerprint"] != fingerprint:
+                self.misses += 1
+                METRICS.inc("hockey_parse_cache_total", {**labels, "result": "miss"})
+                return None
+            entry["seen_at"] = _now().isoformat()
+            self.hits += 1
+        METRICS.inc("hockey_parse_cache_total", {**labels, "result": "hit"})
+        return [event_from_dict(data) for data in entry["events"]]
+
+    def put(self, scraper: Any, source_url: str, timezone: str, fingerprint: str, events: List[Event]) -> None:
+        entry = {
+            "fingerprint": fingerprint,
+            "seen_at": _now().isoformat(),
+            "events": [event_to_dict(ev) for ev in events],
+        }
+        with self._lock:
+            self.pages[self.key(scraper, source_url, timezone)] = entry
+
+    def save(self) -> None:
+        cutoff = _now() - PAGE_CACHE_MAX_AGE
+        with self._lock:
+            self.pages = {
+                key: entry for key, entry in self.pages.items() if dateparser.isoparse(entry["seen_at"]) >= cutoff
+            }
+            data = {"pages": dict(self.pages)}
+        write_json(self.path, data)
+
+
+def _now() -> datetime:
+    return datetime.now(pytz.UTC)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Tuple, TypeVar
+import asyncio
+import os
+import threading
+
+from loguru import logger
+
+from src.scrapers.base import RawPage, Scraper
+from src.utils.events import Event
+from src.utils.memory import memory_stage
+from src.utils.page_cache import ParsedPageCache
+from src.utils.profiling import PROFILER, profile_stage
+from src.utils.tracing import span
+
+
+T = TypeVar("T")
+# Below this many characters an HTML payload parses faster than it pickles, so
+# it stays inline even when a pool is configured. In-page records (lists and
+# dicts) are already small and always parse inline.
+POOL_MIN_PAYLOAD_CHARS = 64 * 1024
+
+
+def _parse_payload(scraper: Scraper, source_url: str, payload: Any, timezone: str) -> List[Event]:
+    return scraper.parse(source_url, payload, timezone)
+
+
+def _parse_cacheable(scraper: Scraper, source_url: str, payload: Any, timezone: str) -> Tuple[List[Event], bool]:
+    # A pool worker parses a copy of the scraper, so whether its lookups all
+    # succeeded has to travel back with the events.
+    events = scraper.parse(source_url, payload, timezone)
+    return events, not scraper.lookups_failed(source_url)
+
+
+class ParseStage:
+    """Runs Scraper.parse for fetched pages, inline or on a process pool.
+
+    BeautifulSoup walks and dateutil parsing hold the GIL, so threads don't
+    help; workers > 1 sends large raw payloads to a ProcessPoolExecutor and
+    returns the (picklable) Event records. workers <= 1 (the default) parses
+    inline; the pool only wins with spare cores, since each payload is
+    pickled to a worker and its events pickled back.
+    With a ``cache``, pages whose fingerprint matches the last run reuse
+    their stored events and are not parsed at all.
+    """
+
+    def __init__(
+        self,
+        workers: int = 0,
+        min_payload_chars: int = POOL_MIN_PAYLOAD_CHARS,
+        cache: Optional[ParsedPageCache] = None,
+    ) -> None:
+        self.workers = workers
+        self.min_payload_chars = min_payload_chars
+        self.cache = cache
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # The asyncio runtime submits from its executor threads.
+        self._pool_lock = threading.Lock()
+
+    def __enter__(self) -> "ParseStage":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def submit(self, scraper: Scraper, source_url: str, payload: Any, timezone: str) -> "Future[List[Event]]":
+        if self._use_pool(payload):
+            return self._submit_pooled(_parse_payload, scraper, source_url, payload, timezone)
+
+        future: "Future[List[Event]]" = Future()
+        try:
+            future.set_result(_parse_payload(scraper, source_url, payload, timezone))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    def _submit_pooled(self, parse: Callable[..., T], scraper: Scraper, source_url: str, payload: Any, timezone: str) -> "Future[T]":
+        scraper.prepare_parse(source_url, payload)
+        with self._pool_lock:
+            if self._pool is None:
+                cpus = os.cpu_count() or 1
+                if self.workers > cpus:
+                    logger.warning(
+                        f"parse_workers={self.workers} exceeds {cpus} CPU(s); pooled parsing will be slower than inline"
+                    )
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool.submit(parse, scraper, source_url, payload, timezone)
+
+    def iter_events(self, scraper: Scraper, pages: Iterable[RawPage], timezone: str) -> Iterator[Event]:
+        """Parse a stream of pages, yielding events in page order.
+
+        Inline pages stream row by row. Pooled pages are submitted as they
+        arrive so the next page is fetched while workers parse earlier ones.
+        """
+        pending: Deque["Future[Tuple[List[Event], bool]]"] = deque()
+        for source_url, payload in pages:
+            fingerprint, cached = self._cached(scraper, source_url, payload, timezone)
+            if cached is not None:
+                while pending:
+                    yield from self._result(pending.popleft())
+                yield from cached
+                continue
+            if self._use_pool(payload):
+                future = self._submit_pooled(_parse_cacheable, scraper, source_url, payload, timezone)
+                if fingerprint:
+                    future.add_done_callback(
+                        lambda done, url=source_url, fp=fingerprint: self._store(scraper, url, timezone, fp, done)
+                    )
+                pending.append(future)
+                continue
+            while pending:
+                yield from self._result(pending.popleft())
+            # Inline parsing streams rows, so this span also covers whatever
+            # the consumer does with each event before asking for the next.
+            stage = f"parse {scraper.__class__.__name__}"
+            parsed: List[Event] = []
+            with span("parse", url=source_url), profile_stage(stage), memory_stage(stage):
+                for event in scraper.iter_parse(source_url, payload, timezone):
+                    parsed.append(event)
+                    yield event
+            if fingerprint and not scraper.lookups_failed(source_url):
+                self.cache.put(scraper, source_url, timezone, fingerprint, parsed)
+        while pending:
+            yield from self._result(pending.popleft())
+
+    async def parse_async(self, scraper: Any, source_url: str, payload: Any, timezone: str) -> List[Event]:
+        """Parse one page for the asyncio runtime without blocking its loop.
+
+        Pool-sized payloads go to the process pool as usual; the rest parse
+        on the loop's executor threads, since parsers may also fetch pages.
+        """
+        fingerprint, cached = self._cached(scraper, source_url, payload, timezone)
+        if cached is not None:
+            return cached
+        if self._use_pool(payload):
+            with span("parse wait", url=source_url):
+                # prepare_parse() may prime the scraper's shared lookups over HTTP.
+                future = await asyncio.to_thread(
+                    self._submit_pooled, _parse_cacheable, scraper, source_url, payload, timezone
+                )
+                events, cacheable = await asyncio.wrap_future(future)
+        else:
+            events = await asyncio.to_thread(self._parse_inline, scraper, source_url, payload, timezone)
+            cacheable = not scraper.lookups_failed(source_url)
+        if fingerprint and cacheable:
+            self.cache.put(scraper, source_url, timezone, fingerprint, events)
+        return events
+
+    def _cached(self, scraper: Any, source_url: str, payload: Any, timezone: str) -> Tuple[Optional[str], Optional[List[Event]]]:
+        """(fingerprint, stored events if it matches last run's)."""
+        if self.cache is None:
+            return None, None
+        with span("parse cached", url=source_url):
+            fingerprint = self.cache.fingerprint(scraper, payload)
+            if fingerprint is None:
+                return None, None
+            return fingerprint, self.cache.get(scraper, source_url, timezone, fingerprint)
+
+    def _store(
+        self, scraper: Any, source_url: str, timezone: str, fingerprint: str, future: "Future[Tuple[List[Event], bool]]"
+    ) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        events, cacheable = future.result()
+        if cacheable:
+            self.cache.put(scraper, source_url, timezone, fingerprint, events)
+
+    def _parse_inline(self, scraper: Any, source_url: str, payload: Any, timezone: str) -> List[Event]:
+        stage = f"parse {scraper.__class__.__name__}"
+        with span("parse", url=source_url), profile_stage(stage):
+            return _parse_payload(scraper, source_url, payload, timezone)
+
+    def _result(self, future: "Future[Tuple[List[Event], bool]]") -> List[Event]:
+        with span("parse wait"):
+            return future.result()[0]
+
+    def shrink(self) -> int:
+        """Halve the worker count; the pool is rebuilt at the new size on next use."""
+        self.workers = max(1, self.workers // 2)
+        self.close()
+        return self.workers
+
+    def close(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def _use_pool(self, payload: Any) -> bool:
+        if PROFILER.enabled:
+            # Parsing in worker processes would hide it from the profile.
+            return False
+        return self.workers > 1 and isinstance(payload, str) and len(payload) >= self.min_payload_chars
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+import cProfile
+import io
+import pstats
+import re
+import sys
+import threading
+
+
+_NO_STAGE = nullcontext()
+TOP_HOTSPOTS = 15
+
+
+class StageProfiler:
+    """cProfile per pipeline stage ("scrape ErieMetroScraper", "build_ics", ...).
+
+    Only the innermost stage on a thread is profiled at any moment: entering
+    a nested stage pauses the outer one, so every stage's profile holds the
+    time spent in its own code (for streaming stages that includes the
+    consumer's per-event work between rows). Calls on other threads (the
+    stand-in sites, Erie's browser helper thread) and in parse-pool
+    processes are not seen; profiled runs parse inline for that reason.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._profiles: Dict[Tuple[str, int], cProfile.Profile] = {}
+        self._calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+            self._calls.clear()
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NO_STAGE
+        return self._stage(name)
+
+    @contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        stack: List[cProfile.Profile] = self._local.__dict__.setdefault("stack", [])
+        with self._lock:
+            # cProfile tracks one thread's call stack, so each thread gets its
+            # own profile per stage; they are merged when dumped.
+            profile = self._profiles.setdefault((name, threading.get_ident()), cProfile.Profile())
+            self._calls[name] = self._calls.get(name, 0) + 1
+        if stack:
+            stack[-1].disable()
+        stack.append(profile)
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            # A generator closed out of order may not be on top; drop its
+            # last entry wherever it is and resume whatever is now innermost.
+            for i in range(len(stack) - 1, -1, -1):
+                if stack[i] is profile:
+                    del stack[i]
+                    break
+            if stack:
+                stack[-1].enable()
+
+    def stats(self) -> Dict[str, pstats.Stats]:
+        merged: Dict[str, pstats.Stats] = {}
+        with self._lock:
+            profiles = list(self._profiles.items())
+        for (name, _), profile in profiles:
+            if name in merged:
+                merged[name].add(profile)
+            else:
+                merged[name] = pstats.Stats(profile)
+        return merged
+
+    def dump(self, directory: Path, top: int = TOP_HOTSPOTS, out: Optional[TextIO] = None) -> List[Path]:
+        """Write one .prof file per stage and print each stage's top hotspots.
+
+        The files load with ``python -m pstats`` or snakeviz.
+        """
+        out = out or sys.stdout
+        directory.mkdir(parents=True, exist_ok=True)
+        paths: List[Path] = []
+        stats = self.stats()
+        for name in sorted(stats, key=lambda n: -stats[n].total_tt):
+            stage_stats = stats[name]
+            path = directory / f"{_slug(name)}.prof"
+            stage_stats.dump_stats(str(path))
+            paths.append(path)
+
+            buffer = io.StringIO()
+            stage_stats.stream = buffer
+            stage_stats.sort_stats("tottime").print_stats(top)
+            out.write(f"\n=== {name}: {self._calls.get(name, 0)} call(s), {stage_stats.total_tt:.3f}s -> {path}\n")
+            # Skip pstats' preamble (file name and totals) and keep the table.
+            table = buffer.getvalue()
+            out.write(table[table.find("   ncalls"):] if "   ncalls" in table else table)
+        return paths
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", name).strip("-") or "stage"
+
+
+PROFILER = StageProfiler()
+
+
+def profile_stage(name: str):
+    """``with profile_stage("build_ics"):`` — free when profiling is off."""
+    return PROFILER.stage(name)
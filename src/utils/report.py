@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+import pytz
+
+from src.utils.state import state_path, write_json
+
+
+REPORT_PATH = state_path("run-report.json")
+
+
+class RunReport:
+    """Per-run summary (feed changes, timings, warnings) written as JSON."""
+
+    def __init__(self) -> None:
+        self.started_at = datetime.now(pytz.UTC)
+        self.sections: Dict[str, Any] = {}
+
+    def section(self, name: str) -> Dict[str, Any]:
+        return self.sections.setdefault(name, {})
+
+    def write(self, path: Path = REPORT_PATH) -> None:
+        write_json(
+            path,
+            {
+                "started_at": self.started_at.isoformat(),
+                "finished_at": datetime.now(pytz.UTC).isoformat(),
+                **self.sections,
+            },
+        )
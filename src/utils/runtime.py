@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Iterator, Optional, TypeVar
+import asyncio
+import threading
+
+
+T = TypeVar("T")
+EXECUTOR_WORKERS = 16
+
+
+class AsyncRuntime:
+    """One asyncio event loop for every async scraper, on a thread of its own.
+
+    The build and the daemon stay synchronous; they hand coroutines to the
+    loop with ``run()`` and stream async generators back with
+    ``iterate()``. Because every scrape shares this loop, Playwright's async
+    browser and per-run indexes can be shared too, and no scraper needs
+    ``asyncio.run`` (which fails inside an already running loop). The
+    loop's default executor is a thread pool sized for blocking ``requests``
+    calls and parsing, so ``asyncio.to_thread`` offloads to it.
+    """
+
+    def __init__(self, workers: int = EXECUTOR_WORKERS) -> None:
+        self.workers = workers
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._start()
+            return self._loop
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scrape-io")
+        loop.set_default_executor(self._executor)
+        ready = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="scrape-loop", daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine on the loop and block this thread for its result."""
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("AsyncRuntime.run() called from its own loop; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def iterate(self, agen: AsyncIterator[T]) -> Iterator[T]:
+        """Stream an async generator into synchronous code, one item at a time.
+
+        Closing the returned iterator early closes the async generator on
+        the loop, so its cleanup (cancelling scrape tasks, closing pages)
+        still runs.
+        """
+        try:
+            while True:
+                try:
+                    item = self.run(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            aclose = getattr(agen, "aclose", None)
+            if aclose is not None and self._loop is not None:
+                self.run(aclose())
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+            executor, self._executor = self._executor, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(_cancel_tasks(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+        executor.shutdown(wait=True)
+
+
+async def _cancel_tasks() -> None:
+    current = asyncio.current_task()
+    tasks = [task for task in asyncio.all_tasks() if task is not current]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from hashlib import sha256
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dateutil import parser as dateparser
+import pytz
+
+from src.utils.events import Event, localize
+from src.utils.state import load_json, state_path, write_json
+
+
+SHARD_DIR = state_path("shards")
+# Builds run twice a day; a manifest older than this is left over from an
+# earlier run whose shard failed this time.
+MAX_SHARD_AGE = timedelta(hours=6)
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """"2/4" -> (2, 4); shards are numbered from 0."""
+    index, sep, count = spec.partition("/")
+    if not sep or not index.isdigit() or not count.isdigit():
+        raise ValueError(f"Shard must look like i/n, got {spec!r}")
+    index_i, count_i = int(index), int(count)
+    if count_i < 1 or not 0 <= index_i < count_i:
+        raise ValueError(f"Shard index must be in 0..{count_i - 1}, got {spec!r}")
+    return index_i, count_i
+
+
+def shard_of(team_id: str, count: int) -> int:
+    # A stable hash (not hash(), which is salted per process) so every job
+    # agrees on the partition without coordinating.
+    return int(sha256(team_id.encode("utf-8")).hexdigest(), 16) % count
+
+
+def shard_manifest_path(index: int, count: int, shard_dir: Path = SHARD_DIR) -> Path:
+    return shard_dir / f"shard-{index}-of-{count}.json"
+
+
+def event_to_dict(ev: Event) -> dict:
+    data = asdict(ev)
+    data["start"] = ev.start.isoformat()
+    data["end"] = ev.end.isoformat()
+    return data
+
+
+def event_from_dict(data: dict) -> Event:
+    tz = data["timezone"]
+    return Event(
+        **{
+            **data,
+            "start": localize(dateparser.isoparse(data["start"]), tz),
+            "end": localize(dateparser.isoparse(data["end"]), tz),
+        }
+    )
+
+
+def write_shard_manifest(
+    index: int,
+    count: int,
+    started_at: str,
+    teams: Dict[str, dict],
+    feeds: Dict[str, dict],
+    shard_dir: Path = SHARD_DIR,
+    run_id: Optional[str] = None,
+) -> Path:
+    """Record what one shard built: its teams' stored events and its feed entries.
+
+    The events let the merge step rebuild combined feeds and conflicts even
+    when shards ran on different machines with separate event stores.
+    """
+    path = shard_manifest_path(index, count, shard_dir)
+    write_json(
+        path,
+        {"shard": index, "of": count, "run_id": run_id, "started_at": started_at, "teams": teams, "feeds": feeds},
+    )
+    return path
+
+
+def load_shard_manifests(
+    count: int,
+    shard_dir: Path = SHARD_DIR,
+    run_id: Optional[str] = None,
+    max_age: timedelta = MAX_SHARD_AGE,
+    now: Optional[datetime] = None,
+) -> List[dict]:
+    """Every shard's manifest, all from this run.
+
+    A manifest written under another ``run_id`` (when one is given) or
+    started more than ``max_age`` ago is rejected like a missing one, so a
+    failed shard can't slip its previous run's events into the site.
+    """
+    now = now or datetime.now(pytz.UTC)
+    manifests = []
+    missing = []
+    stale = []
+    for index in range(count):
+        data = load_json(shard_manifest_path(index, count, shard_dir))
+        if data is None:
+            missing.append(f"{index}/{count}")
+        elif (run_id is not None and data.get("run_id") != run_id) or (
+            now - dateparser.isoparse(data["started_at"]) > max_age
+        ):
+            stale.append(f"{index}/{count} (run {data.get('run_id')}, started {data['started_at']})")
+        else:
+            manifests.append(data)
+    if missing:
+        raise FileNotFoundError(f"Missing shard manifests for {', '.join(missing)} in {shard_dir}")
+    if stale:
+        raise ValueError(f"Stale shard manifests for {', '.join(stale)} in {shard_dir}")
+    return manifests
+
+
+def remove_shard_manifests(count: int, shard_dir: Path = SHARD_DIR) -> None:
+    """Drop merged manifests so the next merge can only see fresh ones."""
+    for index in range(count):
+        shard_manifest_path(index, count, shard_dir).unlink(missing_ok=True)
+
+
+def shard_events(entry: dict) -> Iterable[Event]:
+    return (event_from_dict(data) for data in entry.get("events", []))
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+import json
+import os
+
+
+# Run-to-run state that is not published (browser sessions, caches, build
+# bookkeeping) lives here. It is git-ignored; CI persists it with actions/cache.
+STATE_DIR = Path(".cache")
+
+
+def state_path(name: str) -> Path:
+    return STATE_DIR / name
+
+
+def load_json(path: Path, default: Any = None) -> Any:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path: Path, data: Any) -> None:
+    # Write to a sibling temp file and rename so a crash mid-write never leaves
+    # a truncated state file behind for the next run to choke on.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True, default=str)
+    os.replace(tmp, path)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+import sqlite3
+
+import pytz
+
+from src.utils.events import Event
+from src.utils.state import state_path
+
+
+DEFAULT_STORE_PATH = state_path("events.sqlite3")
+# Second precision, always UTC, so the TEXT columns sort chronologically.
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    team_id TEXT NOT NULL,
+    season_id TEXT NOT NULL,
+    uid TEXT NOT NULL,
+    external_id TEXT,
+    summary TEXT NOT NULL,
+    start_utc TEXT NOT NULL,
+    end_utc TEXT NOT NULL,
+    timezone TEXT NOT NULL,
+    location TEXT,
+    description TEXT,
+    source_url TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (team_id, uid)
+);
+CREATE INDEX IF NOT EXISTS idx_events_team_start ON events (team_id, start_utc);
+CREATE INDEX IF NOT EXISTS idx_events_season_start ON events (season_id, start_utc);
+CREATE INDEX IF NOT EXISTS idx_events_start ON events (start_utc);
+CREATE INDEX IF NOT EXISTS idx_events_external_id ON events (external_id);
+"""
+
+EVENT_COLUMNS = "summary, start_utc, end_utc, timezone, location, description, source_url, external_id"
+
+
+def _to_utc_text(dt: datetime) -> str:
+    return dt.astimezone(pytz.UTC).strftime(TIMESTAMP_FORMAT)
+
+
+def _from_utc_text(text: str, tz_name: str) -> datetime:
+    dt = pytz.UTC.localize(datetime.strptime(text, TIMESTAMP_FORMAT))
+    return dt.astimezone(pytz.timezone(tz_name))
+
+
+def _row_to_event(row: sqlite3.Row) -> Event:
+    return Event(
+        summary=row["summary"],
+        start=_from_utc_text(row["start_utc"], row["timezone"]),
+        end=_from_utc_text(row["end_utc"], row["timezone"]),
+        timezone=row["timezone"],
+        location=row["location"],
+        description=row["description"],
+        source_url=row["source_url"],
+        external_id=row["external_id"],
+    )
+
+
+class EventStore:
+    """SQLite-backed store of every event ever scraped, per team and season.
+
+    Feeds are rendered from here rather than straight from a scrape, so games
+    that drop off a site's schedule after they are played are retained.
+    """
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        # Shard builds running side by side share this file; wait out each
+        # other's write transactions instead of failing with "locked".
+        self._conn = sqlite3.connect(str(path), timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "EventStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def sync_team(self, team_id: str, season_id: str, events: Iterable[Event], seen_at: datetime) -> int:
+        """Upsert a fresh scrape of one team and drop games that vanished from it.
+
+        An event missing from this scrape is deleted only if it had not started
+        yet when it was last seen (a cancelled or rescheduled game); games seen
+        after their start time are kept, since sites routinely drop played
+        games. Returns the number of events upserted; when that is zero (a
+        failed scrape) nothing is deleted.
+        """
+        seen = _to_utc_text(seen_at)
+        with self._conn:
+            cursor = self._conn.executemany(
+                """
+                INSERT INTO events (
+                    team_id, season_id, uid, external_id, summary, start_utc, end_utc,
+                    timezone, location, description, source_url, first_seen, last_seen
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (team_id, uid) DO UPDATE SET
+                    season_id = excluded.season_id,
+                    external_id = excluded.external_id,
+                    summary = excluded.summary,
+                    start_utc = excluded.start_utc,
+                    end_utc = excluded.end_utc,
+                    timezone = excluded.timezone,
+                    location = excluded.location,
+                    description = excluded.description,
+                    source_url = excluded.source_url,
+                    last_seen = excluded.last_seen
+                """,
+                (
+                    (
+                        team_id, season_id, ev.google_event_id(), ev.external_id, ev.summary,
+                        _to_utc_text(ev.start), _to_utc_text(ev.end), ev.timezone, ev.location,
+                        ev.description, ev.source_url, seen, seen,
+                    )
+                    for ev in events
+                ),
+            )
+            upserted = cursor.rowcount
+            if upserted > 0:
+                self._conn.execute(
+                    "DELETE FROM events WHERE team_id = ? AND last_seen < ? AND start_utc >= last_seen",
+                    (team_id, seen),
+                )
+        return upserted
+
+    def events_for_team(self, team_id: str) -> Iterator[Event]:
+        yield from self._query("WHERE team_id = ?", (team_id,))
+
+    def events_for_season(self, season_id: str) -> Iterator[Event]:
+        yield from self._query("WHERE season_id = ?", (season_id,))
+
+    def events_between(self, start: datetime, end: datetime, team_id: Optional[str] = None) -> Iterator[Event]:
+        where = "WHERE start_utc >= ? AND start_utc < ?"
+        params: tuple = (_to_utc_text(start), _to_utc_text(end))
+        if team_id is not None:
+            where += " AND team_id = ?"
+            params += (team_id,)
+        yield from self._query(where, params)
+
+    def find_external_id(self, external_id: str) -> Iterator[Event]:
+        yield from self._query("WHERE external_id = ?", (external_id,))
+
+    def _query(self, where: str, params: tuple) -> Iterator[Event]:
+        cursor = self._conn.execute(
+            f"SELECT {EVENT_COLUMNS} FROM events {where} ORDER BY start_utc, uid",
+            params,
+        )
+        for row in cursor:
+            yield _row_to_event(row)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, List
+import json
+import os
+import threading
+import time
+
+
+# One shared no-op context: a disabled span is an attribute check and a
+# return, with nothing allocated per call.
+_NO_SPAN = nullcontext()
+MAX_EVENTS = 1_000_000
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start_ns")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: Dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start_ns = 0
+
+    def __enter__(self) -> "_Span":
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.record(self.name, self.cat, self.start_ns, end_ns, self.args)
+
+
+class Tracer:
+    """Collects spans as Chrome trace-event "complete" events.
+
+    Disabled by default; ``span()`` then hands back a shared no-op context.
+    Once enabled, every span records its thread, start and duration, and
+    ``export()`` writes JSON that Perfetto (ui.perfetto.dev) and
+    chrome://tracing open directly. Spans from parse-pool worker processes
+    are not collected; the parent's wait on them is.
+    """
+
+    def __init__(self, max_events: int = MAX_EVENTS) -> None:
+        self.enabled = False
+        self.max_events = max_events
+        self.dropped = 0
+        self._events: List[dict] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+
+    def enable(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self._threads.clear()
+            self.dropped = 0
+            self._origin_ns = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def span(self, name: str, cat: str = "run", **args: Any):
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name, cat, args)
+
+    def record(self, name: str, cat: str, start_ns: int, end_ns: int, args: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        tid = threading.get_native_id()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start_ns - self._origin_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": os.getpid(),
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            if len(self._events) >= self.max_events:
+                self.dropped += 1
+                return
+            self._events.append(event)
+            self._threads.setdefault(tid, thread.name)
+
+    def events(self) -> List[dict]:
+        with self._lock:
+            return list(self._events)
+
+    def export(self, path: Path) -> Path:
+        pid = os.getpid()
+        with self._lock:
+            metadata = [
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self._threads.items()
+            ]
+            events = sorted(self._events, key=lambda e: e["ts"])
+        data = {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped},
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(data, f, default=str, separators=(",", ":"))
+        os.replace(tmp, path)
+        return path
+
+
+TRACER = Tracer()
+
+
+def span(name: str, cat: str = "run", **args: Any):
+    """``with span("goto", url=url):`` — free when tracing is off."""
+    if not TRACER.enabled:
+        return _NO_SPAN
+    return _Span(TRACER, name, cat, args)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import unittest
+
+import pytz
+
+from src.utils.aggregate import merge_sorted_events
+from src.utils.events import Event
+
+
+TZ = pytz.timezone("America/New_York")
+
+
+def game(game_id: int, day: int, hour: int = 19, location: str = "Rink 2") -> Event:
+    start = TZ.localize(datetime(2026, 6, day, hour, 15))
+    return Event(
+        summary=f"Game {game_id}",
+        start=start,
+        end=start + timedelta(minutes=75),
+        timezone="America/New_York",
+        location=location,
+        external_id=f"game-{game_id}",
+    )
+
+
+class AggregateFeedTests(unittest.TestCase):
+    def test_merges_sorted_streams_and_dedupes_shared_games(self) -> None:
+        retrievers = [game(1, 3), game(3, 10), game(5, 17)]
+        realty = [game(2, 4), game(3, 10), game(4, 12, hour=21)]
+
+        merged = list(merge_sorted_events([iter(retrievers), iter(realty)]))
+
+        self.assertEqual([ev.external_id for ev in merged], ["game-1", "game-2", "game-3", "game-4", "game-5"])
+
+    def test_location_filter(self) -> None:
+        streams = [[game(1, 3), game(2, 5, location="Riverside Rink")], [game(3, 4, location="rink 2")]]
+
+        merged = list(merge_sorted_events(streams, location="Rink 2"))
+
+        self.assertEqual([ev.external_id for ev in merged], ["game-1", "game-3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Iterator, List
+from unittest import mock
+import asyncio
+import unittest
+
+import pytz
+
+from src.config import AppConfig
+from src.main import ScrapeResources, iter_events
+from src.scrapers.base import AsyncScraper, RawPage
+from src.utils.events import Event
+from src.utils.parsing import ParseStage
+from src.utils.runtime import AsyncRuntime
+
+
+TZ = "America/New_York"
+START = pytz.timezone(TZ).localize(datetime(2026, 4, 27, 19, 15))
+
+
+class _SlowScraper(AsyncScraper):
+    """Pages take DELAYS[url] seconds to fetch; tracks how many overlap."""
+
+    DELAYS: Dict[str, float] = {}
+    active = 0
+    peak = 0
+
+    def can_handle(self, url: str) -> bool:
+        return url.startswith("https://slow.example/")
+
+    async def aiter_pages(self, url: str, timezone: str) -> AsyncIterator[RawPage]:
+        cls = type(self)
+        cls.active += 1
+        cls.peak = max(cls.peak, cls.active)
+        try:
+            await asyncio.sleep(self.DELAYS[url])
+        finally:
+            cls.active -= 1
+        if url.endswith("/broken"):
+            raise RuntimeError("site down")
+        for page in range(2):
+            yield (f"{url}#{page}", page)
+
+    def iter_parse(self, source_url: str, payload: int, timezone: str) -> Iterator[Event]:
+        yield Event(
+            summary=source_url,
+            start=START + timedelta(hours=payload),
+            end=START + timedelta(hours=payload + 1),
+            timezone=timezone,
+            external_id=source_url,
+        )
+
+
+class AsyncRuntimeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _SlowScraper.active = _SlowScraper.peak = 0
+        self.resources = ScrapeResources()
+        self.resources.start_run(AppConfig(runtime={"mode": "asyncio", "max_concurrency": 2}))
+        self.addCleanup(self.resources.close)
+        patch = mock.patch.object(ScrapeResources, "async_scrapers", lambda self, team_name: [_SlowScraper()])
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_urls_scrape_concurrently_and_stream_in_url_order(self) -> None:
+        urls = [f"https://slow.example/{name}" for name in ("a", "broken", "b", "c")]
+        _SlowScraper.DELAYS = dict(zip(urls, (0.15, 0.0, 0.05, 0.0)))
+
+        events = list(iter_events(urls + ["https://nobody.example/"], TZ, parse_stage=ParseStage(), resources=self.resources))
+
+        self.assertEqual([e.summary for e in events], [
+            f"{urls[0]}#0", f"{urls[0]}#1",
+            f"{urls[2]}#0", f"{urls[2]}#1",
+            f"{urls[3]}#0", f"{urls[3]}#1",
+        ])
+        self.assertEqual(_SlowScraper.peak, 2)
+
+    def test_prefetched_streams_are_picked_up_by_iter_events(self) -> None:
+        urls = ["https://slow.example/a"]
+        _SlowScraper.DELAYS = {urls[0]: 0.0}
+        parse_stage = ParseStage()
+
+        self.resources.prefetch(urls, TZ, "Team A", parse_stage)
+        self.assertEqual(len(self.resources._prefetched), 1)
+        events = list(iter_events(urls, TZ, team_name="Team A", parse_stage=parse_stage, resources=self.resources))
+
+        self.assertEqual(len(events), 2)
+        self.assertEqual(self.resources._prefetched, {})
+
+    def test_prefetch_runs_at_most_max_concurrency_teams_ahead(self) -> None:
+        teams = {f"Team {name}": [f"https://slow.example/{name}"] for name in "abcd"}
+        _SlowScraper.DELAYS = {urls[0]: 0.0 for urls in teams.values()}
+        parse_stage = ParseStage()
+
+        for name, urls in teams.items():
+            self.resources.prefetch(urls, TZ, name, parse_stage)
+        self.assertEqual([key[0] for key in self.resources._prefetched], ["Team a", "Team b"])
+        self.assertEqual([key[0] for key in self.resources._prefetch_queue], ["Team c", "Team d"])
+
+        events = list(iter_events(teams["Team a"], TZ, team_name="Team a", parse_stage=parse_stage, resources=self.resources))
+        self.assertEqual(len(events), 2)
+        self.assertEqual([key[0] for key in self.resources._prefetched], ["Team b", "Team c"])
+        self.assertEqual([key[0] for key in self.resources._prefetch_queue], ["Team d"])
+
+    def test_closing_the_iterator_closes_the_async_generator(self) -> None:
+        runtime = AsyncRuntime(workers=1)
+        self.addCleanup(runtime.close)
+        closed: List[bool] = []
+
+        async def numbers() -> AsyncIterator[int]:
+            try:
+                for n in range(10):
+                    yield n
+            finally:
+                closed.append(True)
+
+        items = runtime.iterate(numbers())
+        self.assertEqual([next(items), next(items)], [0, 1])
+        items.close()
+
+        self.assertEqual(closed, [True])
+        self.assertEqual(runtime.run(asyncio.sleep(0, result="done")), "done")
+
+
+if __name__ == "__main__":
+    unittest.main()
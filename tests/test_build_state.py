@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import tempfile
+import unittest
+
+import pytz
+
+from src.config import AppConfig, Season, Team
+from src.utils.build_state import BuildState, output_fingerprint, team_fingerprint
+
+
+NOW = datetime(2026, 10, 19, 15, 0, tzinfo=pytz.UTC)
+INTERVAL = timedelta(hours=12)
+
+
+class BuildStateTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.team = Team(id="golden-retrievers", name="Golden Retrievers", urls=["https://www.rinksatharborcenter.com/stats#/1367/team/681628/schedule"])
+        self.season = Season(id="summer-2026", name="Summer 2026", teams=[self.team])
+        self.config = AppConfig(seasons=[self.season])
+        self.feed = self.dir / "golden-retrievers-summer-2026.ics"
+        self.feed.write_bytes(b"BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def reason(self, state: BuildState, config: AppConfig, now: datetime = NOW):
+        season = config.seasons[0]
+        return state.rebuild_reason(
+            self.team.id,
+            team_fingerprint(config, season, season.teams[0]),
+            output_fingerprint([self.feed]),
+            now,
+            INTERVAL,
+        )
+
+    def test_skips_only_unchanged_teams_that_are_not_due(self) -> None:
+        state = BuildState(self.dir / "build-state.json")
+        self.assertEqual(self.reason(state, self.config), "new")
+
+        state.record(self.team.id, team_fingerprint(self.config, self.season, self.team), output_fingerprint([self.feed]), NOW)
+        state.save()
+        state = BuildState(self.dir / "build-state.json")
+        self.assertIsNone(self.reason(state, self.config, NOW + timedelta(hours=1)))
+        # Due slightly early so a cron run a few minutes ahead still refreshes.
+        self.assertEqual(self.reason(state, self.config, NOW + INTERVAL - timedelta(minutes=5)), "due")
+
+        moved = self.config.model_copy(deep=True)
+        moved.seasons[0].teams[0].urls = ["https://www.rinksatharborcenter.com/stats#/1367/team/1/schedule"]
+        self.assertEqual(self.reason(state, moved), "config changed")
+
+        self.feed.write_bytes(b"edited by hand")
+        self.assertEqual(self.reason(state, self.config), "output changed")
+
+
+if __name__ == "__main__":
+    unittest.main()
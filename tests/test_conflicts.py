@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import unittest
+
+import pytz
+
+from src.utils.conflicts import find_conflicts
+from src.utils.events import Event
+
+
+TZ = pytz.timezone("America/New_York")
+
+
+def game(game_id: str, day: int, hour: int, minute: int = 0) -> Event:
+    start = TZ.localize(datetime(2026, 6, day, hour, minute))
+    return Event(
+        summary=f"Game {game_id}",
+        start=start,
+        end=start + timedelta(minutes=75),
+        timezone="America/New_York",
+        external_id=game_id,
+    )
+
+
+class ConflictTests(unittest.TestCase):
+    def test_reports_overlaps_and_tight_turnarounds_across_teams(self) -> None:
+        schedule = sorted(
+            [
+                ("Golden Retrievers", game("gr-1", 3, 19)),
+                ("716 Realty Group", game("rg-1", 3, 20)),  # overlaps gr-1
+                ("Golden Retrievers", game("gr-2", 5, 19)),
+                ("716 Realty Group", game("rg-2", 5, 20, 35)),  # 20 min after gr-2 ends
+                ("716 Realty Group", game("rg-3", 7, 19)),
+                ("Golden Retrievers", game("gr-3", 7, 21)),  # 45 min gap: fine
+                ("Golden Retrievers", game("gr-4", 9, 19)),
+                ("Golden Retrievers", game("gr-5", 9, 20)),  # same team: not a conflict
+                ("Golden Retrievers", game("shared", 11, 19)),
+                ("716 Realty Group", game("shared", 11, 19)),  # teams play each other
+            ],
+            key=lambda pair: pair[1].start,
+        )
+
+        conflicts = find_conflicts(schedule, timedelta(minutes=30))
+
+        self.assertEqual(
+            [(c.kind, c.gap_minutes, c.first.external_id, c.second.external_id) for c in conflicts],
+            [("overlap", -15, "gr-1", "rg-1"), ("tight", 20, "gr-2", "rg-2")],
+        )
+        self.assertTrue(conflicts[0].to_event().summary.startswith("Conflict (Overlap)"))
+
+
+if __name__ == "__main__":
+    unittest.main()
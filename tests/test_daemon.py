@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from src.config import load_config
+from src.daemon import UNHEALTHY_AFTER_FAILURES, ScrapeDaemon
+from src.main import ScrapeResources
+from src.utils.store import EventStore
+
+
+CONFIG = """
+timezone: America/New_York
+refresh_interval_minutes: 60
+daemon:
+  jitter: 0.1
+seasons:
+  - id: summer-2026
+    name: Summer 2026
+    teams:
+      - id: golden-retrievers
+        name: Golden Retrievers
+        urls: ["https://www.eriemetrosports.com/schedule/team_instance/1"]
+      - id: 716-realty-group
+        name: 716 Realty Group
+        refresh_interval_minutes: 30
+        urls: ["https://www.eriemetrosports.com/schedule/team_instance/2"]
+"""
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_780_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ScrapeDaemonTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        tmp = Path(self._tmp.name)
+        self.config_path = tmp / "config.yaml"
+        self.config_path.write_text(CONFIG, encoding="utf-8")
+        self.status_path = tmp / "daemon-status.json"
+        self.clock = FakeClock()
+        self.daemon = ScrapeDaemon(
+            config_path=self.config_path,
+            status_path=self.status_path,
+            store=EventStore(tmp / "events.sqlite3"),
+            resources=ScrapeResources(),
+            clock=self.clock,
+            rng=random.Random(7),
+        )
+
+        self.refreshed = []
+        self.events_per_refresh = 5
+
+        def fake_refresh(config, season, team, *args, **kwargs):
+            self.refreshed.append(team.id)
+            return self.events_per_refresh
+
+        patches = [
+            patch("src.daemon.refresh_team", side_effect=fake_refresh),
+            patch("src.daemon.publish_site"),
+            patch("src.daemon.RunReport.write"),
+        ]
+        self.publish_site = patches[1].start()
+        for p in (patches[0], patches[2]):
+            p.start()
+        for p in patches:
+            self.addCleanup(p.stop)
+
+    def tearDown(self) -> None:
+        self.daemon.close()
+        self._tmp.cleanup()
+
+    def test_teams_refresh_on_their_own_jittered_intervals(self) -> None:
+        self.daemon.tick()
+        first = {team_id: entry.next_due - self.clock.now for team_id, entry in self.daemon.schedule.items()}
+        # The first round is spread over the jitter window, not run at once.
+        self.assertEqual(self.refreshed, [])
+        self.assertLessEqual(first["golden-retrievers"], 0.1 * 3600)
+        self.assertLessEqual(first["716-realty-group"], 0.1 * 1800)
+
+        self.clock.now += 600
+        self.daemon.tick()
+        self.assertCountEqual(self.refreshed, ["golden-retrievers", "716-realty-group"])
+        self.publish_site.assert_called_once()
+
+        gaps = {team_id: entry.next_due - self.clock.now for team_id, entry in self.daemon.schedule.items()}
+        self.assertTrue(0.9 * 3600 <= gaps["golden-retrievers"] <= 1.1 * 3600)
+        self.assertTrue(0.9 * 1800 <= gaps["716-realty-group"] <= 1.1 * 1800)
+
+        self.refreshed.clear()
+        self.clock.now += 1.1 * 1800
+        self.daemon.tick()
+        self.assertEqual(self.refreshed, ["716-realty-group"])
+
+    def test_config_is_reloaded_only_when_it_changes(self) -> None:
+        with patch("src.daemon.load_config", wraps=load_config) as load:
+            self.daemon.tick()
+            self.daemon.tick()
+            self.assertEqual(load.call_count, 1)
+
+            self.config_path.write_text(CONFIG.replace("      - id: 716-realty-group", "      - id: 716-realty-group\n        active: false"), encoding="utf-8")
+            stat = self.config_path.stat()
+            os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.daemon.tick()
+            self.assertEqual(load.call_count, 2)
+        self.assertEqual(list(self.daemon.schedule), ["golden-retrievers"])
+
+        self.config_path.write_text("seasons: [not-a-season]", encoding="utf-8")
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000))
+        self.daemon.tick()
+        status = json.loads(self.status_path.read_text(encoding="utf-8"))
+        self.assertFalse(status["healthy"])
+        self.assertIsNotNone(status["config"]["error"])
+        # The last good config keeps running.
+        self.assertEqual(list(self.daemon.schedule), ["golden-retrievers"])
+
+    def test_status_turns_unhealthy_after_repeated_empty_refreshes(self) -> None:
+        self.events_per_refresh = 0
+        self.daemon.tick()
+        for _ in range(UNHEALTHY_AFTER_FAILURES):
+            self.clock.now += 2 * 3600
+            self.daemon.tick()
+
+        status = json.loads(self.status_path.read_text(encoding="utf-8"))
+        self.assertFalse(status["healthy"])
+        self.assertEqual(status["teams"]["golden-retrievers"]["consecutive_failures"], UNHEALTHY_AFTER_FAILURES)
+        self.assertEqual(status["teams"]["golden-retrievers"]["runs"], UNHEALTHY_AFTER_FAILURES)
+
+    def test_failed_publish_is_reported_and_the_daemon_keeps_ticking(self) -> None:
+        self.daemon.tick()
+        self.clock.now += 2 * 3600
+        self.publish_site.side_effect = OSError("No space left on device")
+        self.daemon.tick()
+
+        status = json.loads(self.status_path.read_text(encoding="utf-8"))
+        self.assertFalse(status["healthy"])
+        self.assertEqual(status["publish_error"], "No space left on device")
+        self.assertIsNone(status["last_published"])
+
+        self.refreshed.clear()
+        self.publish_site.side_effect = None
+        self.clock.now += 2 * 3600
+        self.daemon.tick()
+
+        status = json.loads(self.status_path.read_text(encoding="utf-8"))
+        self.assertCountEqual(self.refreshed, ["golden-retrievers", "716-realty-group"])
+        self.assertTrue(status["healthy"])
+        self.assertIsNone(status["publish_error"])
+        self.assertIsNotNone(status["last_published"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.scrapers.erie_metro import ErieMetroScraper
+
+
+class ErieMetroSessionStateTests(unittest.TestCase):
+    def test_rejected_session_state_is_discarded_and_cold_session_used(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            state = Path(tmp) / "state.json"
+            state.write_text("{}", encoding="utf-8")
+            scraper = ErieMetroScraper(team_name="Audubon North", session_state_path=state)
+            calls = []
+
+            async def fake_fetch(url, storage_state):
+                calls.append(storage_state)
+                if storage_state:
+                    raise Exception("403 Forbidden")
+                return "<table></table>"
+
+            with patch.object(scraper, "_browser_fetch", side_effect=fake_fetch):
+                content = asyncio.run(scraper._scrape_with_browser("https://www.eriemetrosports.com/x"))
+
+            self.assertEqual(content, "<table></table>")
+            self.assertEqual(calls, [state, None])
+            self.assertFalse(state.exists())
+
+    def test_missing_session_state_goes_straight_to_cold_session(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            scraper = ErieMetroScraper(session_state_path=Path(tmp) / "missing.json")
+            self.assertIsNone(scraper._load_session_state())
+
+
+if __name__ == "__main__":
+    unittest.main()
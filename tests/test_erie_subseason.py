@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from typing import List
+from unittest.mock import patch
+import unittest
+
+from src.scrapers.erie_metro import ErieMetroScraper, SubseasonSchedule, subseason_schedule_url
+from src.utils.parsing import ParseStage
+from tests.test_calendar_retention import GAME_PAGE_HTML, TEAM_PAGE_HTML
+
+
+TZ = "America/New_York"
+TEAM_URL = "https://www.eriemetrosports.com/schedule/team_instance/10300893?subseason=952202"
+SUBSEASON_URL = "https://www.eriemetrosports.com/schedule/subseason/952202"
+
+SUBSEASON_HTML = """
+<html><body><table>
+  <tr id="game_list_row_44577992">
+    <td>Wed Sep 17</td>
+    <td><a href="https://www.eriemetrosports.com/game/show/44577992?subseason=952202">Hammers</a></td>
+    <td>9:20 PM EDT</td>
+  </tr>
+  <tr id="game_list_row_45387197">
+    <td>Mon Apr 27</td>
+    <td><a href="https://www.eriemetrosports.com/game/show/45387197?subseason=952202">RCR Yachts</a></td>
+    <td>8:50 PM EDT</td>
+  </tr>
+</table></body></html>
+"""
+
+
+class FakeResponse:
+    def __init__(self, text: str, status_code: int = 200) -> None:
+        self.text = text
+        self.status_code = status_code
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class SubseasonScheduleTests(unittest.TestCase):
+    def scrape(self, subseason_page: FakeResponse, subseasons: SubseasonSchedule, teams: int = 1):
+        self.fetched: List[str] = []
+
+        def fake_get(url: str, *args, **kwargs):
+            self.fetched.append(url)
+            if url == SUBSEASON_URL:
+                return subseason_page
+            if "game/show/" in url:
+                return FakeResponse(GAME_PAGE_HTML)
+            return FakeResponse(TEAM_PAGE_HTML)
+
+        with patch("src.scrapers.erie_metro.requests.get", side_effect=fake_get):
+            return [
+                ErieMetroScraper(team_name="Audubon North", subseasons=subseasons).scrape(TEAM_URL, TZ)
+                for _ in range(teams)
+            ]
+
+    def test_final_rows_resolve_from_one_subseason_fetch(self) -> None:
+        subseasons = SubseasonSchedule()
+        with_index = self.scrape(FakeResponse(SUBSEASON_HTML), subseasons, teams=2)
+        index_fetches = list(self.fetched)
+        without_index = self.scrape(FakeResponse(SUBSEASON_HTML), None)
+
+        self.assertEqual(with_index[0], without_index[0])
+        self.assertEqual(with_index[1], without_index[0])
+        self.assertEqual(subseasons.fetches, 1)
+        self.assertEqual(index_fetches, [TEAM_URL, SUBSEASON_URL, TEAM_URL])
+
+    def test_unlisted_games_and_failed_fetches_fall_back_to_game_pages(self) -> None:
+        for page in (FakeResponse("<html><table></table></html>"), FakeResponse("", status_code=404)):
+            subseasons = SubseasonSchedule()
+            events = self.scrape(page, subseasons, teams=2)
+
+            completed = next(ev for ev in events[1] if "Hammers" in ev.summary)
+            self.assertEqual((completed.start.hour, completed.start.minute), (21, 20))
+            self.assertEqual(subseasons.fetches, 1)
+            self.assertEqual(self.fetched.count(SUBSEASON_URL), 1)
+            self.assertTrue(any("game/show/44577992" in url for url in self.fetched))
+
+    def test_pooled_parses_share_one_fetch_from_the_parent(self) -> None:
+        subseasons = SubseasonSchedule()
+        self.fetched = []
+
+        def fake_get(url: str, *args, **kwargs):
+            self.fetched.append(url)
+            return FakeResponse(SUBSEASON_HTML)
+
+        with patch("src.scrapers.erie_metro.requests.get", side_effect=fake_get):
+            with ParseStage(workers=2, min_payload_chars=0) as pooled:
+                futures = [
+                    pooled.submit(ErieMetroScraper(team_name="Audubon North", subseasons=subseasons), TEAM_URL, TEAM_PAGE_HTML, TZ)
+                    for _ in range(2)
+                ]
+                events = [future.result() for future in futures]
+
+        self.assertEqual(self.fetched, [SUBSEASON_URL])
+        self.assertEqual(subseasons.fetches, 1)
+        for team_events in events:
+            completed = next(ev for ev in team_events if "Hammers" in ev.summary)
+            self.assertEqual((completed.start.hour, completed.start.minute), (21, 20))
+
+    def test_schedule_url_keeps_the_page_prefix(self) -> None:
+        self.assertEqual(subseason_schedule_url(TEAM_URL, "952202"), SUBSEASON_URL)
+        self.assertEqual(
+            subseason_schedule_url("http://127.0.0.1:8000/eriemetrosports.com/schedule/team_instance/1?subseason=7", "7"),
+            "http://127.0.0.1:8000/eriemetrosports.com/schedule/subseason/7",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
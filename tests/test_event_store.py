@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import tempfile
+import unittest
+
+import pytz
+
+from src.scrapers.erie_metro import ErieMetroScraper
+from src.utils.events import Event
+from src.utils.store import EventStore
+
+
+TZ = pytz.timezone("America/New_York")
+
+
+def game(game_id: int, start: datetime, summary: str = "Golden Retrievers vs. Rivermen") -> Event:
+    return Event(
+        summary=summary,
+        start=start,
+        end=start + timedelta(minutes=75),
+        timezone="America/New_York",
+        location="Rink 2",
+        source_url="https://www.rinksatharborcenter.com/stats#/1367/team/681628/schedule",
+        external_id=f"harborcenter:game:{game_id}",
+    )
+
+
+class EventStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = EventStore(Path(self._tmp.name) / "events.sqlite3")
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_round_trips_events_in_start_order(self) -> None:
+        late = game(2, TZ.localize(datetime(2026, 6, 20, 21, 0)))
+        early = game(1, TZ.localize(datetime(2026, 6, 10, 19, 15)))
+        self.store.sync_team("gr", "summer-2026", [late, early], datetime(2026, 6, 1, tzinfo=pytz.UTC))
+
+        self.assertEqual(list(self.store.events_for_team("gr")), [early, late])
+        self.assertEqual(list(self.store.events_for_season("summer-2026")), [early, late])
+        self.assertEqual(list(self.store.find_external_id("harborcenter:game:2")), [late])
+        self.assertEqual(list(self.store.events_for_team("someone-else")), [])
+
+    def test_keeps_played_games_and_drops_cancelled_ones(self) -> None:
+        played = game(1, TZ.localize(datetime(2026, 6, 10, 19, 15)))
+        cancelled = game(2, TZ.localize(datetime(2026, 6, 30, 19, 15)))
+        upcoming = game(3, TZ.localize(datetime(2026, 7, 5, 19, 15)))
+        self.store.sync_team("gr", "summer-2026", [played, cancelled, upcoming], datetime(2026, 6, 15, tzinfo=pytz.UTC))
+
+        # Next run: the site no longer lists the played game or the cancelled one.
+        rescored = game(3, upcoming.start, summary="Golden Retrievers vs. Rivermen (2-1)")
+        self.store.sync_team("gr", "summer-2026", [rescored], datetime(2026, 7, 6, tzinfo=pytz.UTC))
+
+        self.assertEqual(list(self.store.events_for_team("gr")), [played, rescored])
+
+    def test_failed_scrape_keeps_stored_schedule(self) -> None:
+        upcoming = game(3, TZ.localize(datetime(2026, 7, 5, 19, 15)))
+        self.store.sync_team("gr", "summer-2026", [upcoming], datetime(2026, 6, 15, tzinfo=pytz.UTC))
+
+        upserted = self.store.sync_team("gr", "summer-2026", iter(()), datetime(2026, 6, 16, tzinfo=pytz.UTC))
+
+        self.assertEqual(upserted, 0)
+        self.assertEqual(list(self.store.events_for_team("gr")), [upcoming])
+
+    def test_blocked_erie_scrape_keeps_stored_schedule(self) -> None:
+        url = "https://www.eriemetrosports.com/schedule/team_instance/10300893?subseason=952202"
+        upcoming = game(3, TZ.localize(datetime(2026, 7, 5, 19, 15)))
+        self.store.sync_team("an", "summer-2026", [upcoming], datetime(2026, 6, 15, tzinfo=pytz.UTC))
+
+        # Every fetch strategy failed, so there is no page to parse.
+        blocked = ErieMetroScraper(team_name="Audubon North").parse(url, None, "America/New_York")
+        upserted = self.store.sync_team("an", "summer-2026", blocked, datetime(2026, 6, 16, tzinfo=pytz.UTC))
+
+        self.assertEqual(upserted, 0)
+        self.assertEqual(list(self.store.events_for_team("an")), [upcoming])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from typing import List
+from unittest import mock
+import unittest
+
+from src.scrapers.bond_sports import (
+    CARD_COUNT_SCRIPT,
+    BondSportsScraper,
+    advertised_total,
+    game_records_from_json,
+    has_more_pages,
+    venue_from_json,
+)
+from src.scrapers.rinks_harborcenter import HarborcenterScraper
+from tests.test_calendar_retention import HARBORCENTER_SCORES_HTML
+
+
+BOND_HTML = """
+<html>
+  <body>
+    <div data-testid="competition-subtitle">Northtown <b>Center</b></div>
+    <article data-testid="game-card-901">
+      <div data-testid="game-card-901-teams">Golden Retrievers <span>vs</span> Lumber Lions</div>
+      <div data-testid="game-card-901-date"><time datetime="2026-06-10T00:20:00Z">Tue Jun 9</time></div>
+      <div data-testid="game-card-901-space">Rink B</div>
+      <div data-testid="game-card-901-status">Final 4 - 7</div>
+    </article>
+    <article data-testid="game-card-902">
+      <div data-testid="game-card-902-teams">Rivermen vs Lumber Lions</div>
+      <div data-testid="game-card-902-date"><time datetime="2026-06-11T00:20:00Z">Wed Jun 10</time></div>
+    </article>
+  </body>
+</html>
+"""
+
+
+class ExtractionRecordTests(unittest.TestCase):
+    def test_bond_dom_parse_matches_in_page_records(self) -> None:
+        scraper = BondSportsScraper(team_name="Golden Retrievers")
+        url = "https://bondsports.co/league/1"
+
+        from_html = scraper._parse(BOND_HTML, url, "America/New_York")
+        from_records = scraper._parse_records(
+            {
+                "venue": "NorthtownCenter",
+                "cards": [
+                    {
+                        "id": "901",
+                        "teams": "Golden Retrievers vs Lumber Lions",
+                        "datetime": "2026-06-10T00:20:00Z",
+                        "date": "Tue Jun 9",
+                        "time": None,
+                        "space": "Rink B",
+                        "status": "Final 4 - 7",
+                    }
+                ],
+            },
+            url,
+            "America/New_York",
+        )
+
+        self.assertEqual(len(from_html), 1)
+        self.assertEqual(from_html, from_records)
+        self.assertEqual(from_html[0].summary, "Golden Retrievers vs Lumber Lions (4-7)")
+        self.assertEqual(from_html[0].location, "Rink B, NorthtownCenter")
+        self.assertEqual(from_html[0].start.hour, 20)
+
+    def test_harborcenter_records_build_same_events_as_html(self) -> None:
+        scraper = HarborcenterScraper(team_name="Golden Retrievers")
+        url = "https://www.rinksatharborcenter.com/stats#/1367/team/589011/scores"
+        records = [
+            {
+                "label": "Reverse Retro vs Golden Retrievers on 2026-04-22 at 20:15",
+                "cells": ["", "Reverse Retro vs Golden Retrievers ...", "Silver", "3 - 4", "Wed Apr 22", "8:15PM", "Final", "Rink 2"],
+                "status": "Final",
+                "links": ["#/1367/game/1238827", "/stats#/1367/game/1238827"],
+            }
+        ]
+
+        self.assertEqual(
+            scraper._parse_records(url, records, "America/New_York"),
+            scraper._parse_page(url, HARBORCENTER_SCORES_HTML, "America/New_York"),
+        )
+
+    def test_bond_captured_api_payload_builds_events(self) -> None:
+        payload = {
+            "data": {
+                "id": 7,
+                "name": "Summer League",
+                "startDate": "2026-06-01",
+                "facility": {"name": "Northtown Center"},
+                "teams": [{"name": "Golden Retrievers"}, {"name": "Lumber Lions"}, {"name": "Rivermen"}],
+                "games": [
+                    {
+                        "id": 901,
+                        "startDate": "2026-06-10T00:20:00Z",
+                        "homeTeam": {"name": "Golden Retrievers"},
+                        "awayTeam": {"name": "Lumber Lions"},
+                        "homeScore": 4,
+                        "awayScore": 7,
+                        "status": "Final",
+                        "space": {"name": "Rink B"},
+                    },
+                    {
+                        "id": 902,
+                        "startDate": "2026-06-11T00:20:00Z",
+                        "homeTeam": {"name": "Rivermen"},
+                        "awayTeam": {"name": "Lumber Lions"},
+                    },
+                ],
+            }
+        }
+        scraper = BondSportsScraper(team_name="Golden Retrievers")
+
+        events = scraper._parse_records(
+            {"venue": venue_from_json(payload), "cards": game_records_from_json(payload)},
+            "https://bondsports.co/league/1",
+            "America/New_York",
+        )
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].external_id, "bondsports-901")
+        self.assertEqual(events[0].summary, "Golden Retrievers vs Lumber Lions (4-7)")
+        self.assertEqual(events[0].location, "Rink B, Northtown Center")
+
+    def test_bond_pagination_hints(self) -> None:
+        games = [{"id": 901, "startDate": "2026-06-10T00:20:00Z", "homeTeam": "A", "awayTeam": "B"}]
+        self.assertTrue(has_more_pages({"data": games, "meta": {"hasMore": True, "total": 40}}))
+        self.assertFalse(has_more_pages({"data": games, "meta": {"nextPage": None}}))
+        self.assertIsNone(has_more_pages({"data": games}))
+        self.assertEqual(advertised_total({"data": games, "meta": {"totalCount": 40, "hasMore": True}}), 40)
+        self.assertEqual(advertised_total({"data": games}), 0)
+
+
+class _FakeLocator:
+    def __init__(self, page: "_FakePage") -> None:
+        self.page = page
+        self.first = self
+
+    def count(self) -> int:
+        return 1 if self.page.show_all else 0
+
+    def is_visible(self) -> bool:
+        return self.page.show_all
+
+    def click(self) -> None:
+        self.page.log.append("show all")
+        self.page.show_all = False
+
+
+class _FakePage:
+    """Enough of a Playwright page for BondSportsScraper._page_payload."""
+
+    def __init__(self, rendered: int, show_all: bool) -> None:
+        self.rendered = rendered
+        self.show_all = show_all
+        self.log: List[str] = []
+
+    def locator(self, selector: str) -> _FakeLocator:
+        return _FakeLocator(self)
+
+    def evaluate(self, script: str):
+        if script == CARD_COUNT_SCRIPT:
+            return self.rendered
+        self.log.append("dom extract")
+        return {"venue": "Northtown Center", "cards": ["from the page"]}
+
+    def wait_for_timeout(self, timeout: float) -> None:
+        pass
+
+
+class BondCaptureCompletenessTests(unittest.TestCase):
+    CAPTURED = {"venue": "Northtown Center", "cards": [{"id": "901"}, {"id": "902"}]}
+
+    def payload(self, page: _FakePage):
+        scraper = BondSportsScraper(team_name="Golden Retrievers")
+        with mock.patch.object(BondSportsScraper, "_capture_payload", return_value=dict(self.CAPTURED)):
+            return scraper._page_payload(page, "https://bondsports.co/league/1")
+
+    def test_capture_is_used_when_it_covers_the_page(self) -> None:
+        page = _FakePage(rendered=2, show_all=False)
+        self.assertEqual(self.payload(page), self.CAPTURED)
+        self.assertEqual(page.log, [])
+
+    def test_show_all_or_extra_cards_fall_back_to_the_dom(self) -> None:
+        for page, log in (
+            (_FakePage(rendered=2, show_all=True), ["show all", "dom extract"]),
+            (_FakePage(rendered=3, show_all=False), ["dom extract"]),
+        ):
+            with self.subTest(log=log):
+                self.assertEqual(self.payload(page)["cards"], ["from the page"])
+                self.assertEqual(page.log, log)
+
+
+if __name__ == "__main__":
+    unittest.main()
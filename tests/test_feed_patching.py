@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+import gzip
+import tempfile
+import unittest
+
+import pytz
+
+from src.utils.events import Event
+from src.utils.feeds import update_manifest
+from src.utils.ics import build_ics, index_vevents, patch_feed, patch_ics
+
+
+TZ = pytz.timezone("America/New_York")
+
+
+def game(game_id: int, day: int, summary: str = "Golden Retrievers vs. Rivermen") -> Event:
+    start = TZ.localize(datetime(2026, 6, day, 19, 15))
+    return Event(
+        summary=summary,
+        start=start,
+        end=start + timedelta(minutes=75),
+        timezone="America/New_York",
+        location="Rink 2",
+        external_id=f"harborcenter:game:{game_id}",
+    )
+
+
+class FeedPatchingTests(unittest.TestCase):
+    def test_unchanged_feed_is_reproduced_byte_for_byte(self) -> None:
+        events = [game(1, 10), game(2, 17)]
+        published = build_ics(events, cal_name="Golden Retrievers", tz_name="America/New_York")
+
+        patched, changes = patch_ics(published, events, cal_name="Golden Retrievers", tz_name="America/New_York")
+
+        self.assertEqual(patched, published)
+        self.assertEqual(changes, [])
+
+    def test_reports_and_reemits_only_changed_events(self) -> None:
+        kept, scored, moved, cancelled = game(1, 3), game(2, 10), game(3, 17), game(4, 24)
+        published = build_ics([kept, scored, moved, cancelled], cal_name="Golden Retrievers")
+        old_blocks = index_vevents(published)
+
+        new_events = [
+            kept,
+            replace(scored, summary="Golden Retrievers vs. Rivermen (4-2)"),
+            replace(moved, start=moved.start + timedelta(hours=1), end=moved.end + timedelta(hours=1)),
+            game(5, 28),
+        ]
+        patched, changes = patch_ics(published, new_events, cal_name="Golden Retrievers")
+
+        self.assertEqual(
+            [(c.kind, c.uid) for c in changes],
+            [
+                ("scored", scored.google_event_id()),
+                ("moved", moved.google_event_id()),
+                ("added", game(5, 28).google_event_id()),
+                ("cancelled", cancelled.google_event_id()),
+            ],
+        )
+        self.assertIn(old_blocks[kept.google_event_id()], patched)
+        self.assertNotIn(old_blocks[cancelled.google_event_id()], patched)
+        self.assertIn(b"SUMMARY:Golden Retrievers vs. Rivermen (4-2)", patched)
+        self.assertEqual(len(index_vevents(patched)), 4)
+
+    def test_patch_feed_streams_to_disk_and_skips_unchanged_feeds(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "golden-retrievers.ics"
+            events = [game(1, 10), game(2, 17)]
+            self.assertEqual(len(patch_feed(path, events, cal_name="Golden Retrievers")), 2)
+            published = path.read_bytes()
+            inode = path.stat().st_ino
+
+            with mock.patch("src.utils.ics.patch_ics", side_effect=AssertionError("buffered")):
+                self.assertEqual(patch_feed(path, events, cal_name="Golden Retrievers"), [])
+                self.assertEqual(path.stat().st_ino, inode)
+                changes = patch_feed(path, events[:1], cal_name="Golden Retrievers")
+
+            self.assertEqual([c.kind for c in changes], ["cancelled"])
+            self.assertNotEqual(path.stat().st_ino, inode)
+            self.assertEqual(path.read_bytes(), patch_ics(published, events[:1], cal_name="Golden Retrievers")[0])
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), ["golden-retrievers.ics"])
+
+    def test_manifest_lists_every_feed_with_precompressed_copy(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            docs = Path(tmp)
+            feed = build_ics([game(1, 10)], cal_name="Golden Retrievers")
+            (docs / "golden-retrievers-summer-2026.ics").write_bytes(feed)
+            (docs / "old-team.ics.gz").write_bytes(b"stale")
+
+            manifest = update_manifest(docs)
+            gz_first = (docs / "golden-retrievers-summer-2026.ics.gz").read_bytes()
+            update_manifest(docs)
+
+            entry = manifest["feeds"]["golden-retrievers-summer-2026.ics"]
+            self.assertEqual(entry["bytes"], len(feed))
+            self.assertEqual(gzip.decompress(gz_first), feed)
+            self.assertEqual((docs / "golden-retrievers-summer-2026.ics.gz").read_bytes(), gz_first)
+            self.assertFalse((docs / "old-team.ics.gz").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from http.client import HTTPConnection
+from pathlib import Path
+import gzip
+import os
+import tempfile
+import threading
+import unittest
+
+from src.server import FeedServer, accepts_gzip
+
+
+class FeedServerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.docs = Path(self._tmp.name)
+        (self.docs / "ics").mkdir()
+        (self.docs / "index.html").write_text("<h1>Feeds</h1>", encoding="utf-8")
+        self.feed = self.docs / "ics" / "golden-retrievers-summer-2026.ics"
+        self.feed.write_bytes(b"BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n")
+
+        self.server = FeedServer(("127.0.0.1", 0), self.docs, refresh_seconds=3600)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.conn = HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=5)
+
+    def tearDown(self) -> None:
+        self.conn.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self._tmp.cleanup()
+
+    def get(self, path: str, **headers: str):
+        self.conn.request("GET", path, headers=headers)
+        response = self.conn.getresponse()
+        return response, response.read()
+
+    def test_conditional_get_returns_304_until_the_file_changes(self) -> None:
+        response, body = self.get("/ics/golden-retrievers-summer-2026.ics")
+        etag = response.getheader("ETag")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, self.feed.read_bytes())
+        self.assertEqual(response.getheader("Content-Type"), "text/calendar; charset=utf-8")
+        self.assertRegex(response.getheader("Cache-Control"), r"public, max-age=\d+")
+
+        response, body = self.get("/ics/golden-retrievers-summer-2026.ics", **{"If-None-Match": etag})
+        self.assertEqual((response.status, body), (304, b""))
+
+        self.feed.write_bytes(b"BEGIN:VCALENDAR\r\nX-CHANGED:1\r\nEND:VCALENDAR\r\n")
+        os.utime(self.feed, ns=(0, self.feed.stat().st_mtime_ns + 1_000_000))
+        response, body = self.get("/ics/golden-retrievers-summer-2026.ics", **{"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+        self.assertIn(b"X-CHANGED", body)
+
+    def test_gzip_negotiation_uses_its_own_etag(self) -> None:
+        plain, _ = self.get("/ics/golden-retrievers-summer-2026.ics")
+        response, body = self.get("/ics/golden-retrievers-summer-2026.ics", **{"Accept-Encoding": "gzip, br"})
+
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(gzip.decompress(body), self.feed.read_bytes())
+        self.assertNotEqual(response.getheader("ETag"), plain.getheader("ETag"))
+        self.assertFalse(accepts_gzip("gzip;q=0, identity"))
+
+    def test_gzip_clients_get_the_precompressed_copy_while_it_is_fresh(self) -> None:
+        gz_path = self.feed.with_name(f"{self.feed.name}.gz")
+        # A marker header shows which copy went out.
+        gz_path.write_bytes(gzip.compress(self.feed.read_bytes(), mtime=12345))
+        os.utime(gz_path, ns=(0, self.feed.stat().st_mtime_ns))
+
+        response, body = self.get("/ics/golden-retrievers-summer-2026.ics", **{"Accept-Encoding": "gzip"})
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(body, gz_path.read_bytes())
+
+        self.feed.write_bytes(b"BEGIN:VCALENDAR\r\nX-CHANGED:1\r\nEND:VCALENDAR\r\n")
+        os.utime(self.feed, ns=(0, gz_path.stat().st_mtime_ns + 1_000_000))
+        response, body = self.get("/ics/golden-retrievers-summer-2026.ics", **{"Accept-Encoding": "gzip"})
+        self.assertNotEqual(body, gz_path.read_bytes())
+        self.assertEqual(gzip.decompress(body), self.feed.read_bytes())
+
+    def test_index_and_missing_paths(self) -> None:
+        response, body = self.get("/")
+        self.assertEqual((response.status, body), (200, b"<h1>Feeds</h1>"))
+        response, _ = self.get("/../etc/passwd")
+        self.assertEqual(response.status, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
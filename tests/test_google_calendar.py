@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+import tempfile
+import unittest
+
+import pytz
+
+from benchmarks.fake_gcal import TOKEN_PATH, FakeCalendarApi
+from src.utils.events import Event
+from src.utils.gcal import (
+    CalendarSync,
+    GoogleCalendarClient,
+    OAuthCredentials,
+    decode_batch,
+    encode_batch,
+    remote_event_id,
+)
+
+
+TZ = pytz.timezone("America/New_York")
+CALENDAR_ID = "golden-retrievers@group.calendar.google.com"
+
+
+def games(count: int) -> list:
+    start = TZ.localize(datetime(2026, 6, 1, 19, 0))
+    return [
+        Event(
+            summary=f"Golden Retrievers vs. Team {i}",
+            start=start + timedelta(days=7 * i),
+            end=start + timedelta(days=7 * i, minutes=75),
+            timezone="America/New_York",
+            location="Rink 2",
+            external_id=f"harborcenter:game:{i}",
+        )
+        for i in range(count)
+    ]
+
+
+class GoogleCalendarSyncTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self._tmp.name) / "gcal.json"
+        self.api = FakeCalendarApi().start()
+        self.client = GoogleCalendarClient("test-token", api_root=self.api.url, batch_size=10, sleep=lambda s: None)
+
+    def tearDown(self) -> None:
+        self.client.session.close()
+        self.api.stop()
+        self._tmp.cleanup()
+
+    def sync(self, events: list):
+        return CalendarSync(self.client, CALENDAR_ID, cache_path=self.cache_path).sync(events)
+
+    def remote(self) -> dict:
+        """Events the calendar shows; deleted ones linger as cancelled."""
+        events = self.api.calendars.get(CALENDAR_ID, {})
+        return {event_id: body for event_id, body in events.items() if body.get("status") != "cancelled"}
+
+    def test_only_changed_events_cost_api_calls(self) -> None:
+        events = games(12)
+        first = self.sync(events)
+        self.assertEqual((first.inserted, first.batches, first.failed), (12, 2, []))
+        self.assertEqual(set(self.remote()), {remote_event_id(ev) for ev in events})
+
+        calls = self.api.calls
+        unchanged = self.sync(events)
+        self.assertEqual((unchanged.unchanged, unchanged.batches), (12, 0))
+        self.assertEqual(self.api.calls, calls)
+
+        moved = replace(events[3], location="Rink 1")
+        result = self.sync(events[:3] + [moved] + events[4:11])
+        self.assertEqual((result.patched, result.deleted, result.unchanged, result.batches), (1, 1, 10, 1))
+        self.assertEqual(self.api.calls, calls + 2)
+        self.assertEqual(self.remote()[remote_event_id(moved)]["location"], "Rink 1")
+        self.assertNotIn(remote_event_id(events[11]), self.remote())
+
+    def test_refresh_token_renews_expired_access_tokens(self) -> None:
+        now = [0.0]
+        credentials = OAuthCredentials(
+            "client-id", "client-secret", "refresh-token", token_uri=f"{self.api.url}{TOKEN_PATH}", clock=lambda: now[0]
+        )
+        self.addCleanup(credentials.session.close)
+        self.client = GoogleCalendarClient(api_root=self.api.url, batch_size=10, sleep=lambda s: None, credentials=credentials)
+        events = games(3)
+
+        self.assertEqual(self.sync(events).inserted, 3)
+        self.assertEqual(self.api.token_requests, 1)
+
+        # Google revoked the token early: the 401 is retried with a new one.
+        self.api.access_tokens.clear()
+        self.assertEqual(self.sync(events[:2]).deleted, 1)
+        self.assertEqual(self.api.token_requests, 2)
+
+        # An hour later the token is renewed before it is used.
+        now[0] += 3600
+        self.assertEqual(self.sync(events[:1]).deleted, 1)
+        self.assertEqual(self.api.token_requests, 3)
+        self.assertEqual(set(self.remote()), {remote_event_id(events[0])})
+
+    def test_retries_failed_batches_and_rate_limited_parts(self) -> None:
+        self.api.fail_batches = 2
+        self.api.part_failure_rate = 0.3
+        self.client.max_retries = 10
+
+        result = self.sync(games(30))
+
+        self.assertEqual((result.inserted, result.failed), (30, []))
+        self.assertEqual(len(self.remote()), 30)
+        self.assertGreater(self.api.batches, 3)
+
+    def test_recovers_when_the_local_cache_is_lost(self) -> None:
+        events = games(5)
+        self.sync(events)
+        self.cache_path.unlink()
+
+        result = self.sync(events)
+
+        # Inserts that already exist remotely are retried as patches.
+        self.assertEqual((result.inserted, result.patched, result.failed), (0, 5, []))
+        self.assertEqual(len(self.remote()), 5)
+
+    def test_returning_games_are_confirmed_again(self) -> None:
+        events = games(3)
+        self.sync(events)
+        self.assertEqual(self.sync(events[:2]).deleted, 1)
+        self.assertEqual(self.api.calendars[CALENDAR_ID][remote_event_id(events[2])]["status"], "cancelled")
+
+        # The insert hits the cancelled event's ID (409) and is redone as a patch.
+        result = self.sync(events)
+
+        self.assertEqual((result.inserted, result.patched, result.failed), (0, 1, []))
+        self.assertEqual(set(self.remote()), {remote_event_id(ev) for ev in events})
+
+    def test_batch_encoding_round_trips(self) -> None:
+        parts = [("item-0", "POST /calendar/v3/calendars/x/events HTTP/1.1", {"id": "evt1"}), ("item-1", "DELETE /x HTTP/1.1", None)]
+        self.assertEqual(decode_batch(encode_batch(parts, "b"), "multipart/mixed; boundary=b"), parts)
+
+
+if __name__ == "__main__":
+    unittest.main()
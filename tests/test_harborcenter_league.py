@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Dict, List
+from unittest import mock
+import pickle
+import unittest
+
+from src.scrapers.rinks_harborcenter import HarborcenterLeague, HarborcenterScraper
+from src.utils.parsing import ParseStage
+
+
+TZ = "America/New_York"
+LEAGUE = "https://www.rinksatharborcenter.com/stats#/1367"
+
+
+def _row(game_id: int, away: str, home: str, when: str, score: str = "") -> str:
+    day, time = when.split(" ")
+    return (
+        '<tr role="article"><td class="center"></td><td class="teams"><span>'
+        f'<div class="sr-only">{away} vs {home} on {day} at {time}</div>'
+        f'<a href="/stats#/1367/game/{game_id}"><span>{away}</span></a></span></td>'
+        f'<td class="teams"><span class="vs">vs</span></td><td class="teams">{home}</td>'
+        f'<td class="center">{score}</td><td class="center actions"><a href="/stats#/1367/game/{game_id}">Preview</a></td>'
+        "<td>Rink 2</td></tr>"
+    )
+
+
+def _page(rows: List[str]) -> str:
+    return "<html><body><table>" + "".join(rows) + "</table></body></html>"
+
+
+SCHEDULE_ROWS = [
+    _row(1, "Buffalo Cigars", "Golden Retrievers", "2026-04-27 19:15"),
+    _row(2, "Ice Holes", "Puck Dynasty", "2026-04-27 20:30"),
+    _row(3, "Golden Retrievers", "Puck Dynasty", "2026-05-04 21:00"),
+]
+SCORES_ROWS = [
+    _row(4, "Golden Retrievers", "Ice Holes", "2026-04-20 19:15", "3 - 2"),
+    _row(5, "Puck Dynasty", "Buffalo Cigars", "2026-04-20 20:30", "1 - 4"),
+]
+PAGES: Dict[str, str] = {
+    f"{LEAGUE}/schedule": _page(SCHEDULE_ROWS),
+    f"{LEAGUE}/scores": _page(SCORES_ROWS),
+    f"{LEAGUE}/team/681628/schedule": _page([SCHEDULE_ROWS[0], SCHEDULE_ROWS[2]]),
+    f"{LEAGUE}/team/681628/scores": _page([SCORES_ROWS[0]]),
+    f"{LEAGUE}/team/999/schedule": _page([]),
+    f"{LEAGUE}/team/999/scores": _page([]),
+}
+
+
+@contextmanager
+def _no_browser(provider=None):
+    yield None
+
+
+class _FakePage:
+    def __init__(self, log: List[tuple], number: int) -> None:
+        self.log = log
+        self.number = number
+        self.url = ""
+
+    def goto(self, url: str, **kwargs) -> None:
+        self.url = url
+        self.log.append(("goto", self.number, kwargs.get("wait_until")))
+
+    def wait_for_load_state(self, state: str, **kwargs) -> None:
+        self.log.append(("wait", self.number, state))
+
+    def wait_for_selector(self, selector: str, **kwargs) -> None:
+        self.log.append(("rows", self.number))
+
+    def wait_for_timeout(self, ms: int) -> None:
+        self.log.append(("settle", ms))
+
+    def locator(self, selector: str):
+        return mock.Mock(count=mock.Mock(return_value=0))
+
+    def evaluate(self, script: str) -> List[dict]:
+        self.log.append(("extract", self.number))
+        return [{"label": self.url}]
+
+    def close(self) -> None:
+        self.log.append(("close", self.number))
+
+
+class _FakeContext:
+    def __init__(self, log: List[tuple]) -> None:
+        self.log = log
+        self.pages = 0
+
+    def new_page(self) -> _FakePage:
+        self.pages += 1
+        return _FakePage(self.log, self.pages)
+
+    def close(self) -> None:
+        self.log.append(("context closed",))
+
+
+class ConcurrentTabTests(unittest.TestCase):
+    def test_tabs_load_side_by_side_and_yield_in_order(self) -> None:
+        log: List[tuple] = []
+        browser = mock.Mock()
+        browser.new_context.side_effect = lambda: _FakeContext(log)
+        urls = [f"{LEAGUE}/team/1/scores", f"{LEAGUE}/team/1/schedule"]
+
+        tabs = HarborcenterScraper()._render_tabs(browser, urls)
+        first = next(tabs)
+        self.assertEqual(first, (urls[0], [{"label": urls[0]}]))
+        # The first tab is handed over before the second is even waited on.
+        self.assertNotIn(("wait", 2, "networkidle"), log)
+        rest = list(tabs)
+
+        self.assertEqual(rest, [(urls[1], [{"label": urls[1]}])])
+        self.assertEqual(browser.new_context.call_count, 1)
+        self.assertEqual(log, [
+            ("goto", 1, "commit"),
+            ("goto", 2, "commit"),
+            ("wait", 1, "networkidle"),
+            ("rows", 1),
+            ("settle", 1000),
+            ("extract", 1),
+            ("close", 1),
+            ("wait", 2, "networkidle"),
+            ("rows", 2),
+            ("extract", 2),
+            ("close", 2),
+            ("context closed",),
+        ])
+
+
+class HarborcenterLeagueTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rendered: List[str] = []
+
+        def render_tabs(scraper, browser, page_urls):
+            for page_url in page_urls:
+                self.rendered.append(page_url)
+                yield (page_url, PAGES[page_url])
+
+        patches = [
+            mock.patch("src.scrapers.rinks_harborcenter.open_browser", _no_browser),
+            mock.patch.object(HarborcenterScraper, "_render_tabs", render_tabs),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def scrape(self, team_name: str, team_id: str, league=None):
+        scraper = HarborcenterScraper(team_name=team_name, league=league)
+        return scraper.scrape(f"{LEAGUE}/team/{team_id}/schedule", TZ)
+
+    def test_league_index_serves_teams_like_their_own_pages(self) -> None:
+        own_pages = self.scrape("Golden Retrievers", "681628")
+        self.rendered.clear()
+
+        league = HarborcenterLeague()
+        from_index = self.scrape("Golden Retrievers", "681628", league)
+        dynasty = self.scrape("Puck Dynasty", "681700", league)
+
+        self.assertEqual(from_index, own_pages)
+        self.assertEqual([e.summary for e in dynasty], [
+            "Puck Dynasty vs. Buffalo Cigars (1-4)",
+            "Ice Holes vs. Puck Dynasty",
+            "Golden Retrievers vs. Puck Dynasty",
+        ])
+        self.assertEqual(self.rendered, [f"{LEAGUE}/scores", f"{LEAGUE}/schedule"])
+        self.assertEqual(league.renders, 2)
+
+    def test_teams_missing_from_the_index_render_their_own_pages(self) -> None:
+        league = HarborcenterLeague()
+        self.assertEqual(self.scrape("Not In League", "999", league), [])
+        self.assertEqual(self.rendered, [
+            f"{LEAGUE}/scores",
+            f"{LEAGUE}/schedule",
+            f"{LEAGUE}/team/999/scores",
+            f"{LEAGUE}/team/999/schedule",
+        ])
+
+    def test_names_shared_across_divisions_render_their_own_pages(self) -> None:
+        rows = SCHEDULE_ROWS + [_row(6, "Golden Retrievers", "Ice Holes", "2026-05-04 19:15")]
+        league = HarborcenterLeague()
+        with mock.patch.dict(PAGES, {f"{LEAGUE}/schedule": _page(rows)}):
+            with mock.patch("src.scrapers.rinks_harborcenter.logger") as log:
+                events = self.scrape("Golden Retrievers", "681628", league)
+
+        self.assertEqual(events, self.scrape("Golden Retrievers", "681628"))
+        self.assertIn(f"{LEAGUE}/team/681628/schedule", self.rendered)
+        log.warning.assert_called_once()
+
+    def test_league_scrapers_parse_on_the_pool(self) -> None:
+        league = HarborcenterLeague()
+        self.scrape("Golden Retrievers", "681628", league)
+        scraper = HarborcenterScraper(team_name="Golden Retrievers", league=league)
+        page_url = f"{LEAGUE}/team/681628/schedule"
+
+        with ParseStage(workers=2, min_payload_chars=0) as pooled:
+            events = pooled.submit(scraper, page_url, PAGES[page_url], TZ).result()
+
+        self.assertEqual(events, scraper.parse(page_url, PAGES[page_url], TZ))
+        self.assertEqual(len(events), 2)
+        copy = pickle.loads(pickle.dumps(league))
+        self.assertEqual(copy.team_pages(page_url, [page_url], "Golden Retrievers"), league.team_pages(page_url, [page_url], "Golden Retrievers"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from src.config import MemorySettings
+from src.utils.memory import MB, MemoryMonitor, ProcessSample, sample_processes
+from src.utils.parsing import ParseStage
+
+
+class _FakeBrowser:
+    def __init__(self) -> None:
+        self.recycled = 0
+
+    def recycle(self) -> None:
+        self.recycled += 1
+
+
+class MemoryMonitorTests(unittest.TestCase):
+    def test_stage_peaks_fold_nested_stages_into_their_parent(self) -> None:
+        monitor = MemoryMonitor(sampler=ProcessSample)
+        monitor.start(MemorySettings(tracemalloc=True, sample_seconds=0))
+        try:
+            with monitor.stage("team"):
+                kept = bytearray(1 * MB)
+                with monitor.stage("parse"):
+                    scratch = bytearray(8 * MB)
+                    del scratch
+                del kept
+        finally:
+            summary = monitor.stop()
+
+        stages = summary["stages"]
+        self.assertGreaterEqual(stages["parse"]["growth_mb"], 8)
+        self.assertLess(stages["parse"]["growth_mb"], 9)
+        self.assertGreaterEqual(stages["team"]["growth_mb"], 9)
+        self.assertGreaterEqual(summary["python_peak_mb"], stages["team"]["peak_mb"])
+        self.assertIs(monitor.stage("team"), monitor.stage("parse"))
+
+    def test_budgets_recycle_the_browser_then_shrink_parse_workers(self) -> None:
+        samples = [
+            ProcessSample(self_rss=100 * MB),  # taken by start()
+            ProcessSample(self_rss=200 * MB, children=700 * MB, browser=600 * MB),
+            ProcessSample(self_rss=200 * MB, children=500 * MB, browser=300 * MB),
+            ProcessSample(self_rss=100 * MB, children=100 * MB),
+        ]
+        monitor = MemoryMonitor(sampler=lambda: samples.pop(0) if len(samples) > 1 else samples[0])
+        monitor.start(MemorySettings(sample_seconds=0, rss_budget_mb=512, browser_budget_mb=400))
+        browser = _FakeBrowser()
+        with ParseStage(workers=4) as parse_stage:
+            first = monitor.enforce(parse_stage, browser)
+            second = monitor.enforce(parse_stage, browser)
+            third = monitor.enforce(parse_stage, browser)
+            workers = parse_stage.workers
+        summary = monitor.stop()
+
+        self.assertEqual(browser.recycled, 1)
+        self.assertIn("recycled browser", first[0])
+        self.assertIn("parse workers down to 2", second[0])
+        self.assertEqual(third, [])
+        self.assertEqual(workers, 2)
+        self.assertEqual(summary["browser_peak_mb"], 600)
+        self.assertEqual(len(summary["budget_actions"]), 2)
+
+    def test_sample_processes_sums_descendants_from_proc(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            proc = Path(tmp)
+
+            def add(pid: int, ppid: int, comm: str, cmdline: str, rss_kb: int, pss_kb: int | None = None) -> None:
+                d = proc / str(pid)
+                d.mkdir()
+                (d / "stat").write_text(f"{pid} ({comm}) S {ppid} 1 1 0", encoding="utf-8")
+                (d / "status").write_text(f"Name:\t{comm}\nVmRSS:\t{rss_kb} kB\n", encoding="utf-8")
+                (d / "cmdline").write_bytes(cmdline.replace(" ", "\0").encode("utf-8"))
+                if pss_kb is not None:
+                    (d / "smaps_rollup").write_text(f"Rss:\t{rss_kb} kB\nPss:\t{pss_kb} kB\n", encoding="utf-8")
+
+            add(100, 1, "python", "python -m src.main", 50_000)
+            add(101, 100, "node", "node playwright/cli.js run-driver", 40_000)
+            add(102, 101, "chrome) (x", "/ms-playwright/chromium/chrome --headless", 300_000, pss_kb=120_000)
+            add(103, 101, "chrome", "/ms-playwright/chromium/chrome --type=renderer", 200_000, pss_kb=80_000)
+            add(200, 1, "other", "unrelated", 999_999)
+
+            sample = sample_processes(100, proc)
+
+        self.assertEqual(sample.self_rss, 50_000 * 1024)
+        self.assertEqual(sample.processes, 3)
+        self.assertEqual(sample.children, (40_000 + 120_000 + 80_000) * 1024)
+        self.assertEqual(sample.browser, (120_000 + 80_000) * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
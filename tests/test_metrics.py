@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+from unittest import mock
+import tempfile
+import unittest
+
+import pytz
+
+from src.main import ScrapeResources, iter_events, publish_feed
+from src.scrapers.base import RawPage, Scraper
+from src.utils.events import Event
+from src.utils.metrics import METRICS, Metrics
+from src.utils.report import RunReport
+
+
+TZ = "America/New_York"
+
+
+class _FakeScraper(Scraper):
+    def can_handle(self, url: str) -> bool:
+        return "eriemetrosports.com" in url
+
+    def iter_pages(self, url: str, timezone: str) -> Iterator[RawPage]:
+        if "broken" in url:
+            raise RuntimeError("503 Service Unavailable")
+        yield (url, "<html>two games</html>")
+
+    def iter_parse(self, source_url: str, payload: str, timezone: str) -> Iterator[Event]:
+        start = pytz.timezone(timezone).localize(datetime(2026, 10, 19, 20, 0))
+        for i in range(2):
+            yield Event(
+                summary=f"Game {i}",
+                start=start + timedelta(days=i),
+                end=start + timedelta(days=i, hours=1),
+                timezone=timezone,
+                external_id=f"g{i}",
+            )
+
+
+class MetricsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        METRICS.reset()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        METRICS.reset()
+        self._tmp.cleanup()
+
+    def test_scrapes_are_timed_and_counted_per_host_and_scraper(self) -> None:
+        urls = [
+            "https://www.eriemetrosports.com/schedule/team_instance/1",
+            "https://www.eriemetrosports.com/schedule/team_instance/broken",
+        ]
+        with mock.patch.object(ScrapeResources, "scrapers", lambda self, team_name: [_FakeScraper()]):
+            events = list(iter_events(urls, TZ))
+
+        self.assertEqual(len(events), 2)
+        labels = {"scraper": "_FakeScraper", "host": "eriemetrosports.com"}
+        self.assertEqual(METRICS.value("hockey_scrape_total", {**labels, "outcome": "success"}), 1)
+        self.assertEqual(METRICS.value("hockey_scrape_total", {**labels, "outcome": "failure"}), 1)
+        self.assertEqual(METRICS.value("hockey_scrape_events_total", labels), 2)
+        self.assertEqual(METRICS.value("hockey_fetch_bytes_total", labels), len("<html>two games</html>"))
+
+        text = METRICS.render()
+        self.assertIn("# TYPE hockey_scrape_duration_seconds histogram", text)
+        self.assertIn('hockey_scrape_duration_seconds_bucket{host="eriemetrosports.com",scraper="_FakeScraper",le="+Inf"} 2', text)
+        self.assertIn('hockey_scrape_duration_seconds_count{host="eriemetrosports.com",scraper="_FakeScraper"} 2', text)
+
+    def test_feed_events_and_writes_only_count_real_rewrites(self) -> None:
+        path = self.dir / "team.ics"
+        with mock.patch.object(ScrapeResources, "scrapers", lambda self, team_name: [_FakeScraper()]):
+            events = list(iter_events(["https://www.eriemetrosports.com/schedule/team_instance/1"], TZ))
+
+        publish_feed(path, iter(events), "Team", TZ, RunReport())
+        publish_feed(path, iter(events), "Team", TZ, RunReport())
+
+        self.assertEqual(METRICS.value("hockey_feed_events", {"feed": "team.ics"}), 2)
+        self.assertEqual(METRICS.value("hockey_feed_writes_total", {"feed": "team.ics"}), 1)
+        self.assertEqual(METRICS.value("hockey_feed_changes_total", {"kind": "added"}), 2)
+
+    def test_textfile_is_escaped_and_replaced_atomically(self) -> None:
+        metrics = Metrics()
+        metrics.inc("hockey_fetch_strategy_total", {"scraper": "ErieMetroScraper", "strategy": "mac_ua"})
+        metrics.inc("hockey_fetch_strategy_total", {"scraper": "ErieMetroScraper", "strategy": "mac_ua"})
+        metrics.set("hockey_feed_events", 3, {"feed": 'odd "name"\\.ics'})
+        path = self.dir / "textfile" / "hockey.prom"
+
+        metrics.write_textfile(path)
+
+        text = path.read_text(encoding="utf-8")
+        self.assertIn('hockey_fetch_strategy_total{scraper="ErieMetroScraper",strategy="mac_ua"} 2', text)
+        self.assertIn('hockey_feed_events{feed="odd \\"name\\"\\\\.ics"} 3', text)
+        self.assertEqual([p.name for p in path.parent.iterdir()], ["hockey.prom"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+import tempfile
+import unittest
+
+from src.scrapers.bond_sports import BondSportsScraper
+from src.scrapers.erie_metro import ErieMetroScraper
+from src.scrapers.rinks_harborcenter import HarborcenterScraper
+from src.utils import page_cache
+from src.utils.page_cache import ParsedPageCache
+from src.utils.parsing import ParseStage
+from tests.test_calendar_retention import GAME_PAGE_HTML, HARBORCENTER_SCHEDULE_HTML, TEAM_PAGE_HTML
+from tests.test_extraction_records import BOND_HTML
+
+
+TZ = "America/New_York"
+TEAM_URL = "https://www.eriemetrosports.com/schedule/team_instance/10300893?subseason=952202"
+
+
+class FakeResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class ParsedPageCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "parsed-pages.json"
+        self.fetched: List[str] = []
+
+    def parse(self, html: str, cache: ParsedPageCache, game_page: str = GAME_PAGE_HTML):
+        def fake_get(url: str, *args, **kwargs):
+            self.fetched.append(url)
+            return FakeResponse(game_page)
+
+        scraper = ErieMetroScraper(team_name="Audubon North")
+        with patch("src.scrapers.erie_metro.requests.get", side_effect=fake_get):
+            return list(ParseStage(cache=cache).iter_events(scraper, [(TEAM_URL, html)], TZ))
+
+    def test_unchanged_table_reuses_events_without_parsing_or_lookups(self) -> None:
+        cache = ParsedPageCache(self.path)
+        first = self.parse(TEAM_PAGE_HTML, cache)
+        cache.save()
+        self.assertEqual(len(self.fetched), 1)
+
+        self.fetched.clear()
+        reloaded = ParsedPageCache(self.path)
+        restyled = TEAM_PAGE_HTML.replace("<body>", '<body><nav class="csrf-8f2a">Menu</nav>')
+        with patch.object(ErieMetroScraper, "iter_parse", side_effect=AssertionError("parsed")):
+            second = self.parse(restyled, reloaded)
+
+        self.assertEqual(second, first)
+        self.assertEqual(self.fetched, [])
+        self.assertEqual((reloaded.hits, reloaded.misses), (1, 0))
+
+    def test_changed_rows_or_parser_code_parse_again(self) -> None:
+        cache = ParsedPageCache(self.path)
+        self.parse(TEAM_PAGE_HTML, cache)
+
+        rescheduled = self.parse(TEAM_PAGE_HTML.replace("8:50 PM EDT", "9:35 PM EDT"), cache)
+        self.assertTrue(any(ev.start.minute == 35 for ev in rescheduled))
+
+        with patch.dict(page_cache._module_digests, {"src.utils.events": "edited"}):
+            self.parse(TEAM_PAGE_HTML.replace("8:50 PM EDT", "9:35 PM EDT"), cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    def test_pages_with_failed_time_lookups_are_not_stored(self) -> None:
+        cache = ParsedPageCache(self.path)
+        degraded = self.parse(TEAM_PAGE_HTML, cache, game_page="<html></html>")
+        completed = next(ev for ev in degraded if "Hammers" in ev.summary)
+        self.assertEqual((completed.start.hour, completed.start.minute), (0, 0))
+
+        retried = self.parse(TEAM_PAGE_HTML, cache)
+        completed = next(ev for ev in retried if "Hammers" in ev.summary)
+        self.assertEqual((completed.start.hour, completed.start.minute), (21, 20))
+        self.assertEqual(len(self.fetched), 2)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+        self.assertEqual(self.parse(TEAM_PAGE_HTML, cache), retried)
+        self.assertEqual(cache.hits, 1)
+
+    def test_fingerprints_only_cover_the_schedule_region(self) -> None:
+        noise = '<script>window.build="a1b2";</script><div class="ad">Ad 42</div>'
+        for scraper, html, row_text in (
+            (HarborcenterScraper(), HARBORCENTER_SCHEDULE_HTML, "Rink 2"),
+            (BondSportsScraper(), BOND_HTML, "Northtown"),
+            (ErieMetroScraper(), TEAM_PAGE_HTML, "Riverside Rink"),
+        ):
+            with self.subTest(scraper=type(scraper).__name__):
+                self.assertIn(row_text, html)
+                fingerprint = scraper.content_fingerprint(html)
+                self.assertEqual(scraper.content_fingerprint(html.replace("<body>", f"<body>{noise}")), fingerprint)
+                self.assertNotEqual(scraper.content_fingerprint(html.replace(row_text, "Elsewhere")), fingerprint)
+        self.assertIsNone(ErieMetroScraper().content_fingerprint(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
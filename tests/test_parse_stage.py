@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from datetime import datetime
+import threading
+import unittest
+
+import pytz
+import requests
+
+from src.scrapers.erie_metro import ErieMetroScraper
+from src.scrapers.rinks_harborcenter import HarborcenterScraper
+from src.utils.browser import BrowserProvider
+from src.utils.parsing import ParseStage
+from tests.test_calendar_retention import HARBORCENTER_SCHEDULE_HTML, HARBORCENTER_SCORES_HTML, TEAM_PAGE_HTML
+
+
+ERIE_URL = "https://www.eriemetrosports.com/schedule/team_instance/10300893?subseason=952202"
+ERIE_GAME_URL = "https://www.eriemetrosports.com/game/show/44577992?subseason=952202"
+
+
+class ParseStageTests(unittest.TestCase):
+    def test_pool_and_inline_return_the_same_events(self) -> None:
+        scraper = HarborcenterScraper(team_name="Golden Retrievers")
+        pages = [
+            ("https://www.rinksatharborcenter.com/stats#/1367/team/589011/schedule", HARBORCENTER_SCHEDULE_HTML),
+            ("https://www.rinksatharborcenter.com/stats#/1367/team/589011/scores", HARBORCENTER_SCORES_HTML),
+        ]
+
+        with ParseStage() as inline:
+            expected = [inline.submit(scraper, url, html, "America/New_York").result() for url, html in pages]
+        with ParseStage(workers=2, min_payload_chars=0) as pooled:
+            futures = [pooled.submit(scraper, url, html, "America/New_York") for url, html in pages]
+            actual = [future.result() for future in futures]
+
+        self.assertEqual(actual, expected)
+        self.assertEqual([len(events) for events in actual], [1, 1])
+
+    def test_daemon_scrapers_parse_on_the_pool(self) -> None:
+        # The daemon hands scrapers a shared Session and browser; neither may
+        # stop them from being pickled to a worker.
+        http = requests.Session()
+        self.addCleanup(http.close)
+        erie = ErieMetroScraper(team_name="Audubon North", session=http)
+        erie_plain = ErieMetroScraper(team_name="Audubon North")
+        for scraper in (erie, erie_plain):
+            # Resolved in the parent, so workers don't fetch the game page.
+            scraper._game_start_cache[ERIE_GAME_URL] = pytz.timezone("America/New_York").localize(
+                datetime(2025, 9, 17, 21, 20)
+            )
+        browser = BrowserProvider()
+        browser._browser = threading.Lock()  # stands in for a launched (unpicklable) Chromium
+        harborcenter = HarborcenterScraper(team_name="Golden Retrievers", browser_provider=browser)
+        pages = [
+            (erie, ERIE_URL, TEAM_PAGE_HTML),
+            (erie_plain, ERIE_URL, TEAM_PAGE_HTML),
+            (harborcenter, "https://www.rinksatharborcenter.com/stats#/1367/team/589011/schedule", HARBORCENTER_SCHEDULE_HTML),
+        ]
+
+        with ParseStage() as inline:
+            expected = [inline.submit(scraper, url, html, "America/New_York").result() for scraper, url, html in pages]
+        with ParseStage(workers=2, min_payload_chars=0) as pooled:
+            futures = [pooled.submit(scraper, url, html, "America/New_York") for scraper, url, html in pages]
+            actual = [future.result() for future in futures]
+
+        self.assertEqual(actual, expected)
+        self.assertEqual([len(events) for events in actual], [2, 2, 1])
+        self.assertEqual(actual[0][0].start.hour, 21)
+
+    def test_inline_parse_errors_surface_on_the_future(self) -> None:
+        scraper = HarborcenterScraper()
+        future = ParseStage().submit(scraper, "https://www.rinksatharborcenter.com/stats", [{"label": 5}], "UTC")
+        self.assertIsInstance(future.exception(), AttributeError)
+
+    def test_events_stream_before_the_next_page_is_fetched(self) -> None:
+        scraper = HarborcenterScraper(team_name="Golden Retrievers")
+        log = []
+
+        def pages():
+            log.append("fetch schedule")
+            yield ("https://www.rinksatharborcenter.com/stats#/1367/team/589011/schedule", HARBORCENTER_SCHEDULE_HTML)
+            log.append("fetch scores")
+            yield ("https://www.rinksatharborcenter.com/stats#/1367/team/589011/scores", HARBORCENTER_SCORES_HTML)
+
+        for event in ParseStage().iter_events(scraper, pages(), "America/New_York"):
+            log.append(event.summary)
+
+        self.assertEqual(
+            log,
+            [
+                "fetch schedule",
+                "Buffalo Cigars vs. Golden Retrievers",
+                "fetch scores",
+                "Reverse Retro vs. Golden Retrievers (3-4)",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
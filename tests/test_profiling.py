@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from pathlib import Path
+import io
+import tempfile
+import unittest
+
+from src.utils.profiling import StageProfiler
+
+
+def _outer_work() -> int:
+    return sum(range(1000))
+
+
+def _inner_work() -> int:
+    return sum(range(2000))
+
+
+def _functions(stats) -> set:
+    return {func for (_, _, func) in stats.stats}
+
+
+class StageProfilerTests(unittest.TestCase):
+    def test_nested_stages_only_profile_their_own_code(self) -> None:
+        profiler = StageProfiler()
+        self.assertIsNone(profiler.stage("team").__enter__())
+
+        profiler.enable()
+        with profiler.stage("team"):
+            _outer_work()
+            with profiler.stage("build_ics"):
+                _inner_work()
+            _outer_work()
+        with profiler.stage("build_ics"):
+            _inner_work()
+        profiler.disable()
+
+        stats = profiler.stats()
+        self.assertIn("_outer_work", _functions(stats["team"]))
+        self.assertNotIn("_inner_work", _functions(stats["team"]))
+        self.assertIn("_inner_work", _functions(stats["build_ics"]))
+        self.assertNotIn("_outer_work", _functions(stats["build_ics"]))
+
+        out = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = profiler.dump(Path(tmp), top=5, out=out)
+            self.assertEqual(sorted(p.name for p in paths), ["build_ics.prof", "team.prof"])
+            self.assertTrue(all(p.stat().st_size > 0 for p in paths))
+        self.assertIn("=== build_ics: 2 call(s)", out.getvalue())
+        self.assertIn("=== team: 1 call(s)", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
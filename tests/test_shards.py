@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+import contextlib
+import io
+import tempfile
+import unittest
+
+import pytz
+
+from src.main import main
+from src.utils.events import Event
+from src.utils.feeds import feed_entries, update_manifest
+from src.utils.shards import (
+    event_from_dict,
+    event_to_dict,
+    load_shard_manifests,
+    parse_shard,
+    remove_shard_manifests,
+    shard_of,
+    write_shard_manifest,
+)
+
+
+TZ = pytz.timezone("America/New_York")
+MERGED_AT = datetime(2026, 10, 19, 12, 30, tzinfo=pytz.UTC)
+
+
+class ShardTests(unittest.TestCase):
+    def test_partition_is_stable_and_covers_every_team(self) -> None:
+        team_ids = [f"team-{i}" for i in range(40)]
+        shards = {team_id: shard_of(team_id, 4) for team_id in team_ids}
+
+        self.assertEqual(shards, {team_id: shard_of(team_id, 4) for team_id in team_ids})
+        self.assertEqual(set(shards.values()), {0, 1, 2, 3})
+        self.assertEqual(parse_shard("3/4"), (3, 4))
+        for bad in ("4/4", "1", "a/2", "0/0"):
+            with self.assertRaises(ValueError):
+                parse_shard(bad)
+
+    def test_merge_shards_rejects_counts_below_one(self) -> None:
+        with mock.patch("src.main.merge_shards") as merge, mock.patch("src.main.build_team_feeds") as build:
+            for bad in ("0", "-2"):
+                with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                    main(["--merge-shards", bad])
+            main(["--merge-shards", "1"])
+
+        merge.assert_called_once_with(1, run_id=mock.ANY)
+        build.assert_not_called()
+
+    def test_daemon_rejects_one_shot_build_flags(self) -> None:
+        for flags in (["--shard", "0/4"], ["--merge-shards", "4"], ["--changed-only"]):
+            with self.subTest(flags=flags), mock.patch("src.daemon.ScrapeDaemon") as daemon:
+                with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                    main(["--daemon", *flags])
+                daemon.assert_not_called()
+
+    def test_events_round_trip_through_the_shard_manifest(self) -> None:
+        start = TZ.localize(datetime(2026, 11, 1, 21, 30))
+        ev = Event(
+            summary="Golden Retrievers vs. Rivermen",
+            start=start,
+            end=start + timedelta(minutes=75),
+            timezone="America/New_York",
+            location="Rink 2",
+            external_id="harborcenter:game:7",
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            shard_dir = Path(tmp)
+            write_shard_manifest(0, 2, "2026-10-19T12:00:00+00:00", {"golden-retrievers": {"season_id": "s", "events": [event_to_dict(ev)]}}, {}, shard_dir)
+            with self.assertRaises(FileNotFoundError):
+                load_shard_manifests(2, shard_dir, now=MERGED_AT)
+            write_shard_manifest(1, 2, "2026-10-19T12:00:00+00:00", {}, {}, shard_dir)
+            manifests = load_shard_manifests(2, shard_dir, now=MERGED_AT)
+
+        restored = event_from_dict(manifests[0]["teams"]["golden-retrievers"]["events"][0])
+        self.assertEqual(restored, ev)
+        self.assertEqual(restored.start.tzinfo.zone, "America/New_York")
+
+    def test_manifests_left_over_from_another_run_are_rejected(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            shard_dir = Path(tmp)
+            write_shard_manifest(0, 2, "2026-10-19T12:00:00+00:00", {}, {}, shard_dir, run_id="42")
+            # Shard 1 failed this run; its manifest is from the previous one.
+            write_shard_manifest(1, 2, "2026-10-19T00:00:00+00:00", {}, {}, shard_dir, run_id="41")
+
+            with self.assertRaisesRegex(ValueError, "1/2"):
+                load_shard_manifests(2, shard_dir, run_id="42", now=MERGED_AT)
+            # Without run ids the age alone gives it away.
+            with self.assertRaisesRegex(ValueError, "1/2"):
+                load_shard_manifests(2, shard_dir, now=MERGED_AT)
+
+            write_shard_manifest(1, 2, "2026-10-19T12:05:00+00:00", {}, {}, shard_dir, run_id="42")
+            self.assertEqual(len(load_shard_manifests(2, shard_dir, run_id="42", now=MERGED_AT)), 2)
+            remove_shard_manifests(2, shard_dir)
+            self.assertEqual(list(shard_dir.iterdir()), [])
+
+    def test_merge_uses_shard_entries_for_feeds_it_did_not_write(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            docs = Path(tmp)
+            (docs / "a.ics").write_bytes(b"BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n")
+            (docs / "b.ics").write_bytes(b"BEGIN:VCALENDAR\r\nX-B:1\r\nEND:VCALENDAR\r\n")
+            shard = feed_entries(docs, ["a.ics"])
+            shard["a.ics"]["sha256"] = "from-shard"
+
+            feeds = update_manifest(docs, known=shard)["feeds"]
+
+        self.assertEqual(feeds["a.ics"]["sha256"], "from-shard")
+        self.assertEqual(len(feeds["b.ics"]["sha256"]), 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
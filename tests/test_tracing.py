@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import tempfile
+import threading
+import unittest
+
+from src.utils.tracing import TRACER, Tracer, span
+
+
+class TracingTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        TRACER.disable()
+
+    def test_disabled_spans_are_a_shared_no_op(self) -> None:
+        self.assertIs(span("goto", url="https://example.com"), span("parse"))
+        with span("goto"):
+            pass
+        self.assertEqual(TRACER.events(), [])
+
+    def test_spans_nest_and_record_errors_and_threads(self) -> None:
+        TRACER.enable()
+        with span("team", team="golden-retrievers"):
+            with span("goto", url="https://example.com"):
+                pass
+            with self.assertRaises(ValueError):
+                with span("parse"):
+                    raise ValueError("bad row")
+
+        worker = threading.Thread(target=lambda: span("http get").__enter__().__exit__(None, None, None), name="fetch-1")
+        worker.start()
+        worker.join()
+
+        events = {e["name"]: e for e in TRACER.events()}
+        team, goto, parse = events["team"], events["goto"], events["parse"]
+        self.assertEqual(team["ph"], "X")
+        self.assertEqual(team["args"], {"team": "golden-retrievers"})
+        self.assertLessEqual(team["ts"], goto["ts"])
+        self.assertGreaterEqual(team["ts"] + team["dur"], parse["ts"] + parse["dur"])
+        self.assertEqual(parse["args"], {"error": "ValueError"})
+        self.assertNotEqual(events["http get"]["tid"], team["tid"])
+
+    def test_export_writes_chrome_trace_json(self) -> None:
+        tracer = Tracer(max_events=2)
+        tracer.enable()
+        for name in ("a", "b", "c"):
+            with tracer.span(name):
+                pass
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = tracer.export(Path(tmp) / "trace.json")
+            data = json.loads(path.read_text(encoding="utf-8"))
+
+        names = [e["name"] for e in data["traceEvents"] if e["ph"] == "X"]
+        self.assertEqual(names, ["a", "b"])
+        self.assertEqual(data["otherData"], {"dropped_events": 1})
+        metadata = [e for e in data["traceEvents"] if e["ph"] == "M"]
+        self.assertEqual(metadata[0]["args"], {"name": threading.current_thread().name})
+
+
+if __name__ == "__main__":
+    unittest.main()